@@ -1,19 +1,52 @@
 from __future__ import annotations
-from typing import Optional
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+import allure
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (StaleElementReferenceException,
+                                        TimeoutException)
 from selenium.webdriver.common.by import By
-import allure
+from utils.config import Config
+from utils.dom_scripts import (MARK_SCRIPT, PAGE_STATE_SCRIPT,
+                               READ_STATES_SCRIPT, TIMING_SCRIPT)
+from utils.element_cache import ElementCache
+from utils.screenshots import SCREENSHOTS, Region
+from utils.steps import step
+from utils.timing import TIMINGS, PageTiming
+from utils.visual import VISUAL, VisualResult
+from utils.wait_engine import WaitEngine
 
 
 Locator = tuple[By, str]
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ElementState:
+    """Snapshot of one element read in a batch script call."""
+    element: Optional[WebElement]
+    displayed: bool
+    text: str
+    attributes: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @property
+    def present(self) -> bool:
+        """True if element exists in DOM."""
+        return self.element is not None
 
 
 class BasePage:
-    """Base class for all Page Object models."""
+    """Base class for all Page Object models.
+
+    Pages with a url navigate lazily: the first interaction opens the
+    page unless the browser already shows it.
+    """
+
+    # Element that must be visible before the page counts as loaded
+    READY_LOCATOR: Optional[Locator] = None
 
     def __init__(self, driver: WebDriver) -> None:
         """Initialize base page.
@@ -22,15 +55,128 @@ class BasePage:
             driver: WebDriver instance
         """
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
-        self.timeout = 10
+        self.waits = WaitEngine(driver)
+        self.user_type = "-"
+        self.elements = ElementCache(driver)
+        self._loaded = False
+        self._timeout: Optional[float] = None
+
+    @property
+    def timeout(self) -> float:
+        """Default wait time in seconds.
+
+        Unless set explicitly, waits derive their timeouts from
+        observed durations (see Config.explain_timeout).
+        """
+        if self._timeout is not None:
+            return self._timeout
+        return Config.get_timeout("element")
+
+    @timeout.setter
+    def timeout(self, value: float) -> None:
+        """Set fixed wait time for every wait of this page."""
+        self._timeout = value
+
+    @property
+    def wait(self) -> WebDriverWait:
+        """Deprecated WebDriverWait with the page timeout.
+
+        Use the page methods, which wait through self.waits.
+        """
+        warnings.warn("BasePage.wait is deprecated, use BasePage.waits",
+                      DeprecationWarning, stacklevel=2)
+        return WebDriverWait(self.driver, self.timeout)
+
+    def _wait_key(self, target: str) -> str:
+        """Key of wait history: page, target and user type."""
+        return f"{type(self).__name__}:{target}:{self.user_type}"
+
+    def _adaptive_wait(self, timeout_type: str, target: str,
+                       timeout: Optional[float],
+                       wait: Callable[[float, str], Any],
+                       message: str) -> Any:
+        """Run wait with a timeout learned from its history.
+
+        Args:
+            timeout_type: Wait type ('element', 'page', 'ajax')
+            target: Waited locator or URL
+            timeout: Explicit timeout, overrides history
+            wait: Wait call taking timeout and message
+            message: Failure message, timeout decision is appended
+
+        Returns:
+            Value returned by wait
+
+        Raises:
+            TimeoutException: If wait fails
+        """
+        key = self._wait_key(target)
+        if timeout is not None:
+            reason = "explicit timeout"
+        elif self._timeout is not None:
+            timeout, reason = self._timeout, "page timeout"
+        else:
+            timeout, reason = Config.explain_timeout(timeout_type, key)
+        try:
+            result = wait(timeout, f"{message} in {timeout:.1f}s ({reason})")
+        except TimeoutException:
+            # A short explicit timeout may be meant to fail
+            if reason != "explicit timeout":
+                Config.observe_wait(key, timeout, timed_out=True)
+            raise
+        Config.observe_wait(key, self.waits.records[-1].duration)
+        return result
+
+    @property
+    def url(self) -> Optional[str]:
+        """Page URL, None for pages without own address."""
+        return None
+
+    @step("Open page")
+    def open(self, force: bool = False) -> bool:
+        """Navigate to the page unless it is already displayed.
+
+        Args:
+            force: Reload even if the page is already open
+
+        Returns:
+            True if a navigation happened
+        """
+        self._loaded = True
+        if self.url is None or (not force and self.is_open()):
+            return False
+        self.driver.get(self.url)
+        if Config.PAGE_LOAD_STRATEGY != "normal" and self.READY_LOCATOR:
+            self.wait_for_element(self.READY_LOCATOR)
+        return True
+
+    def is_open(self) -> bool:
+        """Check in one script call that URL and DOM match this page.
+
+        Returns:
+            True if the page is loaded and its ready element is visible
+        """
+        state = self.driver.execute_script(
+            PAGE_STATE_SCRIPT,
+            list(self.READY_LOCATOR) if self.READY_LOCATOR else None,
+        )
+        return (state["url"] == self.url
+                and state["readyState"] != "loading"
+                and state["ready"])
 
-    @allure.step("Find element {locator}")
-    def find_element(self, locator: Locator) -> WebElement:
+    def _ensure_loaded(self) -> None:
+        """Open the page on first interaction."""
+        if not self._loaded:
+            self.open()
+
+    @step("Find element {locator}")
+    def find_element(self, locator: Locator,
+                     screenshot: bool = True) -> WebElement:
         """Find element with explicit wait.
 
         Args:
             locator: Tuple (By strategy, value)
+            screenshot: Attach screenshot on timeout
 
         Returns:
             Found WebElement
@@ -38,42 +184,76 @@ class BasePage:
         Raises:
             TimeoutException: If element not found
         """
+        self._ensure_loaded()
         try:
-            return self.wait.until(
-                EC.visibility_of_element_located(locator),
-                message=f"Element not found: {locator}"
+            element = self._adaptive_wait(
+                "element", f"{locator[0]}={locator[1]}", None,
+                lambda timeout, message: self.waits.until_visible(
+                    locator, timeout, message=message),
+                f"Element not found: {locator}",
             )
         except TimeoutException:
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name="screenshot",
-                attachment_type=allure.attachment_type.PNG
-            )
+            if not screenshot:
+                raise
+            SCREENSHOTS.capture(self.driver, "screenshot")
             raise
+        self.elements.put(locator, element)
+        return element
+
+    def _with_element(self, locator: Locator,
+                      action: Callable[[WebElement], T],
+                      screenshot: bool = True) -> T:
+        """Run action on cached element, finding it on a miss.
+
+        A hidden cached element is looked up again, waiting for it to
+        become visible like an uncached lookup. A stale cached element
+        is dropped and the action retried once on a freshly found one.
+
+        Args:
+            locator: Tuple (By strategy, value)
+            action: Call receiving the element
+            screenshot: Attach screenshot if element not found
+
+        Returns:
+            Action result
+        """
+        self._ensure_loaded()
+        element = self.elements.get(locator)
+        if element is not None:
+            try:
+                # A hidden element is replaced by the lookup below
+                if element.is_displayed():
+                    return action(element)
+            except StaleElementReferenceException:
+                self.elements.discard(locator)
+        return action(self.find_element(locator, screenshot=screenshot))
 
-    @allure.step("Click element {locator}")
+    @step("Click element {locator}")
     def click_element(self, locator: Locator) -> None:
         """Click on element.
 
         Args:
             locator: Tuple (By strategy, value)
         """
-        element = self.find_element(locator)
-        element.click()
+        self._with_element(locator, lambda element: element.click())
 
-    @allure.step("Enter text '{text}' into element {locator}")
-    def enter_text(self, locator: Locator, text: str) -> None:
+    @step("Enter text {text} into element {locator}", secrets=("text",))
+    def enter_text(self, locator: Locator, text: str,
+                   mask: bool = False) -> None:
         """Enter text into input field.
 
         Args:
             locator: Tuple (By strategy, value)
             text: Text to enter
+            mask: Hide text in the report
         """
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
+        def type_text(element: WebElement) -> None:
+            element.clear()
+            element.send_keys(text)
 
-    @allure.step("Get text from element {locator}")
+        self._with_element(locator, type_text)
+
+    @step("Get text from element {locator}")
     def get_text(self, locator: Locator) -> str:
         """Get text content of element.
 
@@ -83,10 +263,9 @@ class BasePage:
         Returns:
             Element text
         """
-        element = self.find_element(locator)
-        return element.text
+        return self._with_element(locator, lambda element: element.text)
 
-    @allure.step("Check if element {locator} is displayed")
+    @step("Check if element {locator} is displayed")
     def is_element_displayed(self, locator: Locator) -> bool:
         """Check element visibility without raising exception.
 
@@ -97,34 +276,133 @@ class BasePage:
             True if element is displayed
         """
         try:
-            element = self.find_element(locator)
-            return element.is_displayed()
+            return self._with_element(locator,
+                                      lambda element: element.is_displayed(),
+                                      screenshot=False)
+        except TimeoutException:
+            return False
+
+    @step("Check if element {locator} is visible now")
+    def is_element_visible_now(self, locator: Locator) -> bool:
+        """Check element visibility immediately, without waiting.
+
+        Args:
+            locator: Tuple (By strategy, value)
+
+        Returns:
+            True if element is displayed at the moment of the call
+        """
+        return self._read_states([locator])[0].displayed
+
+    @step("Check if element {locator} becomes visible")
+    def is_element_visible_within(self, locator: Locator,
+                                  timeout: Optional[float] = None) -> bool:
+        """Poll element visibility for a short bounded time.
+
+        Args:
+            locator: Tuple (By strategy, value)
+            timeout: Poll time in seconds (default: Config.PROBE_TIMEOUT)
+
+        Returns:
+            True as soon as element is displayed, False after timeout
+        """
+        probe = WebDriverWait(
+            self.driver,
+            timeout if timeout is not None else Config.PROBE_TIMEOUT,
+            poll_frequency=Config.PROBE_POLL,
+        )
+        try:
+            return probe.until(
+                lambda driver: self._read_states([locator])[0].displayed)
+        except TimeoutException:
+            return False
+
+    @step("Check if element {locator} is absent")
+    def is_element_absent(self, locator: Locator,
+                          timeout: Optional[float] = None) -> bool:
+        """Check that element is missing or hidden.
+
+        Returns immediately when element is already absent and otherwise
+        polls for a short bounded time. No screenshot is taken.
+
+        Args:
+            locator: Tuple (By strategy, value)
+            timeout: Poll time in seconds (default: Config.PROBE_TIMEOUT)
+
+        Returns:
+            True if element is missing or hidden
+        """
+        probe = WebDriverWait(
+            self.driver,
+            timeout if timeout is not None else Config.PROBE_TIMEOUT,
+            poll_frequency=Config.PROBE_POLL,
+        )
+        try:
+            return probe.until(
+                lambda driver: not self._read_states([locator])[0].displayed)
         except TimeoutException:
             return False
 
-    @allure.step("Get current URL")
+    @step("Get current URL")
     def get_current_url(self) -> str:
         """Get current page URL.
 
         Returns:
             Current URL
         """
+        self._ensure_loaded()
         return self.driver.current_url
 
-    @allure.step("Take screenshot")
-    def take_screenshot(self, name: str = "screenshot") -> None:
+    @step("Take screenshot")
+    def take_screenshot(self, name: str = "screenshot",
+                        locator: Optional[Locator] = None,
+                        region: Optional[Region] = None) -> None:
         """Take screenshot and attach to Allure report.
 
         Args:
             name: Screenshot name in report
+            locator: Capture only this element
+            region: Crop box (left, top, width, height)
         """
-        allure.attach(
-            self.driver.get_screenshot_as_png(),
-            name=name,
-            attachment_type=allure.attachment_type.PNG
-        )
+        element = (self.driver.find_element(*locator)
+                   if locator is not None else None)
+        SCREENSHOTS.capture(self.driver, name, element=element,
+                            region=region)
+
+    @step("Compare screenshot {name} with baseline")
+    def compare_screenshot(self, name: str,
+                           masks: Sequence[Locator] = ()) -> VisualResult:
+        """Compare page screenshot with its visual baseline.
+
+        A missing baseline is reported as missing and saved only with
+        VISUAL_UPDATE=1. On mismatch the screenshot and a diff image are
+        attached to Allure.
+
+        Args:
+            name: Baseline name
+            masks: Elements ignored in the comparison
+
+        Returns:
+            Comparison result with diff mask on mismatch
+        """
+        self._ensure_loaded()
+        regions = []
+        for locator in masks:
+            rect = self.driver.find_element(*locator).rect
+            regions.append((int(rect["x"]), int(rect["y"]),
+                            int(rect["width"]) + 1, int(rect["height"]) + 1))
+        png = self.driver.get_screenshot_as_png()
+        result = VISUAL.check(name, png, regions)
+        if not result.passed and not result.missing:
+            allure.attach(png, name=f"{name}_actual",
+                          attachment_type=allure.attachment_type.PNG)
+            diff = result.diff_png(png)
+            if diff is not None:
+                allure.attach(diff, name=f"{name}_diff",
+                              attachment_type=allure.attachment_type.PNG)
+        return result
 
-    @allure.step("Get element attribute")
+    @step("Get element attribute")
     def get_attribute(self, locator: Locator, attribute: str) -> Optional[str]:
         """Get element attribute value.
 
@@ -136,26 +414,193 @@ class BasePage:
             Attribute value or None
         """
         try:
-            element = self.find_element(locator)
-            return element.get_attribute(attribute)
+            return self._with_element(
+                locator, lambda element: element.get_attribute(attribute))
         except Exception:
             return None
 
-    @allure.step("Wait for element")
+    @step("Wait for element")
     def wait_for_element(self, locator: Locator,
-                         timeout: Optional[int] = None) -> WebElement:
+                         timeout: Optional[float] = None) -> WebElement:
         """Wait for element with custom timeout.
 
         Args:
             locator: Tuple (By strategy, value)
-            timeout: Wait time in seconds (default: self.timeout)
+            timeout: Wait time in seconds (default: learned from history)
 
         Returns:
             Found WebElement
         """
-        wait_timeout = timeout if timeout is not None else self.timeout
-        custom_wait = WebDriverWait(self.driver, wait_timeout)
-        return custom_wait.until(
-            EC.visibility_of_element_located(locator),
-            message=f"Element {locator} not found in {wait_timeout}s"
+        return self._adaptive_wait(
+            "element", f"{locator[0]}={locator[1]}", timeout,
+            lambda wait_timeout, message: self.waits.until_visible(
+                locator, wait_timeout, message=message),
+            f"Element {locator} not found",
         )
+
+    @step("Wait for URL change")
+    def wait_for_url_change(self, url: str,
+                            timeout: Optional[float] = None) -> str:
+        """Wait until current URL differs from url.
+
+        Args:
+            url: URL before the action
+            timeout: Wait time in seconds (default: learned from history)
+
+        Returns:
+            New URL
+        """
+        return self._adaptive_wait(
+            "page", f"leave {url}", timeout,
+            lambda wait_timeout, message: self.waits.until_url_changes(
+                url, wait_timeout, message=message),
+            f"URL stayed {url}",
+        )
+
+    def mark_action(self, name: str) -> None:
+        """Set performance mark measured by the next capture_timing.
+
+        Args:
+            name: Mark name
+        """
+        if Config.CAPTURE_TIMING:
+            self.driver.execute_script(MARK_SCRIPT, name)
+
+    def capture_timing(self, label: str, mark: Optional[str] = None,
+                       fallback_action_ms: Optional[float] = None
+                       ) -> Optional[PageTiming]:
+        """Read navigation, paint and resource timing in one script call.
+
+        Args:
+            label: Action label stored with the timing
+            mark: Performance mark set by mark_action before the action
+            fallback_action_ms: Action time used when the mark was lost
+                to a full navigation
+
+        Returns:
+            Recorded timing or None when capture is disabled
+        """
+        if not Config.CAPTURE_TIMING:
+            return None
+        raw = self.driver.execute_script(TIMING_SCRIPT, mark)
+        timing = PageTiming.from_script(raw, label, self.user_type,
+                                        TIMINGS.test, fallback_action_ms)
+        TIMINGS.add(timing)
+        return timing
+
+    def _read_states(self, locators: Sequence[Locator],
+                     attributes: Sequence[str] = ()) -> List[ElementState]:
+        """Read state of many elements in one script round trip.
+
+        Args:
+            locators: Element locators
+            attributes: Attribute names to read from every element
+
+        Returns:
+            States in locator order
+        """
+        self._ensure_loaded()
+        raw = self.driver.execute_script(
+            READ_STATES_SCRIPT,
+            [list(locator) for locator in locators],
+            list(attributes),
+        )
+        return [ElementState(item["element"], item["displayed"],
+                             item["text"], item["attributes"])
+                for item in raw]
+
+    def _wait_for_states(self, locators: Sequence[Locator],
+                         attributes: Sequence[str] = ()) -> List[ElementState]:
+        """Wait until every element is visible, then read them in one call.
+
+        Args:
+            locators: Element locators
+            attributes: Attribute names to read from every element
+
+        Returns:
+            States in locator order
+
+        Raises:
+            TimeoutException: If any element is not visible in time
+        """
+        self._ensure_loaded()
+        try:
+            self._adaptive_wait(
+                "element", ",".join(f"{by}={value}" for by, value in locators),
+                None,
+                lambda timeout, message: self.waits.until_all_visible(
+                    locators, timeout, message=message),
+                f"Elements not found: {list(locators)}",
+            )
+        except TimeoutException:
+            SCREENSHOTS.capture(self.driver, "screenshot")
+            raise
+        return self._read_states(locators, attributes)
+
+    @step("Find elements {locators}")
+    def find_many(self, locators: Sequence[Locator]) -> List[WebElement]:
+        """Find several visible elements with one script call per poll.
+
+        Args:
+            locators: Element locators
+
+        Returns:
+            Found WebElements in locator order
+
+        Raises:
+            TimeoutException: If any element not found
+        """
+        return [state.element for state in self._wait_for_states(locators)]
+
+    @step("Get texts from elements {locators}")
+    def get_texts(self, locators: Sequence[Locator]) -> List[str]:
+        """Get text content of several elements.
+
+        Args:
+            locators: Element locators
+
+        Returns:
+            Element texts in locator order
+
+        Raises:
+            TimeoutException: If any element not found
+        """
+        return [state.text for state in self._wait_for_states(locators)]
+
+    @step("Get attribute {attribute} from elements")
+    def get_attributes(self, locators: Sequence[Locator],
+                       attribute: str) -> List[Optional[str]]:
+        """Get attribute value of several elements.
+
+        Args:
+            locators: Element locators
+            attribute: Attribute name
+
+        Returns:
+            Attribute values in locator order, None for missing elements
+        """
+        try:
+            try:
+                states = self._wait_for_states(locators, [attribute])
+            except TimeoutException:
+                states = self._read_states(locators, [attribute])
+        except Exception:
+            return [None] * len(locators)
+        return [state.attributes.get(attribute) if state.displayed else None
+                for state in states]
+
+    @step("Snapshot state of elements {locators}")
+    def snapshot_state(self, locators: Sequence[Locator],
+                       attributes: Sequence[str] = ()
+                       ) -> Dict[Locator, ElementState]:
+        """Read presence, visibility, text and attributes without waiting.
+
+        Args:
+            locators: Element locators
+            attributes: Attribute names to read from every element
+
+        Returns:
+            Mapping of locator to its state
+        """
+        states = self._read_states(locators, attributes)
+        return dict(zip(locators, states))
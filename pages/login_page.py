@@ -1,9 +1,43 @@
 from __future__ import annotations
-from typing import Final
+import time
+import warnings
+from typing import Any, Callable, Dict, Final, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-import allure
-from .base_page import BasePage, Locator
+from selenium.common.exceptions import TimeoutException
+from utils.auth_state import AUTH_STATES, AuthState
+from utils.config import Config
+from utils.credentials import CREDENTIALS
+from utils.steps import step
+from .base_page import BasePage, ElementState, Locator
+
+
+class _DeprecatedConstant:
+    """Class constant replaced by target-aware values.
+
+    Every access warns and returns the current replacement value.
+    """
+
+    def __init__(self, getter: Callable[[type], Any],
+                 replacement: str) -> None:
+        """Initialize deprecated constant.
+
+        Args:
+            getter: Returns the value on the current target, called
+                with the page class
+            replacement: What callers should use instead
+        """
+        self.getter = getter
+        self.replacement = replacement
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = f"{owner.__name__}.{name}"
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        warnings.warn(f"{self.name} is deprecated, use {self.replacement}",
+                      DeprecationWarning, stacklevel=2)
+        return self.getter(owner if owner is not None else type(obj))
 
 
 class LoginPage(BasePage):
@@ -14,22 +48,26 @@ class LoginPage(BasePage):
     PASSWORD_INPUT: Final[Locator] = (By.ID, "password")
     LOGIN_BUTTON: Final[Locator] = (By.ID, "login-button")
     ERROR_MESSAGE: Final[Locator] = (By.CSS_SELECTOR, "[data-test='error']")
+    ERROR_BUTTON: Final[Locator] = (By.CLASS_NAME, "error-button")
     LOGO: Final[Locator] = (By.CLASS_NAME, "login_logo")
+    INVENTORY_CONTAINER: Final[Locator] = (By.ID, "inventory_container")
+    READY_LOCATOR = LOGIN_BUTTON
+
+    # Performance mark set right before the login click
+    SUBMIT_MARK: Final[str] = "po:login-submit"
+
+    # Paths, resolved against Config.get_base_url()
+    LOGIN_PATH: Final[str] = "/"
+    INVENTORY_PATH: Final[str] = "/inventory.html"
 
-    # URLs
-    BASE_URL: Final[str] = "https://www.saucedemo.com/"
-    INVENTORY_URL: Final[str] = "https://www.saucedemo.com/inventory.html"
-
-    # Test users
-    TEST_USERS: Final[dict] = {
-        "standard": {"username": "standard_user", "password": "secret_sauce"},
-        "locked": {"username": "locked_out_user", "password": "secret_sauce"},
-        "performance": {
-            "username": "performance_glitch_user",
-            "password": "secret_sauce",
-        },
-        "problem": {"username": "problem_user", "password": "secret_sauce"}
-    }
+    # Deprecated, kept for callers of the fixed saucedemo.com constants
+    BASE_URL = _DeprecatedConstant(
+        lambda cls: Config.get_url(cls.LOGIN_PATH), "LoginPage.url")
+    INVENTORY_URL = _DeprecatedConstant(
+        lambda cls: Config.get_url(cls.INVENTORY_PATH),
+        "LoginPage.inventory_url")
+    TEST_USERS = _DeprecatedConstant(lambda cls: CREDENTIALS.as_users(),
+                                     "utils.credentials.CREDENTIALS")
 
     def __init__(self, driver: WebDriver) -> None:
         """Initialize login page.
@@ -38,14 +76,35 @@ class LoginPage(BasePage):
             driver: WebDriver instance
         """
         super().__init__(driver)
-        self.driver.get(self.BASE_URL)
+        self._submitted_at: Optional[float] = None
 
-    @allure.step("Open login page")
-    def open(self) -> None:
-        """Open login page."""
-        self.driver.get(self.BASE_URL)
+    @property
+    def url(self) -> str:
+        """Login page URL on the current target."""
+        return Config.get_url(self.LOGIN_PATH)
 
-    @allure.step("Login with username={username} and password={password}")
+    @property
+    def inventory_url(self) -> str:
+        """Inventory page URL on the current target."""
+        return Config.get_url(self.INVENTORY_PATH)
+
+    @step("Open login page")
+    def open(self, force: bool = False) -> bool:
+        """Open login page unless it is already displayed.
+
+        Args:
+            force: Reload even if the login page is already open
+
+        Returns:
+            True if a navigation happened
+        """
+        navigated = super().open(force)
+        if navigated:
+            self.capture_timing("login")
+        return navigated
+
+    @step("Login with username={username} and password={password}",
+          secrets=("password",))
     def login(self, username: str, password: str) -> None:
         """Perform login with credentials.
 
@@ -53,28 +112,94 @@ class LoginPage(BasePage):
             username: Username
             password: Password
         """
+        credential = CREDENTIALS.by_username(username)
+        self.user_type = credential.key if credential else "custom"
         self.enter_text(self.USERNAME_INPUT, username)
-        self.enter_text(self.PASSWORD_INPUT, password)
+        self.enter_text(self.PASSWORD_INPUT, password, mask=True)
+        self.mark_action(self.SUBMIT_MARK)
+        self._submitted_at = time.perf_counter()
         self.click_element(self.LOGIN_BUTTON)
 
-    @allure.step("Login as user {user_type}")
-    def login_as_user(self, user_type: str) -> None:
+    @step("Wait for inventory page")
+    def wait_for_inventory_page(self, timeout: Optional[float] = None) -> None:
+        """Wait for inventory page after login and capture its timing.
+
+        Args:
+            timeout: Wait time in seconds (default: learned from history)
+
+        Raises:
+            TimeoutException: If inventory page not shown in time
+        """
+        self._adaptive_wait(
+            "page", self.INVENTORY_PATH, timeout,
+            lambda wait_timeout, message: self.waits.until_url_is(
+                self.inventory_url, wait_timeout, message=message),
+            "Inventory page not opened",
+        )
+        self.wait_for_element(self.INVENTORY_CONTAINER, timeout)
+        elapsed_ms = ((time.perf_counter() - self._submitted_at) * 1000
+                      if self._submitted_at is not None else None)
+        self.capture_timing("inventory", self.SUBMIT_MARK, elapsed_ms)
+
+    @step("Login as user {user_type}")
+    def login_as_user(self, user_type: str, fast: bool = False) -> None:
         """Login as specific user type.
 
+        With fast=True the first login of a user goes through the UI and
+        its cookies and storage are cached for the session; later logins
+        inject the cached state and open the inventory page directly.
+        Users whose login does not succeed always use the UI, and a
+        restored state that does not reach the inventory page falls
+        back to a UI login.
+
         Args:
             user_type: User type
                 ('standard', 'locked', 'performance', 'problem')
+            fast: Reuse cached authentication state
 
         Raises:
             KeyError: If user type not found
         """
-        if user_type not in self.TEST_USERS:
-            raise KeyError(f"Unknown user type: {user_type}")
+        credential = CREDENTIALS.get(user_type)
+        # Only a successful login leaves a session worth caching
+        fast = fast and credential.outcome == "success"
+
+        if fast:
+            state = AUTH_STATES.get(Config.get_base_url(), user_type)
+            if state is not None:
+                if self.restore_auth_state(state):
+                    return
+                AUTH_STATES.discard(Config.get_base_url(), user_type)
+                self.open()
+
+        self.login(credential.username, credential.password)
+
+        if fast:
+            try:
+                self.waits.until_url_is(self.inventory_url, self.timeout)
+            except TimeoutException:
+                return
+            AUTH_STATES.put(Config.get_base_url(), user_type,
+                            AuthState.capture(self.driver))
+
+    @step("Restore authentication state")
+    def restore_auth_state(self, state: AuthState) -> bool:
+        """Inject authentication state and open inventory page.
+
+        Args:
+            state: Previously captured state
 
-        user_data = self.TEST_USERS[user_type]
-        self.login(user_data["username"], user_data["password"])
+        Returns:
+            True if the inventory page opened, False if the application
+            rejected the state and redirected to the login page
+        """
+        self._ensure_loaded()
+        state.apply(self.driver)
+        self.driver.get(self.inventory_url)
+        return (self.is_element_visible_within(self.INVENTORY_CONTAINER)
+                and self.driver.current_url == self.inventory_url)
 
-    @allure.step("Get error message text")
+    @step("Get error message text")
     def get_error_message(self) -> str:
         """Get error message text.
 
@@ -83,7 +208,19 @@ class LoginPage(BasePage):
         """
         return self.get_text(self.ERROR_MESSAGE)
 
-    @allure.step("Check logo display")
+    @step("Dismiss error message")
+    def dismiss_error(self) -> bool:
+        """Close the error message if one is shown.
+
+        Returns:
+            True if an error message was closed
+        """
+        if not self.is_element_visible_now(self.ERROR_BUTTON):
+            return False
+        self.click_element(self.ERROR_BUTTON)
+        return True
+
+    @step("Check logo display")
     def is_logo_displayed(self) -> bool:
         """Check if logo is displayed.
 
@@ -92,7 +229,7 @@ class LoginPage(BasePage):
         """
         return self.is_element_displayed(self.LOGO)
 
-    @allure.step("Check username field display")
+    @step("Check username field display")
     def is_username_field_displayed(self) -> bool:
         """Check if username field is displayed.
 
@@ -101,7 +238,7 @@ class LoginPage(BasePage):
         """
         return self.is_element_displayed(self.USERNAME_INPUT)
 
-    @allure.step("Check password field display")
+    @step("Check password field display")
     def is_password_field_displayed(self) -> bool:
         """Check if password field is displayed.
 
@@ -110,16 +247,16 @@ class LoginPage(BasePage):
         """
         return self.is_element_displayed(self.PASSWORD_INPUT)
 
-    @allure.step("Check if on inventory page")
+    @step("Check if on inventory page")
     def is_on_inventory_page(self) -> bool:
         """Check if current page is inventory.
 
         Returns:
             True if current URL matches inventory URL
         """
-        return self.get_current_url() == self.INVENTORY_URL
+        return self.get_current_url() == self.inventory_url
 
-    @allure.step("Get username placeholder")
+    @step("Get username placeholder")
     def get_username_placeholder(self) -> str:
         """Get username field placeholder.
 
@@ -128,7 +265,7 @@ class LoginPage(BasePage):
         """
         return self.get_attribute(self.USERNAME_INPUT, "placeholder") or ""
 
-    @allure.step("Get password placeholder")
+    @step("Get password placeholder")
     def get_password_placeholder(self) -> str:
         """Get password field placeholder.
 
@@ -136,3 +273,15 @@ class LoginPage(BasePage):
             Placeholder value or empty string
         """
         return self.get_attribute(self.PASSWORD_INPUT, "placeholder") or ""
+
+    @step("Get login form state")
+    def get_login_form_state(self) -> Dict[Locator, ElementState]:
+        """Read logo and input fields with placeholders in one call.
+
+        Returns:
+            Mapping of locator to element state
+        """
+        return self.snapshot_state(
+            [self.LOGO, self.USERNAME_INPUT, self.PASSWORD_INPUT],
+            ["placeholder"],
+        )
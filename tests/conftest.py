@@ -1,37 +1,233 @@
 from __future__ import annotations
-from typing import Generator
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Optional, Union
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+import xdist
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.remote.webdriver import WebDriver
 import allure
 from pages.login_page import LoginPage
+from utils.auth_state import READ_STORAGE_SCRIPT, WRITE_STORAGE_SCRIPT
+from utils.browser_contexts import BrowserContextPool
+from utils.chrome_startup import STARTUP
+from utils.config import Config
+from utils.credentials import CREDENTIALS, INVALID_PASSWORD
+from utils.driver_events import add_listener, remove_listener
+from utils.driver_factory import create_driver
+from utils.dom_scripts import (DOM_SNAPSHOT_SCRIPT, PAGE_STATE_SCRIPT,
+                               READ_STATES_SCRIPT)
+from utils.driver_pool import RESET_STORAGE_SCRIPT, DriverPool
+from utils.element_cache import ELEMENT_CACHE_STATS
+from utils.flakiness import (FlakinessRecorder, FlakinessStore,
+                             RerunProtocol, is_timing_failure,
+                             report_failed)
+from utils.flight_recorder import FLIGHT
+from utils.grid import GRID, format_metrics, is_node_loss, merge_metrics
+from utils.local_server import LocalSauceDemo
+from utils.network import NETWORK
+from utils.profiler import CommandProfiler
+from utils.result_log import ResultLog, ResultLogPlugin
+from utils.scheduling import (DurationOrdering, DurationRecorder,
+                              DurationScheduling, DurationStore)
+from utils.screenshots import SCREENSHOTS
+from utils.steps import add_step_listener, remove_step_listener
+from utils.timeout_store import TimeoutStore
+from utils.timing import TIMINGS
+from utils.visual import VISUAL, BaselineIndex
+
+
+DRIVER_POOL_KEY = pytest.StashKey[Union[DriverPool, BrowserContextPool]]()
+TIMEOUT_STORE_KEY = pytest.StashKey[TimeoutStore]()
+PHASE_REPORTS_KEY = pytest.StashKey[Dict[str, pytest.TestReport]]()
+NODE_LOST_KEY = pytest.StashKey[bool]()
+TIMING_FAILURE_KEY = pytest.StashKey[bool]()
+FLAKINESS_STORE_KEY = pytest.StashKey[FlakinessStore]()
+FLAKINESS_RECORDER_KEY = pytest.StashKey[FlakinessRecorder]()
+GRID_METRICS_KEY = pytest.StashKey[List[Dict[str, Any]]]()
+
+
+def pytest_addoption(parser):
+    """Register command line options."""
+    parser.addoption("--target", choices=("remote", "local"),
+                     default=Config.TARGET,
+                     help="Run against www.saucedemo.com or a local "
+                          "stand-in server")
+    parser.addoption("--profile-commands", action="store_true",
+                     help="Record latency of every WebDriver command")
+    parser.addoption("--benchmark", action="store_true",
+                     help="Run login benchmarks against the local target")
+    parser.addoption("--benchmark-save", action="store_true",
+                     help="Store benchmark medians as the new baseline")
+    parser.addoption("--record-durations", action="store_true",
+                     help="Save test durations used to order parallel runs")
+    parser.addoption("--timing-budgets", action="store_true",
+                     help="Fail tests whose page loads exceed "
+                          "Config.INVENTORY_LOAD_BUDGET_MS")
+    parser.addoption("--matrix", action="store_true",
+                     help="Run the generated login matrix")
+    parser.addoption("--result-log", metavar="DIR", default=None,
+                     help="Stream results to an append-only run log with "
+                          "a live summary index")
+    parser.addoption("--quarantine", choices=("run", "skip", "only"),
+                     default="run",
+                     help="Flaky tests: run without failing the session, "
+                          "leave them out (main lane) or run only them "
+                          "(quarantine lane)")
+
+
+@pytest.fixture(scope="session")
+def base_url(request: pytest.FixtureRequest) -> Generator[str, None, None]:
+    """Resolve application URL, starting local server if requested.
+
+    Args:
+        request: Pytest fixture request
+
+    Yields:
+        Base URL of the application under test
+    """
+    local = (request.config.getoption("target") == "local"
+             or request.config.getoption("benchmark"))
+    if not local:
+        yield Config.get_base_url()
+        return
+
+    server = LocalSauceDemo(host=Config.LOCAL_BIND_HOST,
+                            glitch_delay=Config.LOCAL_GLITCH_DELAY,
+                            public_host=Config.LOCAL_PUBLIC_HOST or None)
+    server.start()
+    Config.set_base_url(server.url)
+    yield server.url
+    Config.set_base_url(None)
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def command_profiler(
+        request: pytest.FixtureRequest
+) -> Generator[Optional[CommandProfiler], None, None]:
+    """Create WebDriver command profiler when --profile-commands is set.
+
+    Args:
+        request: Pytest fixture request
+
+    Yields:
+        CommandProfiler instance or None
+    """
+    if not request.config.getoption("profile_commands"):
+        yield None
+        return
+
+    profiler = CommandProfiler()
+    yield profiler
+    output = Path(request.config.rootpath, Config.PROFILE_OUTPUT)
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        output = output.with_name(f"{output.stem}-{worker}{output.suffix}")
+    profiler.export(output)
+
+
+@pytest.fixture(scope="session")
+def driver_pool(
+        request: pytest.FixtureRequest, base_url: str,
+        command_profiler: Optional[CommandProfiler]
+) -> Generator[Union[DriverPool, BrowserContextPool], None, None]:
+    """Create pool of warm browser sessions shared by the whole run.
+
+    Args:
+        request: Pytest fixture request
+        base_url: Base URL of the application under test
+        command_profiler: Profiler timing browser startup, if enabled
+
+    Yields:
+        DriverPool, or BrowserContextPool when DRIVER_MODE=contexts
+    """
+    factory = create_driver
+    if command_profiler is not None:
+        def factory() -> WebDriver:
+            start = time.perf_counter()
+            driver = create_driver()
+            command_profiler.record("newSession",
+                                    time.perf_counter() - start)
+            return driver
+
+    reset_url = Config.get_url(LoginPage.LOGIN_PATH)
+    if Config.DRIVER_MODE == "contexts":
+        # Blocking and throttling are per target, so every tab gets them
+        pool = BrowserContextPool(
+            factory, reset_url=reset_url,
+            rss_interval=Config.POOL_RSS_INTERVAL,
+            setup_target=NETWORK.apply if NETWORK.enabled else None)
+    else:
+        pool = DriverPool(
+            factory,
+            size=Config.POOL_SIZE,
+            max_leases=Config.POOL_MAX_LEASES,
+            reset_url=reset_url,
+            rss_interval=Config.POOL_RSS_INTERVAL,
+        )
+    request.config.stash[DRIVER_POOL_KEY] = pool
+    yield pool
+    pool.close()
 
 
 @pytest.fixture(scope="function")
-def driver() -> Generator[WebDriver, None, None]:
-    """Create and close browser driver.
+def driver(
+        request: pytest.FixtureRequest,
+        driver_pool: Union[DriverPool, BrowserContextPool],
+        command_profiler: Optional[CommandProfiler]
+) -> Generator[WebDriver, None, None]:
+    """Lease browser driver from the pool and return it after the test.
+
+    Args:
+        request: Pytest fixture request
+        driver_pool: Session driver pool
+        command_profiler: Command profiler, if enabled
 
     Yields:
         WebDriver instance
     """
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_experimental_option("excludeSwitches",
-                                    ["enable-automation", "enable-logging"])
-    options.add_argument("--log-level=3")
-    options.add_argument("--silent")
-
-    service = Service()
-    service.arguments = ["--silent"]
-
-    driver = webdriver.Chrome(options=options, service=service)
-    driver.implicitly_wait(5)
+    driver = driver_pool.acquire()
+    # Drop events of the pool reset
+    NETWORK.collect(driver)
+    if command_profiler is not None:
+        command_profiler.begin(request.node.nodeid)
+        add_listener(driver, command_profiler)
+    if FLIGHT.enabled:
+        FLIGHT.begin()
+        add_listener(driver, FLIGHT)
+        add_step_listener(FLIGHT)
     yield driver
-    driver.quit()
+    node_lost = request.node.stash.get(NODE_LOST_KEY, False)
+    if node_lost:
+        GRID.node_lost(driver)
+    if command_profiler is not None:
+        remove_listener(driver, command_profiler)
+        allure.attach(json.dumps(command_profiler.end(), indent=2),
+                      name="command_profile",
+                      attachment_type=allure.attachment_type.JSON)
+    # The recorder reads the performance log itself when a test fails;
+    # events drained here for the stats are handed to it as well
+    network_stats = NETWORK.collect(
+        driver, on_event=FLIGHT.network_event if FLIGHT.enabled else None
+    ) if NETWORK.enabled and not node_lost else None
+    if network_stats is not None:
+        allure.attach(json.dumps(network_stats.as_dict(), indent=2),
+                      name="network_stats",
+                      attachment_type=allure.attachment_type.JSON)
+    if FLIGHT.enabled:
+        remove_step_listener(FLIGHT)
+        remove_listener(driver, FLIGHT)
+        reports = request.node.stash.get(PHASE_REPORTS_KEY, {})
+        if any(report.failed for report in reports.values()):
+            trace = FLIGHT.dump(None if node_lost else driver,
+                                request.node.nodeid)
+            allure.attach(FLIGHT.serialize(trace), name="flight_recorder",
+                          attachment_type=allure.attachment_type.JSON)
+        FLIGHT.end()
+    driver_pool.release(driver, broken=node_lost)
 
 
 @pytest.fixture(scope="function")
@@ -47,49 +243,452 @@ def login_page(driver: WebDriver) -> LoginPage:
     return LoginPage(driver)
 
 
+@pytest.fixture(scope="function")
+def logged_in_page(login_page: LoginPage) -> LoginPage:
+    """Login page with standard user already authenticated.
+
+    Skips the UI login when a cached authentication state exists.
+
+    Args:
+        login_page: LoginPage instance
+
+    Returns:
+        LoginPage instance on the inventory page
+    """
+    login_page.login_as_user("standard", fast=True)
+    return login_page
+
+
 @pytest.fixture(scope="function")
 def test_data() -> dict:
-    """Test data fixture.
+    """Test data fixture, built from the credential registry.
 
     Returns:
         Dictionary with test data
     """
     return {
-        "valid_username": "standard_user",
-        "valid_password": "secret_sauce",
-        "invalid_password": "wrong_password",
-        "locked_username": "locked_out_user",
-        "performance_username": "performance_glitch_user"
+        "valid_username": CREDENTIALS.get("standard").username,
+        "valid_password": CREDENTIALS.get("standard").password,
+        "invalid_password": INVALID_PASSWORD,
+        "locked_username": CREDENTIALS.get("locked").username,
+        "performance_username": CREDENTIALS.get("performance").username,
     }
 
 
+class FakeDriver:
+    """In-memory WebDriver stand-in for unit tests.
+
+    Scripts are answered by what they do: batch reads and waits from
+    dom, page state from current_url, local storage from storage.
+    A dom entry maps a locator value to "displayed", "text", attribute
+    values and optionally "from_read", the read from which the element
+    exists.
+    """
+
+    def __init__(self, dom: Optional[Dict[str, Dict[str, Any]]] = None,
+                 current_url: str = "about:blank",
+                 ready_state: str = "complete",
+                 crash_on_reset: bool = False) -> None:
+        """Initialize fake driver.
+
+        Args:
+            dom: Elements by locator value
+            current_url: URL the browser shows
+            ready_state: document.readyState of the shown page
+            crash_on_reset: Fail the pool's storage reset script
+        """
+        self.dom = dict(dom or {})
+        self.current_url = current_url
+        self.ready_state = ready_state
+        self.crash_on_reset = crash_on_reset
+        self.cookies: List[Dict[str, Any]] = []
+        self.storage: Dict[str, str] = {}
+        self.logs: Dict[str, List[dict]] = {}
+        self.navigations: List[str] = []
+        self.snapshots: List[int] = []
+        self.cdp: List[tuple] = []
+        self.disposed: List[str] = []
+        self.window_handles = ["home"]
+        self.current_window_handle = "home"
+        self.reads = 0
+        self.state_checks = 0
+        self.quit_called = False
+
+    def execute(self, command: str, params: dict = None) -> dict:
+        return {"value": None}
+
+    def get(self, url: str) -> None:
+        self.navigations.append(url)
+        self.current_url = url
+        self.ready_state = "complete"
+
+    def _state(self, value: str) -> dict:
+        node = self.dom.get(value)
+        if node is not None and self.reads < node.get("from_read", 0):
+            node = None
+        return {
+            "element": value if node is not None else None,
+            "displayed": bool(node and node.get("displayed", True)),
+            "text": (node or {}).get("text", ""),
+            "attributes": {},
+        }
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        if script == READ_STATES_SCRIPT:
+            self.reads += 1
+            locators, attributes = args
+            states = [self._state(value) for _, value in locators]
+            for (_, value), state in zip(locators, states):
+                node = self.dom.get(value) or {}
+                state["attributes"] = {name: node.get(name)
+                                       for name in attributes}
+            return states
+        if script == PAGE_STATE_SCRIPT:
+            self.state_checks += 1
+            ready = args[0]
+            return {"url": self.current_url, "readyState": self.ready_state,
+                    "ready": ready is None
+                    or self._state(ready[1])["displayed"]}
+        if script == READ_STORAGE_SCRIPT:
+            return dict(self.storage)
+        if script == WRITE_STORAGE_SCRIPT:
+            self.storage.update(args[0])
+        elif script == RESET_STORAGE_SCRIPT:
+            if self.crash_on_reset:
+                raise WebDriverException("chrome not reachable")
+            self.storage.clear()
+        elif script == DOM_SNAPSHOT_SCRIPT:
+            self.snapshots.append(args[0])
+            return {"url": self.current_url, "title": "Swag Labs",
+                    "html": "<html></html>", "truncated": False}
+        return None
+
+    def set_script_timeout(self, seconds: float) -> None:
+        pass
+
+    def execute_async_script(self, script: str, condition: dict,
+                             timeout_ms: int) -> dict:
+        if condition["kind"] != "all_visible":
+            return {"status": "error"}
+        visible = all(self._state(value)["displayed"]
+                      for _, value in condition["locators"])
+        return {"status": "ok" if visible else "timeout", "value": visible}
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie: Dict[str, Any]) -> None:
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self) -> None:
+        self.cookies = []
+
+    def get_log(self, log_type: str) -> List[dict]:
+        entries, self.logs[log_type] = self.logs.get(log_type, []), []
+        return entries
+
+    def get_screenshot_as_png(self) -> bytes:
+        return b"\x89PNG same page"
+
+    def execute_cdp_cmd(self, cmd: str, args: dict) -> dict:
+        self.cdp.append((cmd, args))
+        if cmd == "Target.createBrowserContext":
+            return {"browserContextId": f"ctx-{len(self.cdp)}"}
+        if cmd == "Target.createTarget":
+            self.window_handles.append(f"tab-{len(self.cdp)}")
+            return {"targetId": self.window_handles[-1]}
+        if cmd == "Target.disposeBrowserContext":
+            self.disposed.append(args["browserContextId"])
+        return {}
+
+    @property
+    def switch_to(self) -> FakeDriver:
+        return self
+
+    def window(self, handle: str) -> None:
+        self.current_window_handle = handle
+
+    def close(self) -> None:
+        self.window_handles.remove(self.current_window_handle)
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+@pytest.fixture
+def fake_driver() -> Callable[..., FakeDriver]:
+    """Factory of in-memory drivers for unit tests.
+
+    Returns:
+        FakeDriver class, called with its keyword options
+    """
+    return FakeDriver
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook for creating reports and screenshots on test failure."""
     outcome = yield
     rep = outcome.get_result()
+    item.stash.setdefault(PHASE_REPORTS_KEY, {})[rep.when] = rep
+    if (GRID.enabled and call.excinfo is not None
+            and is_node_loss(call.excinfo.value)):
+        item.stash[NODE_LOST_KEY] = True
+    if call.excinfo is not None and is_timing_failure(call.excinfo.value):
+        item.stash[TIMING_FAILURE_KEY] = True
 
-    if rep.when == "call" and rep.failed:
+    if rep.failed and Config.SCREENSHOT_ON_FAILURE:
         try:
             driver = item.funcargs['driver']
-            allure.attach(
-                driver.get_screenshot_as_png(),
-                name="failure_screenshot",
-                attachment_type=allure.attachment_type.PNG
-            )
+            SCREENSHOTS.capture(driver, "failure_screenshot")
         except Exception:
             pass
+    SCREENSHOTS.flush()
+
+    if rep.when != "call":
+        return
+
+    timings = TIMINGS.for_test(item.nodeid)
+    if timings:
+        allure.attach(json.dumps(timings, indent=2), name="page_timings",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Rerun test in a warm session after a timing failure or node loss.
+
+    The driver fixture returns the browser to the pool, which resets its
+    state, so a rerun leases an already running browser. While a retry
+    is still possible an attempt tears down only function fixtures;
+    module, class and session fixtures stay up for the rerun and are
+    torn down for the real next item after the last attempt. Only the
+    reports of the last attempt are logged; rerun count and time are
+    added to them as user properties. Without reruns or grid nodes
+    pytest's own protocol runs the test.
+    """
+    if (not (GRID.enabled or Config.RERUN_LIMIT)
+            or not RerunProtocol.supported()):
+        return None
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid,
+                                       location=item.location)
+    requeues = reruns = 0
+    first_finished = 0.0
+    while True:
+        item.stash[NODE_LOST_KEY] = False
+        item.stash[TIMING_FAILURE_KEY] = False
+        item.stash[PHASE_REPORTS_KEY] = {}
+        can_retry = ((GRID.enabled and requeues < Config.GRID_REQUEUE_LIMIT)
+                     or reruns < Config.RERUN_LIMIT)
+        reports = RerunProtocol.run(
+            item, item.parent if can_retry else nextitem)
+        first_finished = first_finished or time.perf_counter()
+        if (item.stash[NODE_LOST_KEY]
+                and requeues < Config.GRID_REQUEUE_LIMIT):
+            requeues += 1
+            GRID.requeued += 1
+        elif (item.stash[TIMING_FAILURE_KEY] and reruns < Config.RERUN_LIMIT
+              and any(report_failed(report) for report in reports)):
+            reruns += 1
+        else:
+            break
+        RerunProtocol.reset(item)
+    if can_retry:
+        # Tear down what the last attempt kept for a rerun
+        report = RerunProtocol.teardown(item, nextitem)
+        if report is not None:
+            reports[-1] = report
+    if reruns:
+        for report in reports:
+            report.user_properties += [
+                ("reruns", reruns),
+                ("rerun_seconds",
+                 round(time.perf_counter() - first_finished, 3)),
+            ]
+    for report in reports:
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid,
+                                        location=item.location)
+    return True
+
+
+def pytest_runtest_setup(item):
+    """Reset per-test screenshot budget and timing attribution."""
+    SCREENSHOTS.begin_test()
+    TIMINGS.test = item.nodeid
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Stop background workers, chromedriver and save wait history.
+
+    A quarantine lane without quarantined tests selects nothing; that
+    run succeeds instead of exiting with 'no tests collected'.
+    """
+    if (exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED
+            and session.config.getoption("quarantine") == "only"):
+        session.exitstatus = pytest.ExitCode.OK
+    SCREENSHOTS.close()
+    STARTUP.shutdown()
+    if GRID.enabled and hasattr(session.config, "workerinput"):
+        session.config.workeroutput["grid_metrics"] = GRID.metrics()
+    store = session.config.stash.get(TIMEOUT_STORE_KEY, None)
+    if store is not None:
+        store.save()
 
 
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
     """Configure pytest on startup."""
+    if hasattr(config, "workerinput"):
+        # Only the controller may wipe results shared by all workers
+        config.option.clean_alluredir = False
+
+    store = DurationStore(Path(config.rootpath, Config.DURATIONS_FILE))
+    if hasattr(config, "workerinput"):
+        # A serial run keeps file order, so scoped fixtures stay grouped
+        config.pluginmanager.register(DurationOrdering(store))
+    elif config.getoption("record_durations"):
+        config.pluginmanager.register(DurationRecorder(store))
+    if (config.getoption("numprocesses", None)
+            and config.getoption("dist", None) == "load"
+            and not DurationScheduling.supported()):
+        config.issue_config_time_warning(pytest.PytestConfigWarning(
+            f"pytest-xdist {xdist.__version__} is not supported by "
+            f"DurationScheduling, using its default load scheduler"),
+            stacklevel=2)
+    if ((GRID.enabled or Config.RERUN_LIMIT)
+            and not RerunProtocol.supported()):
+        config.issue_config_time_warning(pytest.PytestConfigWarning(
+            f"pytest {pytest.__version__} is not supported by "
+            f"RerunProtocol, tests are not rerun"), stacklevel=2)
+
+    if Config.ADAPTIVE_TIMEOUTS:
+        timeouts = TimeoutStore(
+            Path(config.rootpath, Config.TIMEOUT_HISTORY_FILE))
+        config.stash[TIMEOUT_STORE_KEY] = timeouts
+        Config.set_timeout_store(timeouts)
+
+    VISUAL.index = BaselineIndex(
+        Path(config.rootpath, Config.VISUAL_BASELINE_DIR))
+
+    flakiness = FlakinessStore(Path(config.rootpath, Config.FLAKINESS_FILE),
+                               Config.FLAKINESS_WINDOW)
+    config.stash[FLAKINESS_STORE_KEY] = flakiness
+    if not hasattr(config, "workerinput"):
+        recorder = FlakinessRecorder(flakiness)
+        config.stash[FLAKINESS_RECORDER_KEY] = recorder
+        config.pluginmanager.register(recorder)
+
+    result_dir = config.getoption("result_log", None)
+    workerinput = getattr(config, "workerinput", None)
+    # Workers log their own results; a distributing controller logs none
+    if result_dir and (workerinput is not None
+                       or not config.getoption("numprocesses", None)):
+        worker = workerinput["workerid"] if workerinput else "main"
+        log = ResultLog(Path(result_dir), worker)
+        config.pluginmanager.register(ResultLogPlugin(log, worker))
+
     config.addinivalue_line("markers", "smoke: Smoke tests")
     config.addinivalue_line("markers", "regression: Regression tests")
     config.addinivalue_line("markers", "login: Login tests")
+    config.addinivalue_line("markers", "benchmark: Login flow benchmarks")
+    config.addinivalue_line("markers", "visual: Visual regression tests")
+    config.addinivalue_line("markers", "matrix: Generated login matrix")
+    config.addinivalue_line("markers", "quarantine: Chronically flaky test")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Distribute tests across workers longest-first.
+
+    Only replaces the default '--dist load' mode; loadscope, loadfile,
+    loadgroup and each keep their own schedulers.
+    """
+    if (config.getoption("dist", None) != "load"
+            or not DurationScheduling.supported()):
+        return None
+    return DurationScheduling(config, log)
 
 
-def pytest_collection_modifyitems(items):
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect grid metrics of a finished xdist worker."""
+    metrics = getattr(node, "workeroutput", {}).get("grid_metrics")
+    if metrics is not None:
+        node.config.stash.setdefault(GRID_METRICS_KEY, []).append(metrics)
+
+
+def pytest_collection_modifyitems(config, items):
     """Modify test collection before execution."""
+    skip_benchmark = pytest.mark.skip(reason="needs --benchmark option")
+    skip_matrix = pytest.mark.skip(reason="needs --matrix option")
+    quarantined = config.stash[FLAKINESS_STORE_KEY].quarantined(
+        Config.QUARANTINE_THRESHOLD, Config.QUARANTINE_MIN_RUNS)
     for item in items:
         if "login" in item.nodeid.lower():
             item.add_marker(pytest.mark.login)
+        if ("benchmark" in item.keywords
+                and not config.getoption("benchmark")):
+            item.add_marker(skip_benchmark)
+        if "matrix" in item.keywords and not config.getoption("matrix"):
+            item.add_marker(skip_matrix)
+        if item.nodeid in quarantined:
+            # Failures are reported as xfail and do not fail the session
+            item.add_marker(pytest.mark.quarantine)
+            item.add_marker(pytest.mark.xfail(
+                reason=f"quarantined, flakiness "
+                       f"{quarantined[item.nodeid]:.0%}"))
+
+    lane = config.getoption("quarantine")
+    if lane == "run":
+        return
+    only = lane == "only"
+    deselected = [item for item in items
+                  if (item.nodeid in quarantined) != only]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items
+                    if (item.nodeid in quarantined) == only]
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report driver pool metrics at the end of the run."""
+    pool = config.stash.get(DRIVER_POOL_KEY, None)
+    if pool is not None:
+        terminalreporter.write_line(f"Driver pool: {pool.metrics.summary()}")
+    if GRID.enabled:
+        workers = config.stash.get(GRID_METRICS_KEY, None)
+        metrics = merge_metrics(workers) if workers else GRID.metrics()
+        for line in format_metrics(metrics):
+            terminalreporter.write_line(line)
+    recorder = config.stash.get(FLAKINESS_RECORDER_KEY, None)
+    if recorder is not None and recorder.reruns.tests:
+        terminalreporter.write_line(f"Reruns: {recorder.reruns.summary()}")
+    store = config.stash.get(FLAKINESS_STORE_KEY, None)
+    quarantined = store.quarantined(
+        Config.QUARANTINE_THRESHOLD,
+        Config.QUARANTINE_MIN_RUNS) if store is not None else {}
+    if quarantined:
+        terminalreporter.write_line(
+            f"Quarantine: {len(quarantined)} tests with flakiness >= "
+            f"{Config.QUARANTINE_THRESHOLD:.0%}")
+        for nodeid, score in sorted(quarantined.items()):
+            terminalreporter.write_line(f"  {score:.0%} {nodeid}")
+    if ELEMENT_CACHE_STATS.hits or ELEMENT_CACHE_STATS.misses:
+        terminalreporter.write_line(
+            f"Element cache: {ELEMENT_CACHE_STATS.summary()}")
+    if STARTUP.metrics.sessions:
+        terminalreporter.write_line(f"Browser startup: {STARTUP.summary()}")
+    if NETWORK.enabled:
+        totals = NETWORK.totals
+        terminalreporter.write_line(
+            f"Network: requests={totals.requests} blocked={totals.blocked} "
+            f"from_cache={totals.served_from_cache} "
+            f"cached_bytes={totals.cached_bytes} "
+            f"saved~{totals.estimated_saved_ms:.0f}ms")
+    for group, metrics in TIMINGS.summary().items():
+        action = metrics.get("action_ms")
+        if action:
+            terminalreporter.write_line(
+                f"Page timing {group}: n={action['count']} "
+                f"p50={action['p50']:.0f}ms p95={action['p95']:.0f}ms")
@@ -0,0 +1,109 @@
+import time
+from typing import List
+import pytest
+from pages.login_page import LoginPage
+from utils.auth_state import AUTH_STATES, AuthState, AuthStateCache
+from utils.config import Config
+
+
+@pytest.mark.regression
+class TestAuthState:
+    """Unit tests for cached authentication state."""
+
+    def test_capture_and_apply_round_trip(self, fake_driver) -> None:
+        """Captured cookies and storage are injected into a new session."""
+        cookie = {"name": "session-username", "value": "standard_user",
+                  "path": "/"}
+        source = fake_driver()
+        source.cookies = [dict(cookie, extra="dropped")]
+        source.storage = {"cart-contents": "[]"}
+
+        state = AuthState.capture(source)
+        target = fake_driver()
+        state.apply(target)
+
+        assert target.cookies == [cookie]
+        assert target.storage == {"cart-contents": "[]"}
+
+    def test_cache_keyed_by_target_and_user(self) -> None:
+        """States of other targets or users are not reused."""
+        cache = AuthStateCache()
+        state = AuthState((), {})
+        cache.put("http://local", "standard", state)
+
+        assert cache.get("http://local", "standard") is state
+        assert cache.get("https://www.saucedemo.com", "standard") is None
+        assert cache.get("http://local", "problem") is None
+        cache.clear()
+        assert cache.get("http://local", "standard") is None
+
+    def test_fast_login_restores_cached_state(
+            self, fake_driver, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A cached user skips the login form."""
+        page = LoginPage(fake_driver())
+        calls: List[str] = []
+        monkeypatch.setattr(page, "restore_auth_state",
+                            lambda state: calls.append("restore") or True)
+        monkeypatch.setattr(page, "login",
+                            lambda username, password: calls.append("login"))
+        AUTH_STATES.put(Config.get_base_url(), "problem", AuthState((), {}))
+        try:
+            page.login_as_user("problem", fast=True)
+        finally:
+            AUTH_STATES.clear()
+
+        assert calls == ["restore"]
+
+    def test_expired_state_not_reused(self) -> None:
+        """States whose cookie expires within the margin are dropped."""
+        cache = AuthStateCache()
+        cookie = {"name": "session-username", "value": "standard_user"}
+        cache.put("http://local", "standard", AuthState(
+            (dict(cookie, expiry=int(time.time()) + 3600),), {}))
+        cache.put("http://local", "problem", AuthState(
+            (dict(cookie, expiry=int(time.time()) + 10),), {}))
+
+        assert cache.get("http://local", "standard") is not None
+        assert cache.get("http://local", "problem") is None
+
+    def test_rejected_state_falls_back_to_ui_login(
+            self, fake_driver, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A state redirected to the login page is replaced by a UI login."""
+        monkeypatch.setattr(Config, "PROBE_TIMEOUT", 0)
+        monkeypatch.setattr(Config, "CAPTURE_TIMING", False)
+        driver = fake_driver()
+        page = LoginPage(driver)
+        calls: List[str] = []
+
+        def login(username: str, password: str) -> None:
+            calls.append("login")
+            driver.current_url = page.inventory_url
+
+        monkeypatch.setattr(page, "login", login)
+        rejected = AuthState(({"name": "session-username", "value": "x"},),
+                             {})
+        AUTH_STATES.put(Config.get_base_url(), "standard", rejected)
+        try:
+            page.login_as_user("standard", fast=True)
+            cached = AUTH_STATES.get(Config.get_base_url(), "standard")
+        finally:
+            AUTH_STATES.clear()
+
+        assert calls == ["login"]
+        assert driver.navigations == [page.url, page.inventory_url, page.url]
+        assert cached is not None and cached is not rejected
+
+    def test_failing_login_not_cached(
+            self, fake_driver, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Users without a successful login neither wait nor cache."""
+        page = LoginPage(fake_driver())
+        calls: List[str] = []
+        monkeypatch.setattr(page, "login",
+                            lambda username, password: calls.append("login"))
+        start = time.perf_counter()
+
+        page.login_as_user("locked", fast=True)
+
+        assert calls == ["login"]
+        assert time.perf_counter() - start < 1
+        assert AUTH_STATES.get(Config.get_base_url(), "locked") is None
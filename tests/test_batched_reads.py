@@ -0,0 +1,52 @@
+import pytest
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from utils.screenshots import SCREENSHOTS
+
+
+USERNAME = (By.ID, "user-name")
+PASSWORD = (By.ID, "password")
+ERROR = (By.CSS_SELECTOR, "[data-test='error']")
+
+
+DOM = {
+    "user-name": {"displayed": True, "text": "", "placeholder": "Username"},
+    "password": {"displayed": True, "text": "", "placeholder": "Password"},
+    "[data-test='error']": {"displayed": False, "text": "Locked out"},
+}
+
+
+@pytest.mark.regression
+class TestBatchedReads:
+    """Unit tests for reading many elements in one script call."""
+
+    def test_texts_read_in_one_round_trip(self, fake_driver) -> None:
+        """Visible elements are read in one call after the wait."""
+        driver = fake_driver(DOM)
+        page = BasePage(driver)
+
+        assert page.find_many([PASSWORD, USERNAME]) == ["password",
+                                                        "user-name"]
+        assert page.get_texts([USERNAME, PASSWORD]) == ["", ""]
+        assert driver.reads == 2
+
+    def test_snapshot_reports_hidden_and_missing(self, fake_driver) -> None:
+        """Snapshot does not wait for hidden or missing elements."""
+        missing = (By.ID, "missing")
+        page = BasePage(fake_driver(DOM))
+
+        states = page.snapshot_state([ERROR, missing])
+
+        assert states[ERROR].present and not states[ERROR].displayed
+        assert states[ERROR].text == "Locked out"
+        assert not states[missing].present
+
+    def test_attributes_of_hidden_elements_are_none(
+            self, fake_driver, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Hidden elements yield None once the batch wait times out."""
+        monkeypatch.setattr(SCREENSHOTS, "capture", lambda *args: None)
+        page = BasePage(fake_driver(DOM))
+        page.timeout = 0
+
+        assert page.get_attributes([USERNAME, ERROR], "placeholder") == [
+            "Username", None]
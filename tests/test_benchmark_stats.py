@@ -0,0 +1,47 @@
+from pathlib import Path
+import pytest
+from utils.benchmark import BaselineStore, UserBenchmark
+
+
+def make_result(submit: list[float]) -> UserBenchmark:
+    """Benchmark result with fixed navigation and field entry times."""
+    result = UserBenchmark("standard")
+    result.phases["navigation"] = [0.5] * len(submit)
+    result.phases["field_entry"] = [0.25] * len(submit)
+    result.phases["submit"] = list(submit)
+    return result
+
+
+@pytest.mark.regression
+class TestBenchmarkStats:
+    """Unit tests for benchmark statistics and baseline gates."""
+
+    def test_throughput_over_measured_time(self) -> None:
+        """Throughput is rounds over the summed phase time."""
+        assert make_result([0.25, 0.25]).throughput == 1.0
+        assert UserBenchmark("standard").throughput == 0.0
+
+    def test_regression_beyond_threshold(self, tmp_path: Path) -> None:
+        """Only medians above baseline plus threshold are reported."""
+        store = BaselineStore(tmp_path / "baseline.json")
+        store.update(make_result([1.0, 1.0, 1.0]))
+
+        assert store.regressions(make_result([1.1, 1.1, 1.1]), 0.2) == []
+        failures = store.regressions(make_result([1.0, 1.5, 1.5]), 0.2)
+        assert len(failures) == 1
+        assert failures[0].startswith("standard.submit: median 1500.0ms")
+
+    def test_baselines_persist(self, tmp_path: Path) -> None:
+        """Saved medians are loaded by a new store."""
+        path = tmp_path / "baseline.json"
+        store = BaselineStore(path)
+        store.update(make_result([1.0, 2.0, 3.0]))
+        store.save()
+
+        assert BaselineStore(path).baselines["standard"]["submit"] == 2.0
+
+    def test_unknown_user_has_no_gate(self, tmp_path: Path) -> None:
+        """Without a baseline nothing can regress."""
+        store = BaselineStore(tmp_path / "baseline.json")
+
+        assert store.regressions(make_result([9.0]), 0.2) == []
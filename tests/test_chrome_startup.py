@@ -0,0 +1,32 @@
+from __future__ import annotations
+from pathlib import Path
+import pytest
+from utils.chrome_startup import ProfileTemplate
+
+
+def _build(user_data_dir: Path) -> None:
+    """Stand-in for Chrome writing a profile."""
+    (user_data_dir / "Default").mkdir()
+    (user_data_dir / "Default" / "Preferences").write_text("{}")
+    (user_data_dir / "SingletonLock").symlink_to("host-1")
+
+
+@pytest.mark.regression
+class TestChromeStartup:
+    """Unit tests for the pre-warmed Chrome profile template."""
+
+    def test_template_built_once_and_cloned(self, tmp_path: Path) -> None:
+        """Clones are independent copies without Chrome locks."""
+        template = ProfileTemplate(tmp_path / "template")
+        calls = []
+        template.ensure(lambda path: calls.append(_build(path)))
+        template.ensure(lambda path: calls.append(_build(path)))
+
+        clone = template.clone()
+        (clone / "Default" / "Preferences").write_text('{"changed": 1}')
+
+        assert len(calls) == 1
+        assert template.ready
+        assert not (clone / "SingletonLock").is_symlink()
+        assert (template.root / "Default" / "Preferences"
+                ).read_text() == "{}"
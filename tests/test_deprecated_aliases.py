@@ -0,0 +1,35 @@
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from utils.config import Config
+
+
+@pytest.mark.regression
+class TestDeprecatedAliases:
+    """Unit tests for attributes kept for older callers."""
+
+    def test_login_constants_follow_target(
+            self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Old URL constants resolve on the current target and warn."""
+        monkeypatch.setattr(Config, "_base_url_override", "http://local:8000")
+
+        with pytest.deprecated_call():
+            assert LoginPage.BASE_URL == "http://local:8000/"
+        with pytest.deprecated_call():
+            assert LoginPage.INVENTORY_URL == (
+                "http://local:8000/inventory.html")
+        with pytest.deprecated_call():
+            assert LoginPage.TEST_USERS["locked"]["username"] == (
+                "locked_out_user")
+
+    def test_page_wait_uses_page_timeout(self, fake_driver) -> None:
+        """Old wait attribute is a WebDriverWait with the page timeout."""
+        page = BasePage(fake_driver())
+        page.timeout = 3
+
+        with pytest.deprecated_call():
+            wait = page.wait
+
+        assert isinstance(wait, WebDriverWait)
+        assert wait._timeout == 3
@@ -0,0 +1,103 @@
+import pytest
+from utils.browser_contexts import BrowserContextPool
+from utils.driver_pool import DriverPool
+
+
+@pytest.mark.regression
+class TestDriverPool:
+    """Unit tests for the warm driver pool."""
+
+    def test_released_driver_is_reused(self, fake_driver) -> None:
+        """Second lease gets the same warm session after reset."""
+        pool = DriverPool(fake_driver, size=1, max_leases=10,
+                          reset_url="http://app/")
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        assert second is first
+        assert first.navigations == ["http://app/"]
+        assert (pool.metrics.hits, pool.metrics.misses) == (1, 1)
+
+    def test_driver_recycled_after_max_leases(self, fake_driver) -> None:
+        """Session is quit once it reaches the lease limit."""
+        pool = DriverPool(fake_driver, size=1, max_leases=2,
+                          reset_url="http://app/")
+        first = pool.acquire()
+        pool.release(first)
+        pool.release(pool.acquire())
+
+        assert first.quit_called
+        assert pool.acquire() is not first
+        assert pool.metrics.recycled == 1
+
+    def test_crashed_driver_recycled(self, fake_driver) -> None:
+        """Session failing the state reset is dropped."""
+        pool = DriverPool(lambda: fake_driver(crash_on_reset=True), size=1,
+                          max_leases=10, reset_url="http://app/")
+        first = pool.acquire()
+        pool.release(first)
+
+        assert first.quit_called
+        assert pool.metrics.recycled == 1
+        assert pool.metrics.reset_times == []
+
+    def test_context_pool_isolates_leases(self, fake_driver) -> None:
+        """Each lease runs in its own context of one shared browser."""
+        chrome = fake_driver()
+        pool = BrowserContextPool(lambda: chrome, reset_url="http://app/")
+        driver = pool.acquire()
+
+        assert driver.current_window_handle == "tab-2"
+        pool.release(driver)
+        assert driver.current_window_handle == "home"
+        assert chrome.disposed == ["ctx-1"]
+        assert not chrome.quit_called
+        assert pool.metrics.contexts_created == 1
+
+    def test_memory_sampled_every_interval_and_on_recycle(
+            self, fake_driver, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Process memory is not read on every release."""
+        samples = []
+        monkeypatch.setattr("utils.driver_pool.drivers_rss",
+                            lambda drivers: samples.append(1) or 0)
+        pool = DriverPool(fake_driver, size=1, max_leases=5,
+                          reset_url="http://app/", rss_interval=3)
+        for _ in range(4):
+            pool.release(pool.acquire())
+        assert len(samples) == 1
+
+        pool.release(pool.acquire())
+        assert len(samples) == 2
+        assert pool.metrics.recycled == 1
+
+    def test_context_leases_overlap(self, fake_driver) -> None:
+        """A second lease does not wait for the first one's release."""
+        chrome = fake_driver()
+        pool = BrowserContextPool(lambda: chrome, reset_url="http://app/")
+        first = pool.acquire()
+        first_tab = first.current_window_handle
+        second = pool.acquire()
+
+        pool.release(second)
+        second.switch_to.window(first_tab)
+        pool.release(first)
+
+        assert chrome.disposed == ["ctx-3", "ctx-1"]
+        assert chrome.window_handles == ["home"]
+        assert pool.metrics.contexts_created == 2
+
+    def test_new_tabs_set_up_before_loading(self, fake_driver) -> None:
+        """Per-target settings are applied to each tab, then it loads."""
+        chrome = fake_driver()
+        applied = []
+        pool = BrowserContextPool(
+            lambda: chrome, reset_url="http://app/",
+            setup_target=lambda driver: applied.append(
+                (driver.current_window_handle, list(driver.navigations))))
+
+        pool.release(pool.acquire())
+        pool.release(pool.acquire())
+
+        assert applied == [("tab-2", []), ("tab-5", ["http://app/"])]
+        assert chrome.navigations == ["http://app/", "http://app/"]
@@ -0,0 +1,84 @@
+from typing import List
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+
+USERNAME = (By.ID, "user-name")
+
+
+class FakeElement:
+    """Element that can go stale or hidden."""
+
+    def __init__(self) -> None:
+        self.stale = False
+        self.hidden = False
+        self.clicks = 0
+
+    def is_displayed(self) -> bool:
+        if self.stale:
+            raise StaleElementReferenceException("stale element")
+        return not self.hidden
+
+    def click(self) -> None:
+        if self.stale:
+            raise StaleElementReferenceException("stale element")
+        self.clicks += 1
+
+
+def make_page(driver) -> tuple[BasePage, List[FakeElement]]:
+    """Page whose lookups return a new FakeElement each time."""
+    page = BasePage(driver)
+    found: List[FakeElement] = []
+
+    def find_element(locator, screenshot=True):
+        found.append(FakeElement())
+        page.elements.put(locator, found[-1])
+        return found[-1]
+
+    page.find_element = find_element
+    return page, found
+
+
+@pytest.mark.regression
+class TestElementCache:
+    """Unit tests for the per-page element cache."""
+
+    def test_cached_element_reused_until_navigation(
+            self, fake_driver) -> None:
+        """Repeated actions skip lookups until the driver navigates."""
+        page, found = make_page(fake_driver())
+
+        page.click_element(USERNAME)
+        page.click_element(USERNAME)
+        page.driver.execute("get", {"url": "http://local/"})
+        page.click_element(USERNAME)
+
+        assert len(found) == 2
+        assert page.elements.stats.hits == 1
+        assert page.elements.stats.invalidations == 1
+
+    def test_stale_element_retried_once(self, fake_driver) -> None:
+        """Stale cached element is replaced transparently."""
+        page, found = make_page(fake_driver())
+        page.click_element(USERNAME)
+        found[0].stale = True
+
+        page.click_element(USERNAME)
+
+        assert len(found) == 2
+        assert found[1].clicks == 1
+        assert page.elements.stats.stale == 1
+
+    def test_hidden_element_looked_up_again(self, fake_driver) -> None:
+        """Hidden cached element waits for a visible one, like a miss."""
+        page, found = make_page(fake_driver())
+        page.click_element(USERNAME)
+        found[0].hidden = True
+
+        page.click_element(USERNAME)
+
+        assert len(found) == 2
+        assert (found[0].clicks, found[1].clicks) == (1, 1)
+        assert page.elements.get(USERNAME) is found[1]
@@ -0,0 +1,113 @@
+import multiprocessing
+from pathlib import Path
+import pytest
+from selenium.common.exceptions import TimeoutException
+from utils.flakiness import (FlakinessRecorder, FlakinessStore,
+                             is_timing_failure)
+
+
+NODE = "tests/test_login.py::TestLogin::test_performance_glitch_user"
+
+
+def make_report(when: str, outcome: str, **extra) -> pytest.TestReport:
+    """Phase report of NODE."""
+    report = pytest.TestReport(NODE, ("test_login.py", 1, NODE), {},
+                               outcome, None, when,
+                               user_properties=extra.pop("properties", []))
+    report.__dict__.update(extra)
+    return report
+
+
+def save_outcomes(path: Path, lane: int, saves: int) -> None:
+    """Save one outcome per call from a separate process."""
+    store = FlakinessStore(path, window=1000)
+    for index in range(saves):
+        store.record(f"{NODE}[{lane}]", str(index))
+        store.save()
+
+
+def run(recorder: FlakinessRecorder, call: str, **extra) -> None:
+    """Log setup, call and teardown of NODE."""
+    recorder.pytest_runtest_logreport(make_report("setup", "passed"))
+    recorder.pytest_runtest_logreport(make_report("call", call, **extra))
+    recorder.pytest_runtest_logreport(make_report("teardown", "passed"))
+
+
+@pytest.mark.regression
+class TestFlakiness:
+    """Unit tests for timing reruns and flakiness quarantine."""
+
+    def test_timing_failure_detects_wrapped_timeouts(self) -> None:
+        """Timeouts count even when re-raised as another error."""
+        try:
+            try:
+                raise TimeoutException("inventory not shown")
+            except TimeoutException as error:
+                raise AssertionError("no redirect") from error
+        except AssertionError as error:
+            assert is_timing_failure(error)
+        assert not is_timing_failure(AssertionError("wrong title"))
+
+    def test_score_counts_reruns_and_failures(self, tmp_path: Path) -> None:
+        """Score is the share of runs not passing at once."""
+        store = FlakinessStore(tmp_path / "flakiness.json", window=4)
+        for outcome in ("failed", "passed", "flaky", "passed", "failed"):
+            store.record(NODE, outcome)
+
+        assert store.history[NODE] == ["passed", "flaky", "passed", "failed"]
+        assert store.score(NODE) == 0.5
+        assert store.quarantined(0.5, 4) == {NODE: 0.5}
+        assert store.quarantined(0.5, 5) == {}
+
+    def test_never_passing_test_is_not_quarantined(
+            self, tmp_path: Path) -> None:
+        """A broken test keeps failing the main lane."""
+        store = FlakinessStore(tmp_path / "flakiness.json")
+        for _ in range(5):
+            store.record(NODE, "failed")
+
+        assert store.score(NODE) == 0.0
+
+    def test_recorder_persists_outcomes_and_rerun_time(
+            self, tmp_path: Path) -> None:
+        """Outcomes and rerun time of the run are saved."""
+        path = tmp_path / "flakiness.json"
+        recorder = FlakinessRecorder(FlakinessStore(path))
+
+        run(recorder, "passed")
+        run(recorder, "passed",
+            properties=[("reruns", 1), ("rerun_seconds", 2.5)])
+        run(recorder, "skipped", wasxfail="quarantined, flakiness 40%")
+        recorder.pytest_sessionfinish(None)
+
+        assert FlakinessStore(path).history[NODE] == ["passed", "flaky",
+                                                      "failed"]
+        assert recorder.reruns.tests == 1
+        assert recorder.reruns.recovered == 1
+        assert recorder.reruns.seconds == 2.5
+
+    def test_save_merges_concurrent_runs(self, tmp_path: Path) -> None:
+        """Outcomes of runs sharing the file are not overwritten."""
+        path = tmp_path / "flakiness.json"
+        main, quarantine = FlakinessStore(path), FlakinessStore(path)
+        main.record(NODE, "passed")
+        quarantine.record(NODE, "flaky")
+        main.save()
+        quarantine.save()
+
+        assert FlakinessStore(path).history[NODE] == ["passed", "flaky"]
+
+    def test_save_merges_parallel_processes(self, tmp_path: Path) -> None:
+        """Processes saving at the same time lose no outcomes."""
+        path = tmp_path / "flakiness.json"
+        lanes = [multiprocessing.Process(target=save_outcomes,
+                                         args=(path, lane, 25))
+                 for lane in range(4)]
+        for lane in lanes:
+            lane.start()
+        for lane in lanes:
+            lane.join()
+
+        history = FlakinessStore(path).history
+        assert [len(history[f"{NODE}[{lane}]"]) for lane in range(4)] == [
+            25] * 4
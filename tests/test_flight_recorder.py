@@ -0,0 +1,120 @@
+import json
+import time
+from types import SimpleNamespace
+import pytest
+from selenium.webdriver.chrome.options import Options
+from utils.config import Config
+from utils.flight_recorder import FlightRecorder
+
+
+def make_page(driver) -> SimpleNamespace:
+    """Page object stand-in with an old console error in its log."""
+    driver.logs["browser"] = [{"level": "SEVERE", "message": "boom",
+                               "timestamp": 0}]
+    return SimpleNamespace(driver=driver)
+
+
+def request_entry(timestamp_ms: float) -> dict:
+    """Performance log entry of one script request."""
+    return {"timestamp": timestamp_ms, "message": json.dumps({
+        "message": {"method": "Network.requestWillBeSent",
+                    "params": {"requestId": "1", "type": "Script",
+                               "request": {"url": "http://local/a.js"}}},
+    })}
+
+
+def make_recorder(dom_snapshots: int = 2) -> FlightRecorder:
+    """Recorder with a small command buffer."""
+    return FlightRecorder(max_events=3, max_age=60,
+                          dom_snapshots=dom_snapshots, dom_chars=100)
+
+
+@pytest.fixture(autouse=True)
+def flight_recorder_on(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Switch the recorder on; it is off by default."""
+    monkeypatch.setattr(Config, "FLIGHT_RECORDER", True)
+
+
+@pytest.mark.regression
+class TestFlightRecorder:
+    """Unit tests for the failure-only flight recorder."""
+
+    def test_keeps_last_events_and_masks_typed_text(
+            self, fake_driver) -> None:
+        """Ring buffer bound, step attribution and secret masking."""
+        recorder = make_recorder()
+        page = make_page(fake_driver())
+        recorder.begin()
+        recorder.step_started("Login", page)
+        for index in range(5):
+            recorder.after_command(None, "sendKeysToElement",
+                                   {"id": str(index), "text": "secret_sauce"},
+                                   0.01, None)
+        recorder.step_finished("Login", page, None)
+
+        trace = recorder.dump(page.driver, "test_login")
+        commands = [e for e in trace["events"] if e["ch"] == "command"]
+
+        assert [c["params"]["id"] for c in commands] == ["2", "3", "4"]
+        assert all(c["params"]["text"] == "<12 chars>" for c in commands)
+        assert commands[0]["step"] == "Login"
+        # Console entries older than the test are dropped
+        assert not [e for e in trace["events"] if e["ch"] == "console"]
+
+    def test_dom_captured_only_for_failures(self, fake_driver) -> None:
+        """Passing steps cost no snapshot, failed steps and dumps do."""
+        recorder = make_recorder()
+        page = make_page(fake_driver())
+        recorder.begin()
+        recorder.step_started("Open page", page)
+        recorder.step_finished("Open page", page, None)
+        assert page.driver.snapshots == []
+
+        recorder.step_started("Click", page)
+        recorder.step_finished("Click", page, TimeoutError())
+        trace = recorder.dump(page.driver, "test_login")
+
+        dom = [e for e in trace["events"] if e["ch"] == "dom"]
+        assert [(e["step"], e.get("error")) for e in dom] == [
+            ("Click", "TimeoutError"), ("dump", None)]
+
+    def test_drops_events_after_passing_test(self) -> None:
+        """end() leaves nothing for the next dump."""
+        recorder = make_recorder(dom_snapshots=0)
+        recorder.begin()
+        recorder.network_event(1e12, "Network.requestWillBeSent",
+                               {"requestId": "1", "request": {"url": "/a"}})
+        recorder.end()
+        recorder.begin()
+
+        assert recorder.dump(None, "next")["events"] == []
+
+    def test_network_read_only_when_dumped(self, fake_driver) -> None:
+        """Passing tests leave the log alone, dumps skip older entries."""
+        recorder = make_recorder(dom_snapshots=0)
+        driver = fake_driver()
+        now_ms = time.time() * 1000
+        driver.logs["performance"] = [request_entry(0),
+                                      request_entry(now_ms + 1000)]
+        recorder.begin()
+        recorder.end()
+        assert len(driver.logs["performance"]) == 2
+
+        recorder.begin()
+        events = recorder.dump(driver, "test_login")["events"]
+
+        assert [e["url"] for e in events if e["ch"] == "network"] == [
+            "http://local/a.js"]
+        assert driver.logs["performance"] == []
+
+    def test_options_enable_console_and_network_logs(self) -> None:
+        """Both logs are requested, interception settings are kept."""
+        options = Options()
+        options.set_capability("goog:loggingPrefs", {"driver": "INFO"})
+
+        make_recorder().configure_options(options)
+
+        assert options.capabilities["goog:loggingPrefs"] == {
+            "driver": "INFO", "browser": "ALL", "performance": "ALL"}
+        assert options.experimental_options["perfLoggingPrefs"] == {
+            "enableNetwork": True, "enablePage": False}
@@ -0,0 +1,90 @@
+import time
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from urllib3.exceptions import MaxRetryError
+import utils.grid
+from utils.grid import (GridDispatcher, format_metrics, is_node_loss,
+                        merge_metrics)
+
+
+def make_dispatcher(queue_timeout: float = 0.1) -> GridDispatcher:
+    """Two nodes of capacity 2 whose status is considered fresh."""
+    grid = GridDispatcher(["http://a:4444", "http://b:4444"], capacity=2,
+                          health_interval=3600, queue_timeout=queue_timeout)
+    for node in grid.nodes:
+        node.last_check = time.monotonic()
+    return grid
+
+
+class UnreachableChrome:
+    """Remote session whose node reports up but never starts Chrome."""
+
+    def __init__(self, node, dispatcher, options) -> None:
+        raise WebDriverException("chrome not reachable")
+
+
+@pytest.mark.regression
+class TestGrid:
+    """Unit tests for Selenium node dispatch."""
+
+    def test_sessions_go_to_least_loaded_node(self) -> None:
+        """Dispatch balances nodes and respects the cap."""
+        grid = make_dispatcher()
+        grid.nodes[1].others = 1  # session of another worker
+
+        picked = [grid._acquire().url for _ in range(3)]
+
+        assert picked == ["http://a:4444", "http://a:4444", "http://b:4444"]
+        with pytest.raises(WebDriverException, match="No free Selenium node"):
+            grid._acquire()
+
+    def test_dead_node_skipped_and_reported(self) -> None:
+        """Marked down node gets no sessions and shows in metrics."""
+        grid = make_dispatcher()
+        grid.mark_down(grid.nodes[0])
+
+        node = grid._acquire()
+        grid.release(node)
+        lines = format_metrics(merge_metrics([grid.metrics(),
+                                              grid.metrics()]))
+
+        assert node.url == "http://b:4444"
+        assert "failures=2" in lines[0]
+        assert lines[-1].startswith("Grid queue: waits=2")
+
+    def test_failing_nodes_tried_once_per_session(
+            self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Nodes that look healthy but fail sessions do not loop forever."""
+        grid = make_dispatcher(queue_timeout=30)
+        grid.health_interval = 0
+        monkeypatch.setattr(grid, "_check", lambda url: (True, 0))
+        monkeypatch.setattr(utils.grid, "RemoteChrome", UnreachableChrome)
+        start = time.monotonic()
+
+        with pytest.raises(WebDriverException,
+                           match="No Selenium node could start"):
+            grid.create_driver(Options())
+
+        assert time.monotonic() - start < 5
+        assert [node.stats.failures for node in grid.nodes] == [1, 1]
+        assert [node.active for node in grid.nodes] == [0, 0]
+
+    def test_queue_deadline_shared_by_retries(
+            self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A retry after a failed node waits only for the remaining time."""
+        grid = make_dispatcher(queue_timeout=0.3)
+        grid.nodes[1].others = 2  # full with sessions of other workers
+        monkeypatch.setattr(utils.grid, "RemoteChrome", UnreachableChrome)
+        start = time.monotonic()
+
+        with pytest.raises(WebDriverException, match="No free Selenium node"):
+            grid.create_driver(Options())
+
+        assert time.monotonic() - start < 1
+
+    def test_node_loss_detection(self) -> None:
+        """Connection errors and lost sessions count as node loss."""
+        assert is_node_loss(MaxRetryError(None, "/session", "refused"))
+        assert is_node_loss(WebDriverException("invalid session id"))
+        assert not is_node_loss(WebDriverException("no such element"))
@@ -0,0 +1,64 @@
+import pytest
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+
+LOGIN_URL = "http://local/"
+LOGIN_BUTTON = (By.ID, "login-button")
+LOGIN_DOM = {"login-button": {"displayed": True}}
+
+
+class FakeLoginPage(BasePage):
+    """Page with its own address and ready element."""
+
+    READY_LOCATOR = LOGIN_BUTTON
+
+    @property
+    def url(self) -> str:
+        """Fixed login URL."""
+        return LOGIN_URL
+
+
+@pytest.mark.regression
+class TestLazyNavigation:
+    """Unit tests for opening pages on first interaction."""
+
+    def test_first_interaction_opens_page(self, fake_driver) -> None:
+        """A page shown elsewhere is loaded before the first read."""
+        driver = fake_driver(LOGIN_DOM, "about:blank")
+
+        assert FakeLoginPage(driver).is_element_visible_now(LOGIN_BUTTON)
+        assert driver.navigations == [LOGIN_URL]
+
+    def test_displayed_page_is_not_reloaded(self, fake_driver) -> None:
+        """The page state is checked once and nothing is loaded."""
+        driver = fake_driver(LOGIN_DOM, LOGIN_URL)
+        page = FakeLoginPage(driver)
+
+        page.is_element_visible_now(LOGIN_BUTTON)
+        page.is_element_visible_now(LOGIN_BUTTON)
+
+        assert driver.navigations == []
+        assert driver.state_checks == 1
+
+    def test_loading_page_is_reloaded(self, fake_driver) -> None:
+        """A page still loading does not count as open."""
+        driver = fake_driver(LOGIN_DOM, LOGIN_URL, ready_state="loading")
+
+        assert FakeLoginPage(driver).open()
+        assert driver.navigations == [LOGIN_URL]
+
+    def test_force_reloads_open_page(self, fake_driver) -> None:
+        """Forced open navigates without checking the page state."""
+        driver = fake_driver(LOGIN_DOM, LOGIN_URL)
+
+        assert FakeLoginPage(driver).open(force=True)
+        assert driver.navigations == [LOGIN_URL]
+        assert driver.state_checks == 0
+
+    def test_page_without_url_never_navigates(self, fake_driver) -> None:
+        """Component pages rely on the page the browser shows."""
+        driver = fake_driver(LOGIN_DOM, "about:blank")
+
+        assert not BasePage(driver).open()
+        assert driver.navigations == []
@@ -0,0 +1,57 @@
+import pytest
+from utils.load_generator import LoginResult, build_report, main, parse_mix
+
+
+@pytest.mark.regression
+class TestLoadGenerator:
+    """Unit tests for load generator parsing and reporting."""
+
+    def test_parse_mix_weights(self) -> None:
+        """Weights default to 1 and empty entries are ignored."""
+        assert parse_mix("standard=3,locked,") == {"standard": 3.0,
+                                                   "locked": 1.0}
+
+    def test_parse_mix_rejects_unknown_user(self) -> None:
+        """Unknown user types fail before any browser starts."""
+        with pytest.raises(KeyError, match="admin"):
+            parse_mix("standard=1,admin=2")
+
+    def test_report_rates_and_throughput(self) -> None:
+        """Error rates share all logins, throughput counts successes."""
+        results = [
+            LoginResult("standard", True, "", 0.0, 1.0),
+            LoginResult("standard", True, "", 0.1, 2.0),
+            LoginResult("locked", False, "locked out", 0.0, 0.5),
+            LoginResult("problem", False, "TimeoutException", 0.2, 3.0),
+        ]
+
+        report = build_report(results, elapsed=4.0)
+
+        assert report["logins"] == 4
+        assert report["successful"] == 2
+        assert report["logins_per_sec"] == 0.5
+        assert report["error_rates"] == {"locked out": 0.25,
+                                         "TimeoutException": 0.25}
+        assert report["latency"]["max"] == 3.0
+        assert sorted(report["by_user"]) == ["locked", "problem",
+                                             "standard"]
+
+    def test_report_of_empty_run(self) -> None:
+        """A run without arrivals reports zeros instead of dividing by 0."""
+        report = build_report([], elapsed=0.0)
+
+        assert report["logins"] == 0
+        assert report["logins_per_sec"] == 0.0
+        assert report["error_rates"] == {}
+
+    @pytest.mark.parametrize("option", ["--rate", "--duration"])
+    @pytest.mark.parametrize("value", ["0", "-1", "fast"])
+    def test_rejects_non_positive_rate_and_duration(
+            self, option: str, value: str,
+            capsys: pytest.CaptureFixture) -> None:
+        """Arguments are checked before a server or browser starts."""
+        with pytest.raises(SystemExit) as exit_info:
+            main([option, value])
+
+        assert exit_info.value.code == 2
+        assert "must be a number above zero" in capsys.readouterr().err
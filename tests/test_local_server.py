@@ -0,0 +1,47 @@
+from typing import Generator
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import pytest
+from utils.local_server import LocalSauceDemo
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[LocalSauceDemo, None, None]:
+    """Start local stand-in server for the module."""
+    server = LocalSauceDemo(glitch_delay=0.1)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.regression
+class TestLocalServer:
+    """Checks of the local Saucedemo stand-in."""
+
+    def test_login_page_has_locators(self, server: LocalSauceDemo) -> None:
+        """Login page exposes the ids used by LoginPage locators."""
+        html = urlopen(server.url + "/").read().decode()
+        for marker in ('id="user-name"', 'id="password"',
+                       'id="login-button"', 'class="login_logo"',
+                       "GLITCH_DELAY_MS = 100;"):
+            assert marker in html, f"{marker} missing from login page"
+
+    def test_inventory_page_served(self, server: LocalSauceDemo) -> None:
+        """Inventory page contains the inventory container."""
+        html = urlopen(server.url + "/inventory.html").read().decode()
+        assert 'id="inventory_container"' in html
+
+    def test_unknown_path_not_found(self, server: LocalSauceDemo) -> None:
+        """Unknown paths return 404."""
+        with pytest.raises(HTTPError) as error:
+            urlopen(server.url + "/missing.html")
+        assert error.value.code == 404
+
+    def test_public_host_in_url(self) -> None:
+        """URL uses the advertised host, not the bound interface."""
+        server = LocalSauceDemo(host="0.0.0.0", public_host="tests")
+        server.start()
+        try:
+            assert server.url.startswith("http://tests:")
+        finally:
+            server.stop()
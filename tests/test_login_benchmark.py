@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+from typing import Generator
+import pytest
+import allure
+from pages.login_page import LoginPage
+from utils.benchmark import BaselineStore, LoginBenchmark
+from utils.config import Config
+
+
+@pytest.fixture(scope="session")
+def baseline_store(
+        request: pytest.FixtureRequest
+) -> Generator[BaselineStore, None, None]:
+    """Load benchmark baselines, saving them after the run if requested."""
+    store = BaselineStore(Path(request.config.rootpath,
+                               Config.BENCHMARK_BASELINE))
+    yield store
+    if request.config.getoption("benchmark_save"):
+        store.save()
+
+
+@allure.epic("Performance")
+@allure.feature("Login Benchmark")
+@pytest.mark.benchmark
+class TestLoginBenchmark:
+    """Repeated login timing with regression gates."""
+
+    @allure.story("Login Phases")
+    @allure.title("Benchmark login phases of {user_type} user")
+    @pytest.mark.parametrize("user_type", list(Config.USERS))
+    def test_login_phases(self, login_page: LoginPage,
+                          baseline_store: BaselineStore,
+                          request: pytest.FixtureRequest,
+                          user_type: str) -> None:
+        """Benchmark navigation, field entry and submit phases."""
+        with allure.step(f"Run {Config.BENCHMARK_ROUNDS} logins "
+                         f"after {Config.BENCHMARK_WARMUP} warmup rounds"):
+            result = LoginBenchmark(login_page, Config.BENCHMARK_ROUNDS,
+                                    Config.BENCHMARK_WARMUP).run(user_type)
+            allure.attach(json.dumps(result.report(), indent=2),
+                          name=f"benchmark_{user_type}",
+                          attachment_type=allure.attachment_type.JSON)
+
+        with allure.step("Compare with baseline"):
+            regressions = baseline_store.regressions(
+                result, Config.BENCHMARK_THRESHOLD)
+            if request.config.getoption("benchmark_save"):
+                baseline_store.update(result)
+            assert not regressions, "; ".join(regressions)
@@ -0,0 +1,69 @@
+import pytest
+from utils.config import Config
+from utils.credentials import CREDENTIALS, PASSWORD
+from utils.login_cases import LoginCaseGenerator
+
+
+@pytest.mark.regression
+class TestLoginCases:
+    """Unit tests for the credential registry and login case generator."""
+
+    def test_cases_are_deterministic_per_seed(self) -> None:
+        """Same seed gives the same cases, case(n) matches iteration."""
+        first = list(LoginCaseGenerator(CREDENTIALS, "seed", 50))
+        second = list(LoginCaseGenerator(CREDENTIALS, "seed", 50))
+        other = list(LoginCaseGenerator(CREDENTIALS, "other", 50))
+
+        assert first == second
+        assert first != other
+        assert LoginCaseGenerator(CREDENTIALS, "seed", 50).case(
+            37) == first[37]
+
+    def test_shards_partition_cases(self) -> None:
+        """Every case lands in exactly one shard."""
+        generator = LoginCaseGenerator(CREDENTIALS, "seed", 103)
+
+        sharded = [case.index for shard in range(4)
+                   for case in generator.shard(shard, 4)]
+
+        assert sorted(sharded) == list(range(103))
+        with pytest.raises(ValueError):
+            generator.shard(4, 4)
+
+    def test_grouped_runs_session_groups_back_to_back(self) -> None:
+        """Cases of one session group run one after another."""
+        generator = LoginCaseGenerator(CREDENTIALS, "seed", 70)
+
+        groups = [case.session_group
+                  for case in generator.grouped(generator)]
+
+        assert groups == sorted(groups)
+        assert set(groups) == {"form", "inventory"}
+
+    def test_expected_outcomes_follow_registry(self) -> None:
+        """Expected outcomes and categories follow the registry."""
+        cases = list(LoginCaseGenerator(CREDENTIALS, "seed", 140))
+
+        assert {case.category for case in cases} == set(
+            LoginCaseGenerator(CREDENTIALS, "seed", 0).categories)
+        for case in cases:
+            if case.category == "valid":
+                assert case.expected == CREDENTIALS.by_username(
+                    case.username).outcome
+            if case.category == "wrong_password":
+                assert case.expected == "invalid"
+            if case.category == "long":
+                assert 256 <= max(len(case.username),
+                                  len(case.password)) <= 1024
+            if case.category == "unicode":
+                assert all(ord(char) < 0xE000 for char in case.username)
+
+    def test_registry_backs_config_users(self) -> None:
+        """Config users and lookups come from the credential registry."""
+        assert Config.USERS == CREDENTIALS.as_users()
+        assert Config.get_user_credentials("locked") == {
+            "username": "locked_out_user", "password": PASSWORD}
+        assert CREDENTIALS.expected_outcome("locked_out_user",
+                                            PASSWORD) == "locked"
+        with pytest.raises(KeyError):
+            Config.get_user_credentials("admin")
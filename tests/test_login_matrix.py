@@ -0,0 +1,77 @@
+from typing import List
+import pytest
+import allure
+from selenium.common.exceptions import TimeoutException
+from pages.login_page import LoginPage
+from utils.config import Config
+from utils.credentials import CREDENTIALS, ERROR_MESSAGES
+from utils.login_cases import LoginCase, LoginCaseGenerator
+
+
+MATRIX = LoginCaseGenerator(CREDENTIALS, Config.MATRIX_SEED,
+                            Config.MATRIX_CASES)
+
+
+def run_case(login_page: LoginPage, case: LoginCase) -> str:
+    """Submit the login form and read which outcome the page shows.
+
+    Args:
+        login_page: Login page on the login form
+        case: Generated case
+
+    Returns:
+        'success', a key of ERROR_MESSAGES or the unexpected error text
+    """
+    login_page.login(case.username, case.password)
+    if case.expected == "success":
+        try:
+            login_page.wait_for_inventory_page()
+        except TimeoutException:
+            return login_page.get_error_message() or "no inventory page"
+        return "success"
+    try:
+        message = login_page.get_error_message()
+    except TimeoutException:
+        return "success" if login_page.is_on_inventory_page() \
+            else "no error message"
+    return next((outcome for outcome, text in ERROR_MESSAGES.items()
+                 if text in message), message)
+
+
+@allure.epic("Authorization Tests")
+@allure.feature("Saucedemo Login")
+@pytest.mark.matrix
+class TestLoginMatrix:
+    """Generated credential and input cases, one warm session per shard."""
+
+    @allure.story("Login Matrix")
+    @allure.title("Generated login cases of shard {shard}")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.login
+    @pytest.mark.parametrize("shard", range(Config.MATRIX_SHARDS))
+    def test_login_matrix(self, login_page: LoginPage, shard: int) -> None:
+        """Run the shard's cases back-to-back in one browser session.
+
+        Cases ending on the login form only dismiss the error before the
+        next case; the page is reloaded after successful logins.
+        """
+        failures: List[str] = []
+        on_form = False
+        for case in MATRIX.grouped(MATRIX.shard(shard,
+                                                Config.MATRIX_SHARDS)):
+            with allure.step(f"Case {case.case_id}: "
+                             f"expect {case.expected}"):
+                if on_form:
+                    login_page.dismiss_error()
+                else:
+                    login_page.driver.delete_all_cookies()
+                    login_page.open(force=True)
+                actual = run_case(login_page, case)
+                on_form = actual in ERROR_MESSAGES
+                if actual != case.expected:
+                    failures.append(f"{case.case_id} "
+                                    f"({case.username!r}): expected "
+                                    f"{case.expected}, got {actual}")
+
+        assert not failures, \
+            f"{len(failures)} login cases failed:\n" + "\n".join(failures)
@@ -0,0 +1,79 @@
+import json
+import pytest
+from utils.network import NetworkInterceptor, NetworkStats
+
+
+def entry(method: str, **params) -> dict:
+    """Performance log entry of one DevTools Network event."""
+    return {"timestamp": 0, "message": json.dumps(
+        {"message": {"method": method, "params": params}})}
+
+
+PAGE_LOAD = [
+    entry("Network.requestWillBeSent", requestId="1"),
+    entry("Network.responseReceived", requestId="1",
+          response={"timing": {"receiveHeadersEnd": 120.0}}),
+    entry("Network.loadingFinished", requestId="1", encodedDataLength=5000),
+    entry("Network.requestWillBeSent", requestId="2"),
+    entry("Network.loadingFailed", requestId="2",
+          blockedReason="inspector"),
+    entry("Network.requestWillBeSent", requestId="3"),
+    entry("Network.loadingFailed", requestId="3", errorText="net::ERR"),
+    entry("Network.requestWillBeSent", requestId="4"),
+    entry("Network.requestServedFromCache", requestId="4"),
+    entry("Network.responseReceived", requestId="4",
+          response={"fromDiskCache": True,
+                    "headers": {"Content-Length": "2048"}}),
+]
+
+
+@pytest.mark.regression
+class TestNetwork:
+    """Unit tests for request blocking and network accounting."""
+
+    def test_resource_types_become_url_patterns(self) -> None:
+        """Blocked types add their extension patterns to explicit ones."""
+        network = NetworkInterceptor(blocked_patterns=["*/analytics/*"],
+                                     blocked_types=["font", "stylesheet"])
+
+        assert network.blocked_urls == [
+            "*/analytics/*", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+            "*.css"]
+        assert network.enabled
+
+    def test_unknown_resource_type_rejected(self) -> None:
+        """A typo in the blocked types fails fast."""
+        with pytest.raises(ValueError, match="Unknown resource types"):
+            NetworkInterceptor(blocked_types=["images"])
+
+    def test_collect_counts_blocked_and_cached(self, fake_driver) -> None:
+        """Drained events are counted and added to the totals."""
+        network = NetworkInterceptor(blocked_types=["image"])
+        driver = fake_driver()
+        driver.logs["performance"] = list(PAGE_LOAD)
+
+        stats = network.collect(driver)
+
+        assert (stats.requests, stats.blocked, stats.served_from_cache) == (
+            4, 1, 1)
+        assert stats.cached_bytes == 2048
+        assert stats.transferred_bytes == 5000
+        assert stats.network_ms == 120.0
+        assert network.totals == stats
+        assert network.collect(driver) == NetworkStats()
+
+    def test_disabled_interceptor_reads_no_log(self, fake_driver) -> None:
+        """Without interception the performance log is left alone."""
+        driver = fake_driver()
+        driver.logs["performance"] = list(PAGE_LOAD)
+
+        assert NetworkInterceptor().collect(driver) == NetworkStats()
+        assert len(driver.logs["performance"]) == len(PAGE_LOAD)
+
+    def test_estimated_saving(self) -> None:
+        """Avoided requests cost the average time of fetched ones."""
+        stats = NetworkStats(requests=10, blocked=2, served_from_cache=3,
+                             network_ms=500.0)
+
+        assert stats.estimated_saved_ms == 500.0
+        assert NetworkStats(requests=2, blocked=2).estimated_saved_ms == 0.0
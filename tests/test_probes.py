@@ -0,0 +1,51 @@
+import time
+import pytest
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+
+ERROR = (By.CSS_SELECTOR, "[data-test='error']")
+
+
+def error_shown_from(read: int) -> dict:
+    """DOM whose error message exists from the given read on."""
+    return {ERROR[1]: {"from_read": read}}
+
+
+@pytest.mark.regression
+class TestProbes:
+    """Unit tests for bounded visibility probes."""
+
+    def test_visible_now_reads_once(self, fake_driver) -> None:
+        """The immediate probe never polls."""
+        driver = fake_driver(error_shown_from(2))
+
+        assert not BasePage(driver).is_element_visible_now(ERROR)
+        assert driver.reads == 1
+
+    def test_visible_within_returns_on_appearance(self, fake_driver) -> None:
+        """Polling stops as soon as the element shows up."""
+        driver = fake_driver(error_shown_from(3))
+
+        assert BasePage(driver).is_element_visible_within(ERROR, timeout=5)
+        assert driver.reads == 3
+
+    def test_visible_within_gives_up_after_timeout(self, fake_driver) -> None:
+        """A never visible element costs the probe timeout only."""
+        start = time.perf_counter()
+
+        assert not BasePage(fake_driver()
+                            ).is_element_visible_within(ERROR, timeout=0.2)
+        assert time.perf_counter() - start < 1.0
+
+    def test_absent_returns_without_polling(self, fake_driver) -> None:
+        """An already missing element is reported after one read."""
+        driver = fake_driver()
+
+        assert BasePage(driver).is_element_absent(ERROR, timeout=5)
+        assert driver.reads == 1
+
+    def test_visible_element_is_not_absent(self, fake_driver) -> None:
+        """A displayed element fails the absence probe after the timeout."""
+        assert not BasePage(fake_driver(error_shown_from(1))
+                            ).is_element_absent(ERROR, timeout=0.2)
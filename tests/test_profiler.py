@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+import pytest
+from utils.profiler import CommandProfiler
+from utils.stats import percentile, summarize
+
+
+@pytest.mark.regression
+class TestProfiler:
+    """Unit tests for command latency statistics."""
+
+    def test_percentile_interpolates(self) -> None:
+        """Percentiles interpolate between the closest ranks."""
+        values = [4.0, 1.0, 3.0, 2.0]
+
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+        assert percentile([], 95) == 0.0
+
+    def test_summarize_empty_samples(self) -> None:
+        """Empty input gives zeros instead of raising."""
+        assert summarize([]) == {"count": 0, "total": 0, "min": 0.0,
+                                 "p50": 0.0, "p95": 0.0, "p99": 0.0,
+                                 "max": 0.0}
+
+    def test_commands_attributed_to_test(self) -> None:
+        """Commands are grouped per test, slowest total first."""
+        profiler = CommandProfiler()
+        profiler.record("newSession", 2.0)
+        profiler.begin("test_login")
+        profiler.after_command(None, "findElement",
+                               {"using": "css selector", "value": "#a"},
+                               0.1, None)
+        profiler.after_command(None, "clickElement", {"id": "1"}, 0.3,
+                               RuntimeError("stale"))
+
+        profile = profiler.end()
+
+        assert list(profile["commands"]) == ["clickElement", "findElement"]
+        assert profiler.records[1].locator == "css selector=#a"
+        assert profiler.records[2].failed
+        assert profiler.records[0].test == ""
+
+    def test_export_writes_summary_and_records(self, tmp_path: Path) -> None:
+        """Exported file holds per-test statistics and raw records."""
+        profiler = CommandProfiler()
+        profiler.begin("test_login")
+        profiler.record("get", 0.5)
+        path = tmp_path / "profile.json"
+
+        profiler.export(path)
+
+        data = json.loads(path.read_text())
+        assert data["summary"]["tests"]["test_login"]["count"] == 1
+        assert data["records"][0]["command"] == "get"
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+import pytest
+from utils.result_log import (ResultLog, export_allure, read_records,
+                              read_summary)
+
+
+def make_record(nodeid: str, status: str, worker: str) -> dict:
+    """Result record as written by ResultLogPlugin."""
+    return {"nodeid": nodeid, "status": status, "duration": 1.5,
+            "start": 100.0, "stop": 101.5, "worker": worker,
+            "host": "ci", "title": nodeid, "markers": ["login"],
+            "labels": [["severity", "critical"], ["story", "Login"]],
+            "story": "Login", "feature": None, "severity": "critical"}
+
+
+@pytest.mark.regression
+class TestResultLog:
+    """Unit tests for the append-only result log."""
+
+    def test_workers_merge_into_one_summary(self, tmp_path: Path) -> None:
+        """Summaries of separate workers are readable mid-run."""
+        first = ResultLog(tmp_path, "gw0", flush_interval=0)
+        second = ResultLog(tmp_path, "gw1", flush_interval=3600)
+        first.append(make_record("test_a", "passed", "gw0"))
+        second.append(make_record("test_b", "failed", "gw1"))
+        second.append(make_record("test_c", "passed", "gw1"))
+
+        live = read_summary(tmp_path).as_dict()
+        second.close()
+        final = read_summary(tmp_path).as_dict()
+
+        assert live["total"]["passed"] == 1
+        assert final["marker"]["login"]["failed"] == 1
+        assert final["story"]["Login"]["duration"] == 4.5
+        assert len(list(read_records(tmp_path))) == 3
+
+    def test_export_writes_allure_results(self, tmp_path: Path) -> None:
+        """Every record becomes an Allure result file."""
+        log = ResultLog(tmp_path / "log", "main")
+        log.append(make_record("tests/test_login.py::test_a", "broken",
+                               "main"))
+        log.close()
+
+        assert export_allure(tmp_path / "log", tmp_path / "allure") == 1
+        result = json.loads(next((tmp_path / "allure").glob(
+            "*-result.json")).read_text())
+        assert result["status"] == "broken"
+        assert {"name": "tag", "value": "login"} in result["labels"]
+        assert result["stop"] - result["start"] == 1500
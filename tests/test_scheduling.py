@@ -0,0 +1,94 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+import pytest
+from utils.scheduling import (DurationOrdering, DurationScheduling,
+                              DurationStore)
+
+
+class FakeItem:
+    """Collected item with a node ID only."""
+
+    def __init__(self, nodeid: str) -> None:
+        self.nodeid = nodeid
+
+
+class FakeConfig:
+    """xdist options read by LoadScheduling."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+
+    def getvalue(self, name: str) -> List[str]:
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, name: str) -> None:
+        return None
+
+
+class FakeNode:
+    """Worker node recording the test indices sent to it."""
+
+    def __init__(self, gateway_id: str) -> None:
+        self.gateway = SimpleNamespace(id=gateway_id)
+        self.sent: List[int] = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices: List[int]) -> None:
+        self.sent.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+@pytest.mark.regression
+class TestScheduling:
+    """Unit tests for duration based ordering and distribution."""
+
+    def test_store_blends_measurements(self, tmp_path: Path) -> None:
+        """New durations are smoothed with the stored one and persisted."""
+        store = DurationStore(tmp_path / "durations.json", smoothing=0.5)
+        store.record("slow", 4.0)
+        store.record("slow", 2.0)
+        store.save()
+
+        assert DurationStore(tmp_path / "durations.json").get(
+            "slow", 0.0) == 3.0
+
+    def test_ordering_puts_slowest_first(self, tmp_path: Path) -> None:
+        """Unknown tests get the average of the known durations."""
+        store = DurationStore(tmp_path / "durations.json")
+        store.durations = {"fast": 1.0, "slow": 5.0}
+        items = [FakeItem("fast"), FakeItem("new"), FakeItem("slow")]
+
+        DurationOrdering(store).pytest_collection_modifyitems(items)
+
+        assert [item.nodeid for item in items] == ["slow", "new", "fast"]
+
+    def test_initial_distribution_is_round_robin(self) -> None:
+        """Slowest tests, first in the collection, go to different workers."""
+        scheduler = DurationScheduling(FakeConfig(2))
+        nodes = [FakeNode("gw0"), FakeNode("gw1")]
+        for node in nodes:
+            scheduler.add_node(node)
+            scheduler.add_node_collection(
+                node, [f"test_{index}" for index in range(16)])
+
+        scheduler.schedule()
+
+        assert nodes[0].sent == [0, 2]
+        assert nodes[1].sent == [1, 3]
+        assert scheduler.pending == list(range(4, 16))
+
+    def test_short_collection_shuts_nodes_down(self) -> None:
+        """Workers are told to stop once everything is handed out."""
+        scheduler = DurationScheduling(FakeConfig(2))
+        nodes = [FakeNode("gw0"), FakeNode("gw1")]
+        for node in nodes:
+            scheduler.add_node(node)
+            scheduler.add_node_collection(node, ["test_a", "test_b"])
+
+        scheduler.schedule()
+
+        assert [node.sent for node in nodes] == [[0], [1]]
+        assert all(node.shutting_down for node in nodes)
@@ -0,0 +1,35 @@
+import pytest
+from utils.screenshots import ScreenshotService
+
+
+@pytest.mark.regression
+class TestScreenshots:
+    """Unit tests for screenshot deduplication."""
+
+    def test_duplicates_detected_within_test(self, fake_driver) -> None:
+        """A repeated screenshot of one test is replaced by a note."""
+        service = ScreenshotService()
+        service.begin_test()
+        try:
+            service.capture(fake_driver(), "before")
+            service.capture(fake_driver(), "after")
+            service.flush()
+        finally:
+            service.close()
+
+        assert service.skipped_duplicates == 1
+
+    def test_next_test_keeps_its_own_copy(self, fake_driver) -> None:
+        """Screenshots of earlier tests do not deduplicate later ones."""
+        service = ScreenshotService()
+        try:
+            service.begin_test()
+            service.capture(fake_driver(), "first_test")
+            service.flush()
+            service.begin_test()
+            service.capture(fake_driver(), "second_test")
+            service.flush()
+        finally:
+            service.close()
+
+        assert service.skipped_duplicates == 0
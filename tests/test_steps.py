@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+import pytest
+from utils import steps
+from utils.config import Config
+
+
+@pytest.fixture
+def titles(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Record titles of opened Allure steps."""
+    opened: List[str] = []
+
+    @contextmanager
+    def fake_step(title: str) -> Iterator[None]:
+        opened.append(title)
+        yield
+
+    monkeypatch.setattr(steps.allure, "step", fake_step)
+    return opened
+
+
+def make_login(mode: str, monkeypatch: pytest.MonkeyPatch):
+    """Build decorated login-like call chain for the given mode."""
+    monkeypatch.setattr(Config, "STEP_MODE", mode)
+
+    @steps.step("Enter {text}", secrets=("text",))
+    def enter_text(text: str, mask: bool = False) -> None:
+        pass
+
+    @steps.step("Login {username}/{password}", secrets=("password",))
+    def login(username: str, password: str) -> None:
+        enter_text(username)
+        enter_text(password, mask=True)
+
+    return login
+
+
+@pytest.mark.regression
+class TestSteps:
+    """Unit tests for step granularity and masking."""
+
+    def test_full_mode_masks_secrets(self, titles: List[str],
+                                     monkeypatch: pytest.MonkeyPatch) -> None:
+        """Every call is reported and passwords never appear."""
+        make_login("full", monkeypatch)("user", "secret")
+
+        assert titles == ["Login 'user'/********", "Enter 'user'",
+                          "Enter ********"]
+
+    def test_top_mode_collapses_nested(
+            self, titles: List[str],
+            monkeypatch: pytest.MonkeyPatch) -> None:
+        """Only the outermost call is reported."""
+        make_login("top", monkeypatch)("user", "secret")
+
+        assert titles == ["Login 'user'/********"]
+
+    def test_off_mode_returns_function(
+            self, titles: List[str],
+            monkeypatch: pytest.MonkeyPatch) -> None:
+        """Decorator leaves the function untouched."""
+        monkeypatch.setattr(Config, "STEP_MODE", "off")
+
+        def action() -> None:
+            pass
+
+        assert steps.step("Action")(action) is action
+        assert titles == []
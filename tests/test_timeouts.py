@@ -0,0 +1,99 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+import pytest
+from selenium.common.exceptions import TimeoutException
+from pages.base_page import BasePage
+from utils.config import Config
+from utils.timeout_store import TimeoutStore
+
+
+@pytest.fixture
+def timeout_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Timeout history in a temporary file, registered in Config.
+
+    The session store and setting are restored afterwards so that waits
+    of later tests are still recorded.
+    """
+    store = TimeoutStore(tmp_path / "history.json")
+    monkeypatch.setattr(Config, "_timeout_store", store)
+    monkeypatch.setattr(Config, "ADAPTIVE_TIMEOUTS", True)
+    return store
+
+
+@pytest.mark.regression
+class TestTimeouts:
+    """Unit tests for adaptive timeouts and their history."""
+
+    def test_timeout_falls_back_without_history(self, timeout_store) -> None:
+        """Fixed timeout is used until enough samples are observed."""
+        timeout_store.observe("Page:id=x:-", 0.5)
+
+        timeout, reason = Config.explain_timeout("element", "Page:id=x:-")
+
+        assert timeout == Config.WAIT_TIMEOUTS["element"]
+        assert "1 samples" in reason
+
+    def test_timeout_learned_and_clamped(self, timeout_store) -> None:
+        """Timeout follows observed percentile within bounds."""
+        for _ in range(Config.TIMEOUT_MIN_SAMPLES):
+            timeout_store.observe("fast", 0.01)
+            timeout_store.observe("medium", 1.0)
+            timeout_store.observe("slow", 60.0)
+
+        assert Config.get_timeout("element", "fast") == Config.TIMEOUT_FLOOR
+        assert Config.get_timeout("element", "medium") == pytest.approx(
+            Config.TIMEOUT_MARGIN)
+        assert Config.get_timeout("element", "slow") == Config.TIMEOUT_CEILING
+
+    def test_history_merged_on_save(self, tmp_path: Path) -> None:
+        """Samples of separate workers end up in one file."""
+        path = tmp_path / "history.json"
+        first, second = TimeoutStore(path), TimeoutStore(path)
+        first.observe("key", 1.0)
+        second.observe("key", 2.0)
+        first.save()
+        second.save()
+
+        assert TimeoutStore(path).samples("key") == [1.0, 2.0]
+
+    def test_timed_out_waits_raise_next_timeout(self, timeout_store) -> None:
+        """Each timeout in a row doubles the last one, a success resets."""
+        for _ in range(Config.TIMEOUT_MIN_SAMPLES):
+            timeout_store.observe("slow", 0.5)
+
+        timeout_store.observe("slow", Config.TIMEOUT_FLOOR, timed_out=True)
+        first, reason = Config.explain_timeout("element", "slow")
+        timeout_store.observe("slow", first, timed_out=True)
+        second = Config.get_timeout("element", "slow")
+        timeout_store.observe("slow", 6.0)
+
+        assert first == Config.TIMEOUT_FLOOR * Config.TIMEOUT_BACKOFF
+        assert "raised after 1 timeouts" in reason
+        assert second == min(first * Config.TIMEOUT_BACKOFF ** 2,
+                             Config.TIMEOUT_CEILING)
+        assert timeout_store.recent_timeouts("slow") == []
+
+    def test_timed_out_page_wait_recorded(self, timeout_store,
+                                          fake_driver) -> None:
+        """A wait that times out is stored as a censored sample."""
+        page = BasePage(fake_driver())
+
+        def wait(timeout: float, message: str) -> None:
+            raise TimeoutException(message)
+
+        with pytest.raises(TimeoutException, match="never in"):
+            page._adaptive_wait("element", "id=x", None, wait, "never")
+
+        key = page._wait_key("id=x")
+        assert timeout_store.recent_timeouts(key) == [
+            Config.WAIT_TIMEOUTS["element"]]
+
+    def test_history_without_timeout_flags_loaded(
+            self, tmp_path: Path) -> None:
+        """Files written before timed-out waits were kept still load."""
+        path = tmp_path / "history.json"
+        path.write_text(json.dumps({"key": [1.0, 2.0]}))
+
+        assert TimeoutStore(path).samples("key") == [1.0, 2.0]
+
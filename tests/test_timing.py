@@ -0,0 +1,87 @@
+import pytest
+from utils.timing import PageTiming, TimingRecorder
+
+
+RAW = {
+    "url": "http://local/inventory.html",
+    "navigation": {"requestStart": 10.0, "responseStart": 35.0,
+                   "domContentLoadedEventEnd": 120.0, "loadEventEnd": 0},
+    "paint": {"first-paint": 80.0},
+    "resourceCount": 4,
+    "transferSize": 2048,
+    "actionMs": None,
+}
+
+
+def make_timing(label: str, user_type: str, action_ms: float,
+                test: str = "test_a") -> PageTiming:
+    """Timing built from RAW with a given action time."""
+    return PageTiming.from_script(dict(RAW, actionMs=action_ms), label,
+                                  user_type, test)
+
+
+@pytest.mark.regression
+class TestTiming:
+    """Unit tests for page timing parsing and queries."""
+
+    def test_from_script_derives_metrics(self) -> None:
+        """TTFB is computed, unfinished events and lost marks are None."""
+        timing = PageTiming.from_script(RAW, "login", "standard", "test_a")
+
+        assert timing.ttfb_ms == 25.0
+        assert timing.dom_content_loaded_ms == 120.0
+        assert timing.load_ms is None
+        assert timing.first_contentful_paint_ms is None
+        assert timing.action_ms is None
+
+    def test_fallback_action_time(self) -> None:
+        """Wall-clock time replaces a mark lost to navigation."""
+        timing = PageTiming.from_script(RAW, "login", "standard", "test_a",
+                                        fallback_action_ms=300.0)
+
+        assert timing.action_ms == 300.0
+
+    def test_assert_under_checks_current_test(self) -> None:
+        """Only timings of the current test are compared with the limit."""
+        recorder = TimingRecorder()
+        recorder.add(make_timing("login", "problem", 900.0, test="test_b"))
+        recorder.add(make_timing("login", "standard", 200.0))
+        recorder.test = "test_a"
+
+        recorder.assert_under("login", 500.0)
+        with pytest.raises(AssertionError, match="No action_ms captured"):
+            recorder.assert_under("inventory", 500.0)
+        with pytest.raises(ValueError, match="Unknown metric"):
+            recorder.assert_under("login", 500.0, metric="paint")
+
+    def test_assert_under_reports_slowest(self) -> None:
+        """The failure names the slowest matching value."""
+        recorder = TimingRecorder()
+        recorder.add(make_timing("login", "standard", 200.0))
+        recorder.add(make_timing("login", "standard", 700.0))
+        recorder.test = "test_a"
+
+        with pytest.raises(AssertionError, match="was 700ms, limit 500ms"):
+            recorder.assert_under("login", 500.0, user_type="standard")
+
+    def test_summary_groups_by_user_and_label(self) -> None:
+        """Metrics are aggregated per user type and action."""
+        recorder = TimingRecorder()
+        recorder.add(make_timing("login", "standard", 100.0))
+        recorder.add(make_timing("login", "standard", 300.0))
+        recorder.add(make_timing("login", "problem", 900.0))
+
+        summary = recorder.summary()
+
+        assert sorted(summary) == ["problem/login", "standard/login"]
+        assert summary["standard/login"]["action_ms"]["p50"] == 200.0
+        assert "load_ms" not in summary["standard/login"]
+
+    def test_recorder_keeps_newest_timings(self) -> None:
+        """A long run such as a load test keeps a bounded history."""
+        recorder = TimingRecorder(max_records=3)
+        for index in range(5):
+            recorder.add(make_timing(f"login{index}", "standard", 100.0))
+
+        assert [t.label for t in recorder.query()] == [
+            "login2", "login3", "login4"]
@@ -0,0 +1,92 @@
+import io
+from pathlib import Path
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from utils.visual import BaselineIndex, VisualChecker  # noqa: E402
+
+
+def make_png(color: tuple, box: tuple = None,
+             size: tuple = (64, 48)) -> bytes:
+    """Render image, 64x48 by default, optionally with a black box."""
+    image = Image.new("RGB", size, color)
+    if box is not None:
+        image.paste((0, 0, 0), box)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_checker(index: BaselineIndex, update: bool = False,
+                 hash_distance: int = 0) -> VisualChecker:
+    """Checker with tight tolerances."""
+    return VisualChecker(index, pixel_tolerance=8, mismatch_tolerance=0.001,
+                         hash_distance=hash_distance, update=update)
+
+
+@pytest.fixture
+def checker(tmp_path: Path) -> VisualChecker:
+    """Checker with a white baseline saved in update mode."""
+    index = BaselineIndex(tmp_path)
+    make_checker(index, update=True).check("page", make_png((255, 255, 255)))
+    return make_checker(index)
+
+
+@pytest.mark.regression
+class TestVisual:
+    """Unit tests for visual baseline comparison."""
+
+    def test_identical_frame_short_circuits(
+            self, checker: VisualChecker) -> None:
+        """Identical screenshot passes on its digest."""
+        result = checker.check("page", make_png((255, 255, 255)))
+
+        assert result.passed
+        assert result.reason == "identical to baseline"
+
+    def test_changed_region_reported_and_maskable(
+            self, checker: VisualChecker) -> None:
+        """Diff mask and bbox of a change, and masking it."""
+        changed = make_png((255, 255, 255), (10, 5, 20, 15))
+
+        result = checker.check("page", changed)
+        masked = checker.check("page", changed, masks=[(10, 5, 10, 10)])
+
+        assert not result.passed
+        assert result.bbox == (10, 5, 10, 10)
+        assert int(result.diff_mask.sum()) == 100
+        assert masked.passed
+
+    def test_missing_baseline_not_saved(self, checker: VisualChecker,
+                                        tmp_path: Path) -> None:
+        """Without update mode a new key is reported, not accepted."""
+        result = checker.check("renamed_page", make_png((255, 255, 255)))
+
+        assert result.missing and not result.passed
+        assert "closest: page (distance 0)" in result.reason
+        assert checker.index.get("renamed_page") is None
+        assert not (tmp_path / "renamed_page.png").exists()
+
+    def test_distant_hash_fails_without_pixel_diff(
+            self, checker: VisualChecker) -> None:
+        """Far perceptual hash fails fast unless regions are masked."""
+        checker = make_checker(checker.index, hash_distance=1)
+        changed = make_png((255, 255, 255), (0, 0, 32, 48))
+
+        result = checker.check("page", changed)
+        masked = checker.check("page", changed, masks=[(0, 0, 32, 48)])
+
+        assert not result.passed
+        assert result.reason.startswith("perceptual hash distance")
+        assert result.diff_mask is None
+        assert masked.passed
+
+    def test_size_mismatch_reported(self, checker: VisualChecker) -> None:
+        """Screenshot of another size fails before any comparison."""
+        result = checker.check("page", make_png((255, 255, 255),
+                                                size=(32, 48)))
+
+        assert not result.passed
+        assert result.reason == "size 32x48 differs from baseline 64x48"
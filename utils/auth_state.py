@@ -0,0 +1,140 @@
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Final, List, Optional, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+READ_STORAGE_SCRIPT = """
+var state = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    state[key] = window.localStorage.getItem(key);
+}
+return state;
+"""
+
+WRITE_STORAGE_SCRIPT = """
+var state = arguments[0];
+for (var key in state) {
+    window.localStorage.setItem(key, state[key]);
+}
+"""
+
+COOKIE_FIELDS: Tuple[str, ...] = ("name", "value", "path", "domain",
+                                  "secure", "httpOnly", "expiry", "sameSite")
+
+
+# States expiring sooner are not worth restoring for a test
+EXPIRY_MARGIN: Final[float] = 30.0
+
+
+@dataclass(frozen=True)
+class AuthState:
+    """Cookies and local storage of a logged-in session."""
+    cookies: Tuple[Dict[str, Any], ...]
+    local_storage: Dict[str, str]
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Earliest cookie expiry in epoch seconds, None without one."""
+        expiries = [cookie["expiry"] for cookie in self.cookies
+                    if "expiry" in cookie]
+        return min(expiries) if expiries else None
+
+    def is_expired(self, margin: float = EXPIRY_MARGIN) -> bool:
+        """Check whether a cookie of the state has expired.
+
+        Args:
+            margin: Seconds before the expiry the state counts as expired
+
+        Returns:
+            True if the state can no longer authenticate
+        """
+        expires_at = self.expires_at
+        return expires_at is not None and expires_at - margin <= time.time()
+
+    @classmethod
+    def capture(cls, driver: WebDriver) -> AuthState:
+        """Read authentication state from the current page.
+
+        Args:
+            driver: WebDriver on a logged-in page
+
+        Returns:
+            Captured state
+        """
+        cookies = tuple(
+            {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+            for cookie in driver.get_cookies()
+        )
+        return cls(cookies, driver.execute_script(READ_STORAGE_SCRIPT) or {})
+
+    def apply(self, driver: WebDriver) -> None:
+        """Inject state into the browser.
+
+        The driver must already be on a page of the application origin.
+
+        Args:
+            driver: WebDriver to authenticate
+        """
+        for cookie in self.cookies:
+            driver.add_cookie(dict(cookie))
+        if self.local_storage:
+            driver.execute_script(WRITE_STORAGE_SCRIPT, self.local_storage)
+
+
+class AuthStateCache:
+    """Session-wide cache of captured states keyed by target and user."""
+
+    def __init__(self) -> None:
+        """Initialize empty cache."""
+        self._states: Dict[Tuple[str, str], AuthState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str, user_type: str) -> Optional[AuthState]:
+        """Get cached state, dropping it once its cookies have expired.
+
+        Args:
+            base_url: Application base URL
+            user_type: User type key from Config.USERS
+
+        Returns:
+            Cached state or None
+        """
+        with self._lock:
+            state = self._states.get((base_url, user_type))
+            if state is not None and state.is_expired():
+                del self._states[(base_url, user_type)]
+                return None
+            return state
+
+    def put(self, base_url: str, user_type: str, state: AuthState) -> None:
+        """Store captured state.
+
+        Args:
+            base_url: Application base URL
+            user_type: User type key from Config.USERS
+            state: Captured state
+        """
+        with self._lock:
+            self._states[(base_url, user_type)] = state
+
+    def discard(self, base_url: str, user_type: str) -> None:
+        """Drop a state the application no longer accepts.
+
+        Args:
+            base_url: Application base URL
+            user_type: User type key from Config.USERS
+        """
+        with self._lock:
+            self._states.pop((base_url, user_type), None)
+
+    def clear(self) -> None:
+        """Drop every cached state."""
+        with self._lock:
+            self._states.clear()
+
+
+AUTH_STATES: AuthStateCache = AuthStateCache()
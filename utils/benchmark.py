@@ -0,0 +1,151 @@
+from __future__ import annotations
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+from pages.login_page import LoginPage
+from utils.config import Config
+from utils.credentials import CREDENTIALS
+from utils.stats import summarize
+
+
+PHASES: tuple[str, ...] = ("navigation", "field_entry", "submit")
+
+
+@dataclass
+class UserBenchmark:
+    """Phase timings of repeated logins of one user type."""
+    user_type: str
+    phases: Dict[str, List[float]] = field(
+        default_factory=lambda: {phase: [] for phase in PHASES})
+
+    @property
+    def throughput(self) -> float:
+        """Completed logins per second of measured time."""
+        total = sum(sum(values) for values in self.phases.values())
+        rounds = len(self.phases[PHASES[0]])
+        return rounds / total if total else 0.0
+
+    def report(self) -> Dict[str, object]:
+        """Statistics per phase and throughput.
+
+        Returns:
+            JSON-serializable report
+        """
+        return {
+            "user_type": self.user_type,
+            "throughput": self.throughput,
+            "phases": {phase: summarize(values)
+                       for phase, values in self.phases.items()},
+        }
+
+
+class LoginBenchmark:
+    """Times LoginPage.login phases for one user type."""
+
+    def __init__(self, login_page: LoginPage, rounds: int,
+                 warmup: int) -> None:
+        """Initialize benchmark.
+
+        Args:
+            login_page: Page object driving the browser
+            rounds: Measured iterations
+            warmup: Discarded iterations run first
+        """
+        self.page = login_page
+        self.rounds = rounds
+        self.warmup = warmup
+
+    def run(self, user_type: str) -> UserBenchmark:
+        """Log in repeatedly and time every phase.
+
+        Navigation is the login page load, field entry fills both inputs
+        and submit lasts from the click until the inventory page (or the
+        error message for users that cannot log in) is shown.
+
+        Args:
+            user_type: Key of Config.USERS
+
+        Returns:
+            Collected timings
+        """
+        creds = Config.get_user_credentials(user_type)
+        succeeds = CREDENTIALS.get(user_type).outcome == "success"
+        page = self.page
+        result = UserBenchmark(user_type)
+        for iteration in range(self.warmup + self.rounds):
+            page.driver.delete_all_cookies()
+
+            start = time.perf_counter()
+            page.open(force=True)
+            page.find_element(page.LOGIN_BUTTON)
+            navigated = time.perf_counter()
+            page.enter_text(page.USERNAME_INPUT, creds["username"])
+            page.enter_text(page.PASSWORD_INPUT, creds["password"], mask=True)
+            entered = time.perf_counter()
+            page.click_element(page.LOGIN_BUTTON)
+            if succeeds:
+                page.waits.until_url_is(page.inventory_url, page.timeout)
+            else:
+                page.find_element(page.ERROR_MESSAGE)
+            submitted = time.perf_counter()
+
+            if iteration >= self.warmup:
+                result.phases["navigation"].append(navigated - start)
+                result.phases["field_entry"].append(entered - navigated)
+                result.phases["submit"].append(submitted - entered)
+        return result
+
+
+class BaselineStore:
+    """Benchmark medians persisted on disk."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize store.
+
+        Args:
+            path: JSON file with baselines
+        """
+        self.path = path
+        self.baselines: Dict[str, Dict[str, float]] = {}
+        if path.is_file():
+            self.baselines = json.loads(path.read_text())
+
+    def regressions(self, result: UserBenchmark,
+                    threshold: float) -> List[str]:
+        """Compare phase medians with the baseline.
+
+        Args:
+            result: Fresh benchmark result
+            threshold: Allowed relative slowdown, e.g. 0.2 for 20%
+
+        Returns:
+            Descriptions of regressed phases
+        """
+        baseline = self.baselines.get(result.user_type, {})
+        failures = []
+        for phase, stats in result.report()["phases"].items():
+            reference = baseline.get(phase)
+            if reference and stats["p50"] > reference * (1 + threshold):
+                failures.append(
+                    f"{result.user_type}.{phase}: median "
+                    f"{stats['p50'] * 1000:.1f}ms > baseline "
+                    f"{reference * 1000:.1f}ms +{threshold:.0%}")
+        return failures
+
+    def update(self, result: UserBenchmark) -> None:
+        """Replace baseline of a user type with fresh medians.
+
+        Args:
+            result: Fresh benchmark result
+        """
+        self.baselines[result.user_type] = {
+            phase: stats["p50"]
+            for phase, stats in result.report()["phases"].items()
+        }
+
+    def save(self) -> None:
+        """Write baselines to disk."""
+        self.path.write_text(json.dumps(self.baselines, indent=2,
+                                        sort_keys=True))
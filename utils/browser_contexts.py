@@ -0,0 +1,167 @@
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.resources import driver_rss
+
+
+@dataclass
+class ContextMetrics:
+    """Counters collected by the browser context pool."""
+    browsers_started: int = 0
+    contexts_created: int = 0
+    creation_times: List[float] = field(default_factory=list)
+    peak_rss: int = 0
+
+    @property
+    def average_creation_time(self) -> float:
+        """Average context creation time in seconds."""
+        if not self.creation_times:
+            return 0.0
+        return sum(self.creation_times) / len(self.creation_times)
+
+    def summary(self) -> str:
+        """Human readable one-line summary."""
+        return (f"browsers={self.browsers_started} "
+                f"contexts={self.contexts_created} "
+                f"avg_create={self.average_creation_time * 1000:.1f}ms "
+                f"peak_rss={self.peak_rss / 2 ** 20:.0f}MB")
+
+
+class BrowserContextPool:
+    """One Chrome per worker, one incognito browser context per lease.
+
+    Every lease creates a context with Target.createBrowserContext, opens
+    a tab in it and switches the driver to that tab, so cookies and
+    storage are isolated without starting a new browser. The API matches
+    DriverPool so fixtures can use either.
+
+    Leases may overlap; the lock only guards creating and disposing
+    contexts. All leases share one WebDriver session, so a caller
+    holding several switches to the tab of the lease it works with.
+    """
+
+    def __init__(self, factory: Callable[[], WebDriver],
+                 reset_url: str, rss_interval: int = 10,
+                 setup_target: Optional[Callable[[WebDriver], None]] = None
+                 ) -> None:
+        """Initialize context pool.
+
+        Args:
+            factory: Callable starting the shared WebDriver session
+            reset_url: URL opened in every new context
+            rss_interval: Releases between memory samples; the browser
+                is also sampled right before it is dropped
+            setup_target: Called with the driver switched to every new
+                tab before it loads reset_url, e.g. to apply DevTools
+                network settings, which are per target
+        """
+        self.factory = factory
+        self.reset_url = reset_url
+        self.rss_interval = max(1, rss_interval)
+        self.setup_target = setup_target
+        self.metrics = ContextMetrics()
+        self._driver: Optional[WebDriver] = None
+        self._home: Optional[str] = None
+        # Browser context of every open lease, by window handle
+        self._leases: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self) -> WebDriver:
+        """Open a fresh browser context in the shared browser.
+
+        Returns:
+            Driver switched to the new context's tab
+        """
+        with self._lock:
+            try:
+                if self._driver is None:
+                    self._driver = self.factory()
+                    self._home = self._driver.current_window_handle
+                    self.metrics.browsers_started += 1
+
+                driver = self._driver
+                start = time.perf_counter()
+                context = driver.execute_cdp_cmd(
+                    "Target.createBrowserContext",
+                    {"disposeOnDetach": True})["browserContextId"]
+                target = driver.execute_cdp_cmd("Target.createTarget", {
+                    "url": ("about:blank" if self.setup_target
+                            else self.reset_url),
+                    "browserContextId": context,
+                })["targetId"]
+                handle = self._handle_for(driver, target)
+                self._leases[handle] = context
+                driver.switch_to.window(handle)
+                if self.setup_target is not None:
+                    self.setup_target(driver)
+                    driver.get(self.reset_url)
+                self.metrics.creation_times.append(
+                    time.perf_counter() - start)
+                self.metrics.contexts_created += 1
+                return driver
+            except Exception:
+                self._drop_browser()
+                raise
+
+    def release(self, driver: WebDriver, broken: bool = False) -> None:
+        """Dispose the lease's context and return to the home tab.
+
+        Args:
+            driver: Driver obtained from acquire(), switched to the
+                lease's tab
+            broken: Restart the shared browser
+        """
+        if broken or self.metrics.contexts_created % self.rss_interval == 0:
+            self.metrics.peak_rss = max(self.metrics.peak_rss,
+                                        driver_rss(driver))
+        with self._lock:
+            if driver is not self._driver:
+                return  # browser already restarted by another lease
+            if broken:
+                self._drop_browser()
+                return
+            try:
+                handle = driver.current_window_handle
+                context = self._leases.pop(handle)
+                driver.close()
+                driver.switch_to.window(self._home)
+                driver.execute_cdp_cmd("Target.disposeBrowserContext",
+                                       {"browserContextId": context})
+            except (KeyError, WebDriverException):
+                self._drop_browser()
+
+    def close(self) -> None:
+        """Quit the shared browser."""
+        with self._lock:
+            self._drop_browser()
+
+    def _drop_browser(self) -> None:
+        """Quit shared browser so the next lease starts a new one."""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except WebDriverException:
+                pass
+        self._driver = None
+        self._home = None
+        self._leases.clear()
+
+    @staticmethod
+    def _handle_for(driver: WebDriver, target: str) -> str:
+        """Find window handle of a DevTools target.
+
+        Args:
+            driver: WebDriver instance
+            target: DevTools target ID
+
+        Returns:
+            Matching window handle
+        """
+        for handle in driver.window_handles:
+            if handle == target or handle.endswith(target):
+                return handle
+        raise WebDriverException(f"No window for target {target}")
@@ -0,0 +1,222 @@
+from __future__ import annotations
+import atexit
+import glob
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+from selenium.webdriver.chrome.service import Service
+from utils.config import Config
+from utils.stats import summarize
+
+
+# Flags skipping work a fresh profile repeats on every start
+FAST_START_ARGUMENTS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--metrics-recording-only",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+)
+
+_READY_MARKER = ".template-ready"
+
+
+class SharedService(Service):
+    """Chromedriver process shared by all sessions of a worker.
+
+    webdriver.Chrome starts its service on creation and stops it on
+    quit; here start() reuses the running process and stop() leaves it
+    alive until shutdown().
+    """
+
+    def __init__(self) -> None:
+        """Initialize service, the process starts with the first session."""
+        super().__init__()
+        self.arguments = ["--silent"]
+        self.launches = 0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """True if the chromedriver process is alive."""
+        process = getattr(self, "process", None)
+        return process is not None and process.poll() is None
+
+    def start(self) -> None:
+        """Start chromedriver unless it already runs."""
+        with self._lock:
+            if self.running:
+                return
+            super().start()
+            self.launches += 1
+
+    def stop(self) -> None:
+        """Keep chromedriver running after a session quits."""
+
+    def shutdown(self) -> None:
+        """Stop the chromedriver process."""
+        with self._lock:
+            if self.running:
+                super().stop()
+
+
+class ProfileTemplate:
+    """Pre-warmed Chrome user data directory cloned per session."""
+
+    def __init__(self, root: Path) -> None:
+        """Initialize template.
+
+        Args:
+            root: Template directory, built on first use
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """True if the template has been built."""
+        return (self.root / _READY_MARKER).is_file()
+
+    def ensure(self, build: Callable[[Path], None]) -> None:
+        """Build template once; concurrent workers keep the first one.
+
+        Args:
+            build: Callable running Chrome with the given user data
+                directory and priming its cache
+        """
+        with self._lock:
+            if self.ready:
+                return
+            self.root.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f"{self.root.name}-",
+                                            dir=self.root.parent))
+            try:
+                build(staging)
+                (staging / _READY_MARKER).touch()
+                try:
+                    os.replace(staging, self.root)
+                except OSError:
+                    # Another worker published its template first
+                    if self.ready:
+                        return
+                    shutil.rmtree(self.root, ignore_errors=True)
+                    os.replace(staging, self.root)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def clone(self) -> Path:
+        """Copy template into a new user data directory.
+
+        Files are reflinked (copy-on-write) where the file system
+        supports it and copied otherwise. Hardlinks are not used since
+        Chrome rewrites its databases in place. Clones live next to the
+        template so that reflinks stay on one file system.
+
+        Returns:
+            Path of the clone
+        """
+        target = Path(tempfile.mkdtemp(prefix=f"{self.root.name}-clone-",
+                                       dir=self.root.parent))
+        try:
+            subprocess.run(
+                ["cp", "-a", "--reflink=auto", f"{self.root}/.",
+                 str(target)],
+                check=True, capture_output=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            shutil.rmtree(target, ignore_errors=True)
+            shutil.copytree(self.root, target, symlinks=True)
+        for lock in glob.glob(str(target / "Singleton*")):
+            os.remove(lock)
+        return target
+
+
+@dataclass
+class StartupMetrics:
+    """Durations of browser session startup."""
+    sessions: List[float] = field(default_factory=list)
+    clones: List[float] = field(default_factory=list)
+    template_build: Optional[float] = None
+
+    def summary(self, service_launches: int) -> str:
+        """Human readable one-line summary.
+
+        Args:
+            service_launches: Number of chromedriver processes started
+        """
+        stats = summarize(self.sessions)
+        line = (f"sessions={stats['count']} "
+                f"p50={stats['p50'] * 1000:.0f}ms "
+                f"p95={stats['p95'] * 1000:.0f}ms "
+                f"chromedriver_launches={service_launches}")
+        if self.clones:
+            line += (f" profile_clone_p50="
+                     f"{summarize(self.clones)['p50'] * 1000:.0f}ms")
+        if self.template_build is not None:
+            line += f" template_build={self.template_build * 1000:.0f}ms"
+        return line
+
+
+class ChromeStartup:
+    """Shared chromedriver service and profile template of a process."""
+
+    def __init__(self, share_service: bool,
+                 template_dir: Optional[str]) -> None:
+        """Initialize startup helpers.
+
+        Args:
+            share_service: Reuse one chromedriver for all sessions
+            template_dir: Profile template directory, None disables it
+        """
+        self.share_service = share_service
+        self.template = (ProfileTemplate(Path(template_dir).resolve())
+                         if template_dir else None)
+        self.metrics = StartupMetrics()
+        self._service: Optional[SharedService] = None
+        self._launches = 0
+        self._lock = threading.Lock()
+
+    @property
+    def service_launches(self) -> int:
+        """Number of chromedriver processes started."""
+        shared = self._service.launches if self._service else 0
+        return shared + self._launches
+
+    def service(self) -> Service:
+        """Chromedriver service for a new session.
+
+        Returns:
+            Shared service, or a new one when sharing is disabled
+        """
+        if not self.share_service:
+            self._launches += 1
+            service = Service()
+            service.arguments = ["--silent"]
+            return service
+        with self._lock:
+            if self._service is None:
+                self._service = SharedService()
+                atexit.register(self._service.shutdown)
+            return self._service
+
+    def shutdown(self) -> None:
+        """Stop the shared chromedriver."""
+        if self._service is not None:
+            self._service.shutdown()
+
+    def summary(self) -> str:
+        """Human readable one-line summary of startup latency."""
+        return self.metrics.summary(self.service_launches)
+
+
+STARTUP = ChromeStartup(Config.SHARE_CHROMEDRIVER,
+                        Config.PROFILE_TEMPLATE_DIR or None)
@@ -1,4 +1,12 @@
-from typing import TypedDict, Final, Dict
+import logging
+import os
+from typing import ClassVar, TypedDict, Final, Dict, Optional, Tuple
+from utils.credentials import CREDENTIALS
+from utils.stats import percentile
+from utils.timeout_store import TimeoutStore
+
+
+logger = logging.getLogger("saucedemo.timeouts")
 
 
 class UserCredentials(TypedDict):
@@ -7,31 +15,23 @@ class UserCredentials(TypedDict):
     password: str
 
 
-class TestUsers(TypedDict):
-    """Test users mapping."""
-    standard: UserCredentials
-    locked: UserCredentials
-    performance: UserCredentials
-    problem: UserCredentials
-
-
 class Config:
     """Project configuration."""
 
     BASE_URL: Final[str] = "https://www.saucedemo.com"
+    TARGET: Final[str] = os.getenv("SAUCEDEMO_TARGET", "remote")
+    LOCAL_GLITCH_DELAY: Final[float] = float(
+        os.getenv("LOCAL_GLITCH_DELAY", "2.5"))
+    # Local stand-in binds loopback; remote grid nodes need e.g.
+    # LOCAL_BIND_HOST=0.0.0.0 and LOCAL_PUBLIC_HOST=<this host's name>
+    LOCAL_BIND_HOST: Final[str] = os.getenv("LOCAL_BIND_HOST", "127.0.0.1")
+    LOCAL_PUBLIC_HOST: Final[str] = os.getenv("LOCAL_PUBLIC_HOST", "")
     TIMEOUT: Final[int] = 10
     BROWSER: Final[str] = "chrome"
     HEADLESS: Final[bool] = True
 
-    USERS: Final[TestUsers] = {
-        "standard": {"username": "standard_user", "password": "secret_sauce"},
-        "locked": {"username": "locked_out_user", "password": "secret_sauce"},
-        "performance": {
-            "username": "performance_glitch_user",
-            "password": "secret_sauce",
-        },
-        "problem": {"username": "problem_user", "password": "secret_sauce"}
-    }
+    # Built from utils.credentials.CREDENTIALS, the single user registry
+    USERS: Final[Dict[str, UserCredentials]] = CREDENTIALS.as_users()
 
     LOGIN_PAGE_LOCATORS: Final[Dict[str, str]] = {
         "username": "user-name",
@@ -45,10 +45,136 @@ class Config:
         "ajax": 15
     }
 
+    # Explicit waits only: a non-zero implicit wait stacks on top of
+    # every WebDriverWait poll and on every negative find_elements call.
+    IMPLICIT_WAIT: Final[float] = float(os.getenv("IMPLICIT_WAIT", "0"))
+    PROBE_TIMEOUT: Final[float] = float(os.getenv("PROBE_TIMEOUT", "1.0"))
+    PROBE_POLL: Final[float] = float(os.getenv("PROBE_POLL", "0.1"))
+    # 'normal', 'eager' or 'none'; pages wait for READY_LOCATOR otherwise
+    PAGE_LOAD_STRATEGY: Final[str] = os.getenv("PAGE_LOAD_STRATEGY", "normal")
+    WAIT_ENGINE: Final[str] = os.getenv("WAIT_ENGINE", "observer")
+    # Allure step granularity of page objects: 'off', 'top' or 'full'
+    STEP_MODE: Final[str] = os.getenv("STEP_MODE", "full")
+
+    PROFILE_OUTPUT: Final[str] = os.getenv("PROFILE_OUTPUT",
+                                           "command-profile.json")
+
+    CAPTURE_TIMING: Final[bool] = os.getenv("CAPTURE_TIMING", "1") == "1"
+    # Upper bound of submit-to-inventory time per user type
+    INVENTORY_LOAD_BUDGET_MS: Final[Dict[str, float]] = {
+        "standard": 3000,
+        "problem": 3000,
+        "performance": 10000,
+    }
+
+    BENCHMARK_ROUNDS: Final[int] = int(os.getenv("BENCHMARK_ROUNDS", "20"))
+    BENCHMARK_WARMUP: Final[int] = int(os.getenv("BENCHMARK_WARMUP", "3"))
+    BENCHMARK_THRESHOLD: Final[float] = float(
+        os.getenv("BENCHMARK_THRESHOLD", "0.2"))
+    BENCHMARK_BASELINE: Final[str] = os.getenv("BENCHMARK_BASELINE",
+                                               "benchmark-baseline.json")
+
+    # DevTools request interception, off unless one of these is set
+    BLOCKED_URL_PATTERNS: Final[Tuple[str, ...]] = tuple(
+        filter(None, os.getenv("BLOCKED_URL_PATTERNS", "").split(",")))
+    BLOCKED_RESOURCE_TYPES: Final[Tuple[str, ...]] = tuple(
+        filter(None, os.getenv("BLOCKED_RESOURCE_TYPES", "").split(",")))
+    NETWORK_CACHE_DIR: Final[str] = os.getenv("NETWORK_CACHE_DIR", "")
+    NETWORK_LATENCY_MS: Final[float] = float(
+        os.getenv("NETWORK_LATENCY_MS", "0"))
+    NETWORK_THROUGHPUT_KBPS: Final[float] = float(
+        os.getenv("NETWORK_THROUGHPUT_KBPS", "0"))
+
+    # Browser startup: one chromedriver per worker, cloned warm profile
+    SHARE_CHROMEDRIVER: Final[bool] = os.getenv("SHARE_CHROMEDRIVER",
+                                                "1") == "1"
+    PROFILE_TEMPLATE_DIR: Final[str] = os.getenv(
+        "PROFILE_TEMPLATE_DIR", ".chrome-profile-template")
+
+    # Failure-only flight recorder: ring buffers per channel
+    FLIGHT_RECORDER: Final[bool] = os.getenv("FLIGHT_RECORDER", "0") == "1"
+    FLIGHT_MAX_EVENTS: Final[int] = int(os.getenv("FLIGHT_MAX_EVENTS",
+                                                  "200"))
+    FLIGHT_MAX_AGE: Final[float] = float(os.getenv("FLIGHT_MAX_AGE", "60"))
+    FLIGHT_DOM_SNAPSHOTS: Final[int] = int(os.getenv("FLIGHT_DOM_SNAPSHOTS",
+                                                     "5"))
+    FLIGHT_DOM_CHARS: Final[int] = 20000
+
+    # Remote Selenium nodes, comma separated URLs (empty = local Chrome)
+    GRID_NODES: Final[Tuple[str, ...]] = tuple(
+        url.strip() for url in os.getenv("GRID_NODES", "").split(",")
+        if url.strip())
+    GRID_NODE_CAPACITY: Final[int] = int(os.getenv("GRID_NODE_CAPACITY",
+                                                   "2"))
+    GRID_HEALTH_INTERVAL: Final[float] = 5.0
+    GRID_QUEUE_TIMEOUT: Final[float] = float(os.getenv("GRID_QUEUE_TIMEOUT",
+                                                       "300"))
+    # Reruns of a test whose node died
+    GRID_REQUEUE_LIMIT: Final[int] = 2
+
+    # Visual regression baselines
+    VISUAL_BASELINE_DIR: Final[str] = os.getenv("VISUAL_BASELINE_DIR",
+                                                "visual-baselines")
+    VISUAL_UPDATE: Final[bool] = os.getenv("VISUAL_UPDATE", "0") == "1"
+    VISUAL_PIXEL_TOLERANCE: Final[int] = int(os.getenv(
+        "VISUAL_PIXEL_TOLERANCE", "16"))
+    VISUAL_MISMATCH_TOLERANCE: Final[float] = float(os.getenv(
+        "VISUAL_MISMATCH_TOLERANCE", "0.001"))
+    # Hash distance failing a frame without a pixel diff (0 = off)
+    VISUAL_HASH_DISTANCE: Final[int] = int(os.getenv(
+        "VISUAL_HASH_DISTANCE", "12"))
+
+    # Immediate rerun of tests failing on a timing error (0 = off)
+    RERUN_LIMIT: Final[int] = int(os.getenv("RERUN_LIMIT", "0"))
+    FLAKINESS_FILE: Final[str] = os.getenv("FLAKINESS_FILE",
+                                           ".flakiness.json")
+    FLAKINESS_WINDOW: Final[int] = 20
+    # Share of recent runs needing a rerun or failing that quarantines
+    QUARANTINE_THRESHOLD: Final[float] = float(os.getenv(
+        "QUARANTINE_THRESHOLD", "0.3"))
+    QUARANTINE_MIN_RUNS: Final[int] = 5
+
+    # Generated login matrix: same seed, same cases on every worker
+    MATRIX_SEED: Final[str] = os.getenv("MATRIX_SEED", "saucedemo")
+    MATRIX_CASES: Final[int] = int(os.getenv("MATRIX_CASES", "70"))
+    MATRIX_SHARDS: Final[int] = int(os.getenv("MATRIX_SHARDS", "4"))
+
+    # Timeouts derived from observed wait durations, opt-in because the
+    # history is written to the project directory
+    ADAPTIVE_TIMEOUTS: Final[bool] = os.getenv("ADAPTIVE_TIMEOUTS",
+                                               "0") == "1"
+    TIMEOUT_HISTORY_FILE: Final[str] = os.getenv("TIMEOUT_HISTORY_FILE",
+                                                 ".timeout_history.json")
+    TIMEOUT_MIN_SAMPLES: Final[int] = 10
+    TIMEOUT_PERCENTILE: Final[float] = 95
+    TIMEOUT_MARGIN: Final[float] = 3.0
+    TIMEOUT_FLOOR: Final[float] = 2.0
+    TIMEOUT_CEILING: Final[float] = 30.0
+    # Factor applied to the last timeout per wait timed out in a row
+    TIMEOUT_BACKOFF: Final[float] = 2.0
+
     ENVIRONMENT: Final[str] = "test"
     SCREENSHOT_ON_FAILURE: Final[bool] = True
+    SCREENSHOT_FORMAT: Final[str] = os.getenv("SCREENSHOT_FORMAT", "jpeg")
+    SCREENSHOT_QUALITY: Final[int] = int(os.getenv("SCREENSHOT_QUALITY", "70"))
+    SCREENSHOT_SCALE: Final[float] = float(
+        os.getenv("SCREENSHOT_SCALE", "1.0"))
+    SCREENSHOT_BUDGET_BYTES: Final[int] = int(
+        os.getenv("SCREENSHOT_BUDGET_BYTES", str(2 * 1024 * 1024)))
     LOG_LEVEL: Final[str] = "INFO"
 
+    # 'pool': warm browser per session, 'contexts': one browser per worker
+    # with an incognito browser context per test
+    DRIVER_MODE: Final[str] = os.getenv("DRIVER_MODE", "pool")
+    POOL_SIZE: Final[int] = int(os.getenv("POOL_SIZE", "1"))
+    POOL_MAX_LEASES: Final[int] = int(os.getenv("POOL_MAX_LEASES", "50"))
+    # Releases between browser memory samples of the pool
+    POOL_RSS_INTERVAL: Final[int] = int(os.getenv("POOL_RSS_INTERVAL",
+                                                  "10"))
+
+    DURATIONS_FILE: Final[str] = os.getenv("DURATIONS_FILE",
+                                           ".test_durations.json")
+
     @classmethod
     def get_user_credentials(cls, user_type: str) -> UserCredentials:
         """Get credentials for specified user type.
@@ -62,24 +188,113 @@ class Config:
         Raises:
             KeyError: If user type not found
         """
-        if user_type not in cls.USERS:
-            raise KeyError(f"Unknown user type: {user_type}. "
-                           f"Available: {list(cls.USERS.keys())}")
-        return cls.USERS[user_type]
+        return CREDENTIALS.get(user_type).as_dict()
+
+    _base_url_override: ClassVar[Optional[str]] = None
 
     @classmethod
     def get_base_url(cls) -> str:
-        """Get base URL."""
-        return cls.BASE_URL
+        """Get base URL of the current target."""
+        return cls._base_url_override or cls.BASE_URL
+
+    @classmethod
+    def set_base_url(cls, url: Optional[str]) -> None:
+        """Point the run at another target, e.g. the local server.
+
+        Args:
+            url: Base URL or None to restore the default
+        """
+        cls._base_url_override = url
+
+    @classmethod
+    def get_url(cls, path: str = "/") -> str:
+        """Build absolute URL on the current target.
+
+        Args:
+            path: Path starting with '/'
+
+        Returns:
+            Absolute URL
+        """
+        return cls.get_base_url().rstrip("/") + path
+
+    _timeout_store: ClassVar[Optional[TimeoutStore]] = None
+
+    @classmethod
+    def set_timeout_store(cls, store: Optional[TimeoutStore]) -> None:
+        """Use store of observed wait durations for adaptive timeouts.
+
+        Args:
+            store: Timeout history or None to disable adaptation
+        """
+        cls._timeout_store = store
+
+    @classmethod
+    def observe_wait(cls, key: str, seconds: float,
+                     timed_out: bool = False) -> None:
+        """Record duration of a wait.
+
+        Args:
+            key: Wait key (page:locator:user type)
+            seconds: Observed duration, or the timeout of a failed wait
+            timed_out: The wait timed out after seconds
+        """
+        if cls._timeout_store is not None:
+            cls._timeout_store.observe(key, seconds, timed_out)
+
+    @classmethod
+    def explain_timeout(cls, timeout_type: str = "element",
+                        key: Optional[str] = None) -> Tuple[float, str]:
+        """Decide timeout and describe why.
+
+        Args:
+            timeout_type: Wait type ('element', 'page', 'ajax')
+            key: Wait key with history (page:locator:user type)
+
+        Returns:
+            Timeout in seconds and the reason for it
+        """
+        default = float(cls.WAIT_TIMEOUTS.get(timeout_type, cls.TIMEOUT))
+        store = cls._timeout_store
+        if not cls.ADAPTIVE_TIMEOUTS or store is None or key is None:
+            return default, f"fixed {timeout_type} timeout"
+
+        samples = store.samples(key)
+        if len(samples) < cls.TIMEOUT_MIN_SAMPLES:
+            reason = (f"fixed {timeout_type} timeout, {len(samples)} "
+                      f"samples of {key}")
+            decision = default
+        else:
+            observed = percentile(samples, cls.TIMEOUT_PERCENTILE)
+            decision = min(max(observed * cls.TIMEOUT_MARGIN,
+                               cls.TIMEOUT_FLOOR), cls.TIMEOUT_CEILING)
+            reason = (f"p{cls.TIMEOUT_PERCENTILE:.0f}={observed:.2f}s "
+                      f"x{cls.TIMEOUT_MARGIN} of {len(samples)} samples "
+                      f"of {key}, bounds {cls.TIMEOUT_FLOOR}-"
+                      f"{cls.TIMEOUT_CEILING}s")
+
+        # Timed-out waits say only that the wait needs longer than it got
+        timeouts = store.recent_timeouts(key)
+        if timeouts:
+            raised = min(timeouts[-1] * cls.TIMEOUT_BACKOFF ** len(timeouts),
+                         cls.TIMEOUT_CEILING)
+            if raised > decision:
+                decision = raised
+                reason += (f"; raised after {len(timeouts)} timeouts, "
+                           f"last at {timeouts[-1]:.1f}s")
+        logger.info("Timeout %.2fs: %s", decision, reason)
+        return decision, reason
 
     @classmethod
-    def get_timeout(cls, timeout_type: str = "element") -> int:
+    def get_timeout(cls, timeout_type: str = "element",
+                    key: Optional[str] = None) -> float:
         """Get timeout for specified wait type.
 
         Args:
             timeout_type: Wait type ('element', 'page', 'ajax')
+            key: Wait key with history (page:locator:user type)
 
         Returns:
             Timeout in seconds
         """
-        return cls.WAIT_TIMEOUTS.get(timeout_type, cls.TIMEOUT)
+        return cls.explain_timeout(timeout_type, key)[0]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+
+PASSWORD: str = "secret_sauce"
+INVALID_PASSWORD: str = "wrong_password"
+
+# Error text shown by the login form for each failed outcome
+ERROR_MESSAGES: Dict[str, str] = {
+    "locked": "Sorry, this user has been locked out.",
+    "invalid": "Username and password do not match any user in this "
+               "service",
+    "username_required": "Username is required",
+    "password_required": "Password is required",
+}
+
+
+@dataclass(frozen=True)
+class Credential:
+    """Test user account and the login outcome it produces."""
+    key: str
+    username: str
+    password: str = PASSWORD
+    outcome: str = "success"
+
+    def as_dict(self) -> Dict[str, str]:
+        """Username and password as in Config.USERS."""
+        return {"username": self.username, "password": self.password}
+
+
+class CredentialRegistry:
+    """Single source of test users, looked up by key or username."""
+
+    def __init__(self, credentials: Iterable[Credential]) -> None:
+        """Initialize registry.
+
+        Args:
+            credentials: Accounts with unique keys
+        """
+        self._by_key: Dict[str, Credential] = {}
+        self._by_username: Dict[str, Credential] = {}
+        for credential in credentials:
+            self._by_key[credential.key] = credential
+            self._by_username[credential.username] = credential
+
+    def __iter__(self) -> Iterator[Credential]:
+        """Iterate accounts in registration order."""
+        return iter(self._by_key.values())
+
+    def __len__(self) -> int:
+        """Number of accounts."""
+        return len(self._by_key)
+
+    def keys(self) -> list[str]:
+        """Account keys (user types)."""
+        return list(self._by_key)
+
+    def get(self, key: str) -> Credential:
+        """Get account by user type.
+
+        Args:
+            key: User type ('standard', 'locked', 'performance', ...)
+
+        Returns:
+            Account
+
+        Raises:
+            KeyError: If user type not found
+        """
+        if key not in self._by_key:
+            raise KeyError(f"Unknown user type: {key}. "
+                           f"Available: {self.keys()}")
+        return self._by_key[key]
+
+    def by_username(self, username: str) -> Optional[Credential]:
+        """Find account by exact username.
+
+        Args:
+            username: Username typed into the form
+
+        Returns:
+            Account, None for unknown usernames
+        """
+        return self._by_username.get(username)
+
+    def expected_outcome(self, username: str, password: str) -> str:
+        """Outcome the login form gives for a username and password.
+
+        Args:
+            username: Typed username
+            password: Typed password
+
+        Returns:
+            'success' or a key of ERROR_MESSAGES
+        """
+        if not username:
+            return "username_required"
+        if not password:
+            return "password_required"
+        credential = self.by_username(username)
+        if credential is None or credential.password != password:
+            return "invalid"
+        return credential.outcome
+
+    def as_users(self) -> Dict[str, Dict[str, str]]:
+        """Accounts in the Config.USERS layout."""
+        return {key: credential.as_dict()
+                for key, credential in self._by_key.items()}
+
+
+CREDENTIALS: CredentialRegistry = CredentialRegistry([
+    Credential("standard", "standard_user"),
+    Credential("locked", "locked_out_user", outcome="locked"),
+    Credential("performance", "performance_glitch_user"),
+    Credential("problem", "problem_user"),
+])
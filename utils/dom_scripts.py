@@ -0,0 +1,228 @@
+"""JavaScript snippets executed in the page by page objects."""
+
+DOM_HELPERS = """
+function locate(by, value) {
+    switch (by) {
+        case "id":
+            return document.getElementById(value);
+        case "css selector":
+            return document.querySelector(value);
+        case "class name":
+            return document.getElementsByClassName(value)[0] || null;
+        case "name":
+            return document.getElementsByName(value)[0] || null;
+        case "tag name":
+            return document.getElementsByTagName(value)[0] || null;
+        case "xpath":
+            return document.evaluate(value, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case "link text":
+        case "partial link text":
+            var links = document.getElementsByTagName("a");
+            for (var i = 0; i < links.length; i++) {
+                var text = links[i].innerText.trim();
+                if (by === "link text" ? text === value
+                        : text.indexOf(value) !== -1) {
+                    return links[i];
+                }
+            }
+            return null;
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+
+function isDisplayed(element) {
+    if (!element.isConnected) {
+        return false;
+    }
+    var style = window.getComputedStyle(element);
+    if (style.display === "none" || style.visibility === "hidden"
+            || style.visibility === "collapse"
+            || parseFloat(style.opacity) === 0) {
+        return false;
+    }
+    var rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+"""
+
+READ_STATES_SCRIPT = DOM_HELPERS + """
+var locators = arguments[0];
+var attributes = arguments[1];
+var aliases = {"class": "className", "readonly": "readOnly"};
+
+function readAttribute(element, name) {
+    var property = element[aliases[name] || name];
+    if (typeof property === "boolean") {
+        return property ? "true" : null;
+    }
+    if (property !== undefined && property !== null
+            && typeof property !== "object"
+            && typeof property !== "function") {
+        return String(property);
+    }
+    return element.getAttribute(name);
+}
+
+return locators.map(function (locator) {
+    var element = locate(locator[0], locator[1]);
+    if (!element) {
+        return {element: null, displayed: false, text: "", attributes: {}};
+    }
+    var displayed = isDisplayed(element);
+    var values = {};
+    attributes.forEach(function (name) {
+        values[name] = readAttribute(element, name);
+    });
+    return {
+        element: element,
+        displayed: displayed,
+        text: displayed ? element.innerText.trim() : "",
+        attributes: values
+    };
+});
+"""
+
+# Resolves as soon as the condition holds. Re-checks are driven by DOM
+# mutations and history events, batched per animation frame, with a slow
+# in-page interval for changes no observer sees (CSS, pushState).
+OBSERVER_WAIT_SCRIPT = DOM_HELPERS + """
+var condition = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+
+function check() {
+    if (condition.kind === "url_changes") {
+        return window.location.href !== condition.url
+            ? window.location.href : null;
+    }
+    if (condition.kind === "url_is") {
+        return window.location.href === condition.url
+            ? window.location.href : null;
+    }
+    if (condition.kind === "all_visible") {
+        for (var i = 0; i < condition.locators.length; i++) {
+            var item = locate(condition.locators[i][0],
+                              condition.locators[i][1]);
+            if (!item || !isDisplayed(item)) {
+                return null;
+            }
+        }
+        return true;
+    }
+    var element = locate(condition.by, condition.value);
+    if (!element || !isDisplayed(element)) {
+        return null;
+    }
+    return element;
+}
+
+var initial;
+try {
+    initial = check();
+} catch (e) {
+    done({status: "error", message: String(e)});
+    return;
+}
+if (initial !== null) {
+    done({status: "ok", value: initial});
+    return;
+}
+
+var finished = false;
+var scheduled = false;
+var observer = new MutationObserver(schedule);
+
+function finish(payload) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(interval);
+    window.removeEventListener("popstate", schedule);
+    window.removeEventListener("hashchange", schedule);
+    done(payload);
+}
+
+function schedule() {
+    if (scheduled) {
+        return;
+    }
+    scheduled = true;
+    window.requestAnimationFrame(function () {
+        scheduled = false;
+        try {
+            var result = check();
+            if (result !== null) {
+                finish({status: "ok", value: result});
+            }
+        } catch (e) {
+            finish({status: "error", message: String(e)});
+        }
+    });
+}
+
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+window.addEventListener("popstate", schedule);
+window.addEventListener("hashchange", schedule);
+var interval = setInterval(schedule, 100);
+var timer = setTimeout(function () {
+    finish({status: "timeout"});
+}, timeoutMs);
+"""
+
+TIMING_SCRIPT = """
+var markName = arguments[0];
+var navigation = performance.getEntriesByType("navigation")[0];
+var paint = {};
+performance.getEntriesByType("paint").forEach(function (entry) {
+    paint[entry.name] = entry.startTime;
+});
+var resources = performance.getEntriesByType("resource");
+var transferSize = 0;
+resources.forEach(function (entry) {
+    transferSize += entry.transferSize || 0;
+});
+var actionMs = null;
+if (markName) {
+    var marks = performance.getEntriesByName(markName, "mark");
+    if (marks.length) {
+        actionMs = performance.now() - marks[marks.length - 1].startTime;
+        performance.clearMarks(markName);
+    }
+}
+return {
+    url: window.location.href,
+    navigation: navigation ? navigation.toJSON() : null,
+    paint: paint,
+    resourceCount: resources.length,
+    transferSize: transferSize,
+    actionMs: actionMs
+};
+"""
+
+MARK_SCRIPT = "performance.mark(arguments[0]);"
+
+PAGE_STATE_SCRIPT = DOM_HELPERS + """
+var ready = arguments[0];
+var element = ready ? locate(ready[0], ready[1]) : null;
+return {
+    url: window.location.href,
+    readyState: document.readyState,
+    ready: ready ? element !== null && isDisplayed(element) : true
+};
+"""
+
+DOM_SNAPSHOT_SCRIPT = """
+var html = document.documentElement ? document.documentElement.outerHTML : "";
+return {
+    url: window.location.href,
+    title: document.title,
+    html: html.slice(0, arguments[0]),
+    truncated: html.length > arguments[0]
+};
+"""
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import time
+from typing import Any, Dict, List, Optional, Protocol
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class CommandListener(Protocol):
+    """Receives every WebDriver command sent by an instrumented driver."""
+
+    def after_command(self, driver: WebDriver, command: str,
+                      params: Optional[Dict[str, Any]], duration: float,
+                      error: Optional[BaseException]) -> None:
+        """Handle finished command.
+
+        Args:
+            driver: Driver that sent the command
+            command: WebDriver command name
+            params: Command parameters
+            duration: Round trip time in seconds
+            error: Exception raised by the command, if any
+        """
+
+
+def add_listener(driver: WebDriver, listener: CommandListener) -> None:
+    """Instrument driver and register listener.
+
+    The driver's execute method, which every WebDriver and WebElement
+    call goes through, is wrapped once per driver instance.
+
+    Args:
+        driver: WebDriver instance
+        listener: Listener to register
+    """
+    listeners: List[CommandListener] = driver.__dict__.get(
+        "_command_listeners")
+    if listeners is None:
+        listeners = []
+        driver._command_listeners = listeners
+        original = driver.execute
+
+        def execute(driver_command: str,
+                    params: Optional[Dict[str, Any]] = None) -> Any:
+            if not listeners:
+                return original(driver_command, params)
+            start = time.perf_counter()
+            error: Optional[BaseException] = None
+            try:
+                return original(driver_command, params)
+            except BaseException as exc:
+                error = exc
+                raise
+            finally:
+                duration = time.perf_counter() - start
+                for item in list(listeners):
+                    item.after_command(driver, driver_command, params,
+                                       duration, error)
+
+        driver.execute = execute
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def remove_listener(driver: WebDriver, listener: CommandListener) -> None:
+    """Unregister listener from driver.
+
+    Args:
+        driver: WebDriver instance
+        listener: Listener to remove
+    """
+    listeners = driver.__dict__.get("_command_listeners") or []
+    if listener in listeners:
+        listeners.remove(listener)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.chrome_startup import FAST_START_ARGUMENTS, STARTUP
+from utils.config import Config
+from utils.flight_recorder import FLIGHT
+from utils.grid import GRID
+from utils.network import NETWORK
+
+
+class Chrome(webdriver.Chrome):
+    """Chrome session removing its cloned profile on quit."""
+
+    profile_dir: Optional[Path] = None
+
+    def quit(self) -> None:
+        """Close browser and delete its user data directory."""
+        try:
+            super().quit()
+        finally:
+            if self.profile_dir is not None:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+def build_chrome_options() -> Options:
+    """Build Chrome options used by every test session.
+
+    Returns:
+        Configured Chrome options
+    """
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_experimental_option("excludeSwitches",
+                                    ["enable-automation", "enable-logging"])
+    options.add_argument("--log-level=3")
+    options.add_argument("--silent")
+    for argument in FAST_START_ARGUMENTS:
+        options.add_argument(argument)
+    options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
+    NETWORK.configure_options(options)
+    FLIGHT.configure_options(options)
+    return options
+
+
+def build_profile_template(user_data_dir: Path) -> None:
+    """Create Chrome profile and prime its HTTP cache.
+
+    Args:
+        user_data_dir: Empty directory receiving the profile
+    """
+    start = time.perf_counter()
+    options = build_chrome_options()
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    driver = webdriver.Chrome(options=options, service=STARTUP.service())
+    try:
+        driver.get(Config.get_url("/"))
+    except WebDriverException:
+        # An unprimed cache still saves the first-run work
+        pass
+    finally:
+        driver.quit()
+    STARTUP.metrics.template_build = time.perf_counter() - start
+
+
+def create_driver() -> WebDriver:
+    """Start a new Chrome session.
+
+    With Config.GRID_NODES set the session runs on the least loaded
+    remote node. Local sessions share the worker's chromedriver and
+    start from a clone of the profile template (see
+    Config.SHARE_CHROMEDRIVER and Config.PROFILE_TEMPLATE_DIR).
+
+    Returns:
+        WebDriver instance
+    """
+    start = time.perf_counter()
+    options = build_chrome_options()
+    if GRID.enabled:
+        driver = GRID.create_driver(options)
+        driver.implicitly_wait(Config.IMPLICIT_WAIT)
+        NETWORK.apply(driver)
+        STARTUP.metrics.sessions.append(time.perf_counter() - start)
+        return driver
+
+    profile_dir = None
+    if STARTUP.template is not None:
+        STARTUP.template.ensure(build_profile_template)
+        clone_start = time.perf_counter()
+        profile_dir = STARTUP.template.clone()
+        STARTUP.metrics.clones.append(time.perf_counter() - clone_start)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+    try:
+        driver = Chrome(options=options, service=STARTUP.service())
+    except Exception:
+        if profile_dir is not None:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.profile_dir = profile_dir
+    driver.implicitly_wait(Config.IMPLICIT_WAIT)
+    NETWORK.apply(driver)
+    STARTUP.metrics.sessions.append(time.perf_counter() - start)
+    return driver
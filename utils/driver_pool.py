@@ -0,0 +1,179 @@
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.resources import drivers_rss
+
+
+RESET_STORAGE_SCRIPT = """
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+} catch (e) {}
+"""
+
+
+@dataclass
+class PoolMetrics:
+    """Counters collected by the driver pool."""
+    hits: int = 0
+    misses: int = 0
+    recycled: int = 0
+    reset_times: List[float] = field(default_factory=list)
+    peak_rss: int = 0
+
+    @property
+    def average_reset_time(self) -> float:
+        """Average state reset duration in seconds."""
+        if not self.reset_times:
+            return 0.0
+        return sum(self.reset_times) / len(self.reset_times)
+
+    def summary(self) -> str:
+        """Human readable one-line summary."""
+        return (f"hits={self.hits} misses={self.misses} "
+                f"recycled={self.recycled} "
+                f"resets={len(self.reset_times)} "
+                f"avg_reset={self.average_reset_time * 1000:.1f}ms "
+                f"peak_rss={self.peak_rss / 2 ** 20:.0f}MB")
+
+
+@dataclass
+class _PooledDriver:
+    """Driver together with its lease counter."""
+    driver: WebDriver
+    leases: int = 0
+
+
+class DriverPool:
+    """Pool of warm WebDriver sessions leased to tests."""
+
+    def __init__(self, factory: Callable[[], WebDriver], size: int,
+                 max_leases: int, reset_url: str,
+                 rss_interval: int = 10) -> None:
+        """Initialize driver pool.
+
+        Args:
+            factory: Callable starting a new WebDriver session
+            size: Maximum number of live sessions
+            max_leases: Leases after which a session is recycled
+            reset_url: URL opened after every state reset
+            rss_interval: Releases between memory samples; sessions
+                are also sampled right before they are recycled
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_leases = max(1, max_leases)
+        self.reset_url = reset_url
+        self.rss_interval = max(1, rss_interval)
+        self.metrics = PoolMetrics()
+        self._releases = 0
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._live = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> WebDriver:
+        """Lease a warm driver, starting a new one if needed.
+
+        Returns:
+            WebDriver instance reserved for the caller
+        """
+        with self._condition:
+            while not self._idle and self._live >= self.size:
+                self._condition.wait()
+            if self._idle:
+                entry = self._idle.pop()
+                self.metrics.hits += 1
+            else:
+                self._live += 1
+                entry = None
+                self.metrics.misses += 1
+
+        if entry is None:
+            try:
+                entry = _PooledDriver(self.factory())
+            except Exception:
+                with self._condition:
+                    self._live -= 1
+                    self._condition.notify()
+                raise
+
+        entry.leases += 1
+        with self._condition:
+            self._leased[id(entry.driver)] = entry
+        return entry.driver
+
+    def release(self, driver: WebDriver, broken: bool = False) -> None:
+        """Return driver to the pool after resetting its state.
+
+        Args:
+            driver: Driver obtained from acquire()
+            broken: Force recycling of the session
+        """
+        with self._condition:
+            entry = self._leased.pop(id(driver))
+            recycle = broken or entry.leases >= self.max_leases
+            self._releases += 1
+            live = [entry] + self._idle + list(self._leased.values())
+            sample = recycle or self._releases % self.rss_interval == 0
+        if sample:
+            # Scanning /proc costs a few ms, too much for every test
+            rss = drivers_rss(item.driver for item in live)
+            self.metrics.peak_rss = max(self.metrics.peak_rss, rss)
+
+        if recycle or not self._reset(driver):
+            self._discard(entry)
+            return
+
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Quit every idle and leased driver."""
+        with self._condition:
+            entries = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+        for entry in entries:
+            self._discard(entry, recycled=False)
+
+    def _reset(self, driver: WebDriver) -> bool:
+        """Clear cookies and storage and open the reset URL.
+
+        Args:
+            driver: Driver to clean
+
+        Returns:
+            True if the session survived the reset
+        """
+        start = time.perf_counter()
+        try:
+            driver.execute_script(RESET_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+            driver.get(self.reset_url)
+        except WebDriverException:
+            return False
+        self.metrics.reset_times.append(time.perf_counter() - start)
+        return True
+
+    def _discard(self, entry: _PooledDriver, recycled: bool = True) -> None:
+        """Quit driver and free its pool slot.
+
+        Args:
+            entry: Pooled driver to drop
+            recycled: Count the drop as a recycle in metrics
+        """
+        try:
+            entry.driver.quit()
+        except WebDriverException:
+            pass
+        with self._condition:
+            self._live -= 1
+            if recycled:
+                self.metrics.recycled += 1
+            self._condition.notify()
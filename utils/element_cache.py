@@ -0,0 +1,124 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from utils.driver_events import add_listener
+
+
+# Commands after which every element handle belongs to an old document
+NAVIGATION_COMMANDS = frozenset({"get", "goBack", "goForward", "refresh",
+                                 "switchToWindow", "newWindow"})
+
+
+@dataclass
+class CacheStats:
+    """Element cache counters."""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    invalidations: int = 0
+
+    def summary(self) -> str:
+        """Human readable one-line summary."""
+        return (f"hits={self.hits} misses={self.misses} "
+                f"stale={self.stale} invalidations={self.invalidations}")
+
+
+class NavigationTracker:
+    """Counts navigations of a driver (CommandListener)."""
+
+    def after_command(self, driver: WebDriver, command: str,
+                      params: Optional[Dict[str, Any]], duration: float,
+                      error: Optional[BaseException]) -> None:
+        """Bump the navigation counter of the driver."""
+        if command in NAVIGATION_COMMANDS:
+            driver._navigations = driver.__dict__.get("_navigations", 0) + 1
+
+
+_TRACKER = NavigationTracker()
+
+
+def navigation_count(driver: WebDriver) -> int:
+    """Number of navigations of a driver since it was first tracked.
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        Navigation counter
+    """
+    add_listener(driver, _TRACKER)
+    return driver.__dict__.get("_navigations", 0)
+
+
+class ElementCache:
+    """Resolved elements of one page object, keyed by locator.
+
+    The cache is dropped whenever the driver navigates; handles that
+    went stale without a navigation (clicks, re-renders) are discarded
+    by the caller.
+    """
+
+    def __init__(self, driver: WebDriver) -> None:
+        """Initialize empty cache.
+
+        Args:
+            driver: Driver the elements belong to
+        """
+        self.driver = driver
+        self.stats = CacheStats()
+        self._elements: Dict[Hashable, WebElement] = {}
+        self._generation: Optional[int] = None
+
+    def _sync(self) -> None:
+        """Drop elements cached before the last navigation."""
+        generation = navigation_count(self.driver)
+        if generation != self._generation:
+            if self._elements:
+                self._count("invalidations")
+                self._elements.clear()
+            self._generation = generation
+
+    def _count(self, counter: str) -> None:
+        """Increment page and run totals."""
+        setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+        setattr(ELEMENT_CACHE_STATS, counter,
+                getattr(ELEMENT_CACHE_STATS, counter) + 1)
+
+    def get(self, locator: Hashable) -> Optional[WebElement]:
+        """Cached element of a locator.
+
+        Args:
+            locator: Tuple (By strategy, value)
+
+        Returns:
+            Element, None on a miss
+        """
+        self._sync()
+        element = self._elements.get(locator)
+        self._count("misses" if element is None else "hits")
+        return element
+
+    def put(self, locator: Hashable, element: WebElement) -> None:
+        """Cache resolved element.
+
+        Args:
+            locator: Tuple (By strategy, value)
+            element: Element found for it
+        """
+        self._sync()
+        self._elements[locator] = element
+
+    def discard(self, locator: Hashable) -> None:
+        """Drop element that went stale.
+
+        Args:
+            locator: Tuple (By strategy, value)
+        """
+        if self._elements.pop(locator, None) is not None:
+            self._count("stale")
+
+
+# Totals of all page objects in this process
+ELEMENT_CACHE_STATS: CacheStats = CacheStats()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+import fcntl
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import pytest
+from _pytest.runner import CallInfo, runtestprotocol
+from selenium.common.exceptions import (ElementClickInterceptedException,
+                                        StaleElementReferenceException,
+                                        TimeoutException)
+
+
+# RerunProtocol drives test phases through pytest's private runner API,
+# so requirements.txt pins pytest; other versions run without reruns
+PYTEST_VERSIONS = ("7.4.",)
+
+# Errors of a page that was not ready yet; worth one more attempt
+TIMING_ERRORS = (TimeoutException, StaleElementReferenceException,
+                 ElementClickInterceptedException)
+
+
+def is_timing_failure(error: BaseException) -> bool:
+    """Check whether a test failed on a wait or a moving page.
+
+    Args:
+        error: Exception raised by a test phase
+
+    Returns:
+        True if the error or one it was raised from is a timing error
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, TIMING_ERRORS):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def report_failed(report: pytest.TestReport) -> bool:
+    """Failed phase, including a failure turned into xfail by quarantine."""
+    return report.failed or (report.skipped and hasattr(report, "wasxfail"))
+
+
+class FlakinessStore:
+    """Recent outcomes per test, persisted between runs."""
+
+    def __init__(self, path: Path, window: int = 20) -> None:
+        """Initialize store, loading history from disk.
+
+        Args:
+            path: JSON history file
+            window: Runs kept per test
+        """
+        self.path = path
+        self.window = window
+        self.history: Dict[str, List[str]] = self._load()
+        self._new: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, nodeid: str, outcome: str) -> None:
+        """Add outcome of a run.
+
+        Args:
+            nodeid: Pytest node ID
+            outcome: 'passed', 'flaky' (passed on rerun) or 'failed'
+        """
+        with self._lock:
+            self._new.setdefault(nodeid, []).append(outcome)
+            runs = self.history.setdefault(nodeid, [])
+            runs.append(outcome)
+            del runs[:-self.window]
+
+    def score(self, nodeid: str) -> float:
+        """Share of recent runs that did not pass at the first attempt.
+
+        A test that has not passed once in the window is broken rather
+        than flaky and scores 0, so it keeps blocking the run.
+
+        Args:
+            nodeid: Pytest node ID
+
+        Returns:
+            Score in range 0-1
+        """
+        runs = self.history.get(nodeid, [])
+        if not any(outcome in ("passed", "flaky") for outcome in runs):
+            return 0.0
+        return sum(outcome != "passed" for outcome in runs) / len(runs)
+
+    def quarantined(self, threshold: float,
+                    min_runs: int) -> Dict[str, float]:
+        """Tests flaky enough to leave the main lane.
+
+        Args:
+            threshold: Lowest score quarantined
+            min_runs: Runs needed before a test can be quarantined
+
+        Returns:
+            Mapping of node ID to score
+        """
+        scores = {nodeid: self.score(nodeid)
+                  for nodeid, runs in self.history.items()
+                  if len(runs) >= min_runs}
+        return {nodeid: score for nodeid, score in scores.items()
+                if score >= threshold}
+
+    def save(self) -> None:
+        """Merge new outcomes into the file written by other runs.
+
+        Runs in other processes, e.g. the parallel quarantine lane, save
+        to the same file, so reading, merging and replacing it happen
+        under an exclusive lock on a sidecar file.
+        """
+        lock_path = self.path.with_name(f"{self.path.name}.lock")
+        with self._lock, open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = self._load()
+            for nodeid, outcomes in self._new.items():
+                runs = merged.setdefault(nodeid, [])
+                runs.extend(outcomes)
+                del runs[:-self.window]
+            self._new = {}
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(merged, indent=1, sort_keys=True))
+            os.replace(tmp, self.path)
+
+    def _load(self) -> Dict[str, List[str]]:
+        """Read history file, empty when missing or corrupt."""
+        if not self.path.is_file():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except ValueError:
+            return {}
+
+
+class RerunProtocol:
+    """Private pytest runner calls needed to rerun a test in place.
+
+    An attempt that may be retried tears down only function fixtures,
+    which the public hooks cannot do. Every use of pytest internals is
+    kept here and checked against PYTEST_VERSIONS.
+    """
+
+    @staticmethod
+    def supported() -> bool:
+        """Check that the installed pytest has the expected internals."""
+        return pytest.__version__.startswith(PYTEST_VERSIONS)
+
+    @staticmethod
+    def run(item: pytest.Item,
+            nextitem: Optional[pytest.Item]) -> List[pytest.TestReport]:
+        """Run setup, call and teardown of one attempt without logging.
+
+        Args:
+            item: Test item
+            nextitem: Item whose fixtures are kept by the teardown
+
+        Returns:
+            Phase reports of the attempt
+        """
+        return runtestprotocol(item, nextitem=nextitem, log=False)
+
+    @staticmethod
+    def reset(item: pytest.Item) -> None:
+        """Give the item a fresh fixture request for the next attempt."""
+        item._initrequest()
+
+    @staticmethod
+    def teardown(item: pytest.Item,
+                 nextitem: Optional[pytest.Item]
+                 ) -> Optional[pytest.TestReport]:
+        """Tear down fixtures an attempt kept for a rerun.
+
+        The teardown hooks of the test are not run a second time.
+
+        Args:
+            item: Test item
+            nextitem: Real next item of the session
+
+        Returns:
+            Teardown report if the teardown failed, else None
+        """
+        call = CallInfo.from_call(
+            lambda: item.session._setupstate.teardown_exact(nextitem),
+            "teardown", reraise=KeyboardInterrupt)
+        if call.excinfo is None:
+            return None
+        return item.ihook.pytest_runtest_makereport(item=item, call=call)
+
+
+@dataclass
+class RerunStats:
+    """Reruns of one run."""
+    tests: int = 0
+    recovered: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """Human readable one-line summary."""
+        return (f"tests={self.tests} recovered={self.recovered} "
+                f"still_failing={self.tests - self.recovered} "
+                f"time={self.seconds:.1f}s")
+
+
+class FlakinessRecorder:
+    """Pytest plugin recording test outcomes and reruns on the controller.
+
+    Rerun counts and time arrive as user properties of the reports, so
+    they reach the controller from xdist workers too.
+    """
+
+    def __init__(self, store: FlakinessStore) -> None:
+        """Initialize plugin.
+
+        Args:
+            store: Store updated with test outcomes
+        """
+        self.store = store
+        self.reruns = RerunStats()
+        self._reports: Dict[str, List[pytest.TestReport]] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Record outcome of a test after its teardown."""
+        reports = self._reports.setdefault(report.nodeid, [])
+        reports.append(report)
+        if report.when != "teardown":
+            return
+        del self._reports[report.nodeid]
+        if any(item.skipped and not hasattr(item, "wasxfail")
+               for item in reports):
+            return
+
+        failed = any(report_failed(item) for item in reports)
+        properties: Dict[str, float] = dict(
+            prop for item in reports for prop in item.user_properties)
+        reruns = int(properties.get("reruns", 0))
+        if reruns:
+            self.reruns.tests += 1
+            self.reruns.recovered += not failed
+            self.reruns.seconds += properties.get("rerun_seconds", 0.0)
+        outcome = "failed" if failed else "flaky" if reruns else "passed"
+        self.store.record(report.nodeid, outcome)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """Persist outcomes collected during the run."""
+        if self.store.history:
+            self.store.save()
+
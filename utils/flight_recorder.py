@@ -0,0 +1,285 @@
+from __future__ import annotations
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.config import Config
+from utils.dom_scripts import DOM_SNAPSHOT_SCRIPT
+
+
+CHANNELS: Tuple[str, ...] = ("command", "console", "network", "dom")
+
+# Network events kept in the trace and the params worth keeping
+NETWORK_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "Network.requestWillBeSent": ("requestId", "type"),
+    "Network.responseReceived": ("requestId",),
+    "Network.loadingFailed": ("requestId", "errorText", "blockedReason"),
+    "Network.loadingFinished": ("requestId", "encodedDataLength"),
+}
+
+# Commands whose parameters may carry typed secrets
+_TYPED_TEXT_COMMANDS = ("sendKeysToElement", "sendKeysToActiveElement")
+
+Event = Tuple[float, Dict[str, Any]]
+
+
+def _compact_params(command: str,
+                    params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shorten command parameters for the trace.
+
+    Typed text is replaced by its length, long values are cut.
+
+    Args:
+        command: WebDriver command name
+        params: Command parameters
+
+    Returns:
+        JSON serializable parameters
+    """
+    compact: Dict[str, Any] = {}
+    for name, value in (params or {}).items():
+        if command in _TYPED_TEXT_COMMANDS and name in ("text", "value"):
+            compact[name] = f"<{len(value)} chars>"
+        elif name == "args":
+            compact[name] = f"<{len(value)} args>"
+        elif isinstance(value, (int, float, bool)) or value is None:
+            compact[name] = value
+        else:
+            compact[name] = str(value)[:120]
+    return compact
+
+
+class FlightRecorder:
+    """Bounded in-memory trace of the running test.
+
+    Commands and DOM snapshots go into ring buffers per channel; the
+    browser console and network performance logs are read from the
+    driver only when a trace is dumped. The DOM is captured after failed
+    steps and when a trace is dumped, never for passing steps. Passing
+    tests just clear the buffers and cost no log reads.
+    """
+
+    def __init__(self, max_events: int, max_age: float,
+                 dom_snapshots: int, dom_chars: int) -> None:
+        """Initialize recorder.
+
+        Args:
+            max_events: Events kept per channel
+            max_age: Seconds of history kept in a dump
+            dom_snapshots: DOM snapshots kept, 0 disables them
+            dom_chars: Maximum HTML length of one snapshot
+        """
+        self.max_age = max_age
+        self.dom_chars = dom_chars
+        self._buffers: Dict[str, Deque[Event]] = {
+            channel: deque(maxlen=max_events) for channel in CHANNELS
+        }
+        self._buffers["dom"] = deque(maxlen=dom_snapshots)
+        self._steps: List[str] = []
+        self._started = time.time()
+        self._active = False
+        self._snapshotting = False
+
+    @classmethod
+    def from_config(cls) -> FlightRecorder:
+        """Create recorder from Config settings."""
+        return cls(Config.FLIGHT_MAX_EVENTS, Config.FLIGHT_MAX_AGE,
+                   Config.FLIGHT_DOM_SNAPSHOTS, Config.FLIGHT_DOM_CHARS)
+
+    @property
+    def enabled(self) -> bool:
+        """True if the recorder is switched on in Config."""
+        return Config.FLIGHT_RECORDER
+
+    def configure_options(self, options: Options) -> None:
+        """Enable browser console and network performance logs.
+
+        Only network events go to the performance log; page and
+        timeline events are not recorded.
+
+        Args:
+            options: Chrome options of a new session
+        """
+        if not self.enabled:
+            return
+        prefs = dict(options.capabilities.get("goog:loggingPrefs", {}))
+        prefs["browser"] = "ALL"
+        prefs["performance"] = "ALL"
+        options.set_capability("goog:loggingPrefs", prefs)
+        options.add_experimental_option(
+            "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    def begin(self) -> None:
+        """Start recording a new test."""
+        for buffer in self._buffers.values():
+            buffer.clear()
+        self._steps = []
+        self._started = time.time()
+        self._active = True
+
+    def _record(self, channel: str, data: Dict[str, Any],
+                timestamp: Optional[float] = None) -> None:
+        """Append event to its channel buffer."""
+        if self._active:
+            self._buffers[channel].append(
+                (time.time() if timestamp is None else timestamp, data))
+
+    def after_command(self, driver: WebDriver, command: str,
+                      params: Optional[Dict[str, Any]], duration: float,
+                      error: Optional[BaseException]) -> None:
+        """Record WebDriver command (CommandListener)."""
+        if self._snapshotting:
+            return
+        event: Dict[str, Any] = {
+            "command": command,
+            "params": _compact_params(command, params),
+            "ms": round(duration * 1000, 1),
+        }
+        if self._steps:
+            event["step"] = self._steps[-1]
+        if error is not None:
+            event["error"] = type(error).__name__
+        self._record("command", event)
+
+    def network_event(self, timestamp: float, method: str,
+                      params: Dict[str, Any]) -> None:
+        """Record network event read from the performance log.
+
+        Args:
+            timestamp: Event time in seconds since the epoch
+            method: DevTools event name
+            params: Event parameters
+        """
+        fields = NETWORK_FIELDS.get(method)
+        if fields is None:
+            return
+        event = {"event": method.split(".", 1)[1]}
+        event.update({name: params[name] for name in fields
+                      if name in params})
+        if method == "Network.requestWillBeSent":
+            event["url"] = params.get("request", {}).get("url", "")[:200]
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            event["status"] = response.get("status")
+            event["fromDiskCache"] = response.get("fromDiskCache", False)
+        self._record("network", event, timestamp)
+
+    def step_started(self, title: str, page: Any) -> None:
+        """Track current step (StepListener)."""
+        self._steps.append(title)
+
+    def step_finished(self, title: str, page: Any,
+                      error: Optional[BaseException]) -> None:
+        """Snapshot DOM after failed steps (StepListener)."""
+        if self._steps:
+            self._steps.pop()
+        driver = getattr(page, "driver", None)
+        if error is not None and driver is not None:
+            self._snapshot(driver, title, type(error).__name__)
+
+    def _snapshot(self, driver: WebDriver, step: str,
+                  error: Optional[str] = None) -> None:
+        """Record truncated outerHTML of the current page.
+
+        Args:
+            driver: WebDriver instance
+            step: Step the snapshot belongs to
+            error: Exception name of a failed step
+        """
+        if not self._active or not self._buffers["dom"].maxlen:
+            return
+        self._snapshotting = True
+        try:
+            snapshot = driver.execute_script(DOM_SNAPSHOT_SCRIPT,
+                                             self.dom_chars)
+        except WebDriverException:
+            return
+        finally:
+            self._snapshotting = False
+        snapshot["step"] = step
+        if error is not None:
+            snapshot["error"] = error
+        self._record("dom", snapshot)
+
+    def _network(self, driver: WebDriver, since: float) -> None:
+        """Read network events of the current test from the performance log.
+
+        Entries older than since are skipped before they are parsed.
+
+        Args:
+            driver: WebDriver instance
+            since: Epoch seconds of the oldest event kept
+        """
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException:
+            return
+        for entry in entries:
+            if entry["timestamp"] / 1000 < since:
+                continue
+            message = json.loads(entry["message"])["message"]
+            self.network_event(entry["timestamp"] / 1000,
+                               message.get("method", ""),
+                               message.get("params", {}))
+
+    def _console(self, driver: WebDriver) -> None:
+        """Read browser console log of the current test."""
+        try:
+            entries = driver.get_log("browser")
+        except WebDriverException:
+            return
+        for entry in entries:
+            self._record("console", {
+                "level": entry.get("level"),
+                "message": entry.get("message", "")[:500],
+            }, entry.get("timestamp", 0) / 1000)
+
+    def dump(self, driver: Optional[WebDriver], test: str) -> Dict[str, Any]:
+        """Build compact trace of the last max_age seconds.
+
+        Args:
+            driver: Driver of the failed test, for console logs and a
+                final DOM snapshot
+            test: Test node ID
+
+        Returns:
+            Trace with events ordered by time, offsets in ms from the
+            test start
+        """
+        since = max(self._started, time.time() - self.max_age)
+        if driver is not None and self.enabled:
+            self._snapshotting = True
+            try:
+                self._console(driver)
+                self._network(driver, since)
+            finally:
+                self._snapshotting = False
+            self._snapshot(driver, "dump")
+        events = []
+        for channel, buffer in self._buffers.items():
+            for timestamp, data in buffer:
+                if timestamp >= since:
+                    events.append({
+                        "t": round((timestamp - self._started) * 1000),
+                        "ch": channel, **data,
+                    })
+        events.sort(key=lambda event: event["t"])
+        return {"test": test, "window_s": self.max_age, "events": events}
+
+    def end(self) -> None:
+        """Stop recording and drop buffered events."""
+        self._active = False
+        for buffer in self._buffers.values():
+            buffer.clear()
+        self._steps = []
+
+    @staticmethod
+    def serialize(trace: Dict[str, Any]) -> str:
+        """Compact JSON of a trace."""
+        return json.dumps(trace, separators=(",", ":"), default=str)
+
+
+FLIGHT: FlightRecorder = FlightRecorder.from_config()
@@ -0,0 +1,399 @@
+from __future__ import annotations
+import json
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import (
+    ChromiumRemoteConnection)
+from urllib3.exceptions import HTTPError as Urllib3Error
+from utils.config import Config
+from utils.stats import summarize
+
+
+# WebDriver errors meaning the node or its browser went away
+NODE_LOSS_MESSAGES = (
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "unable to connect",
+    "connection refused",
+)
+
+
+def is_node_loss(error: BaseException) -> bool:
+    """Check whether an error means the remote node died.
+
+    Args:
+        error: Exception raised by a WebDriver call
+
+    Returns:
+        True for connection failures and lost sessions
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, (Urllib3Error, ConnectionError)):
+            return True
+        if isinstance(current, WebDriverException) and any(
+                text in (current.msg or "").lower()
+                for text in NODE_LOSS_MESSAGES):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+@dataclass
+class NodeStats:
+    """Counters of one node as seen by this process."""
+    sessions: int = 0
+    failures: int = 0
+    peak_active: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class GridNode:
+    """Remote WebDriver endpoint with its load."""
+    url: str
+    capacity: int
+    healthy: bool = True
+    active: int = 0
+    others: int = 0
+    last_check: float = 0.0
+    stats: NodeStats = field(default_factory=NodeStats)
+    _changed_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def used(self) -> int:
+        """Own sessions plus those of other workers at the last check."""
+        return self.active + self.others
+
+    @property
+    def load(self) -> float:
+        """Share of the session cap in use."""
+        return self.used / self.capacity
+
+    def change_active(self, delta: int) -> None:
+        """Adjust own session count and accumulate busy time."""
+        now = time.monotonic()
+        self.stats.busy_seconds += self.active * (now - self._changed_at)
+        self._changed_at = now
+        self.active += delta
+        self.stats.peak_active = max(self.stats.peak_active, self.active)
+
+
+class RemoteChrome(webdriver.Remote):
+    """Chrome session on a grid node that frees its slot on quit."""
+
+    def __init__(self, node: GridNode, dispatcher: GridDispatcher,
+                 options: Options) -> None:
+        """Start remote session.
+
+        Args:
+            node: Node to start the session on
+            dispatcher: Dispatcher owning the node slot
+            options: Chrome options
+        """
+        super().__init__(
+            command_executor=ChromiumRemoteConnection(
+                remote_server_addr=node.url,
+                vendor_prefix="goog",
+                browser_name="chrome",
+                ignore_proxy=options._ignore_local_proxy,
+            ),
+            options=options,
+        )
+        self.node = node
+        self._dispatcher = dispatcher
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict) -> Any:
+        """Run DevTools command through the node's CDP endpoint.
+
+        Args:
+            cmd: DevTools command name
+            cmd_args: Command parameters
+
+        Returns:
+            Command result
+        """
+        return self.execute("executeCdpCommand",
+                            {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self) -> None:
+        """End session, even on a dead node, and free its slot."""
+        try:
+            super().quit()
+        except Exception:
+            # The node may already be gone
+            pass
+        finally:
+            self._dispatcher.release(self.node)
+
+
+class GridDispatcher:
+    """Starts sessions on the least loaded healthy remote node.
+
+    The cap is enforced for this process's sessions; sessions of other
+    xdist workers are taken into account through the node /status
+    slots reported at each health check.
+    """
+
+    def __init__(self, urls: Sequence[str], capacity: int,
+                 health_interval: float, queue_timeout: float) -> None:
+        """Initialize dispatcher.
+
+        Args:
+            urls: Remote WebDriver URLs
+            capacity: Sessions allowed per node
+            health_interval: Seconds between node status checks
+            queue_timeout: Longest wait for a free node
+        """
+        self.nodes = [GridNode(url.rstrip("/"), capacity) for url in urls]
+        self.health_interval = health_interval
+        self.queue_timeout = queue_timeout
+        self.queue_waits: List[float] = []
+        self.requeued = 0
+        self._started = time.monotonic()
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls) -> GridDispatcher:
+        """Create dispatcher from Config settings."""
+        return cls(Config.GRID_NODES, Config.GRID_NODE_CAPACITY,
+                   Config.GRID_HEALTH_INTERVAL, Config.GRID_QUEUE_TIMEOUT)
+
+    @property
+    def enabled(self) -> bool:
+        """True if remote nodes are configured."""
+        return bool(self.nodes)
+
+    def create_driver(self, options: Options) -> RemoteChrome:
+        """Start session on the least loaded node.
+
+        A node failing to start the session is marked down and not
+        tried again for this session; the next one is tried. All
+        attempts share one queue deadline.
+
+        Args:
+            options: Chrome options
+
+        Returns:
+            Remote WebDriver
+
+        Raises:
+            WebDriverException: If no node starts the session in time
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        failed: List[GridNode] = []
+        while True:
+            node = self._acquire(deadline, failed)
+            try:
+                driver = RemoteChrome(node, self, options)
+            except Exception as error:
+                self.release(node)
+                if not is_node_loss(error):
+                    raise
+                self.mark_down(node)
+                failed.append(node)
+                continue
+            with self._condition:
+                node.stats.sessions += 1
+            return driver
+
+    def release(self, node: GridNode) -> None:
+        """Free a session slot of a node.
+
+        Args:
+            node: Node of the ended session
+        """
+        with self._condition:
+            node.change_active(-1)
+            self._condition.notify_all()
+
+    def mark_down(self, node: GridNode) -> None:
+        """Stop dispatching to a node until its next successful check.
+
+        Args:
+            node: Node that failed
+        """
+        with self._condition:
+            node.healthy = False
+            node.last_check = time.monotonic()
+            node.stats.failures += 1
+            self._condition.notify_all()
+
+    def node_lost(self, driver: Any) -> None:
+        """Mark node of a driver whose session was lost as down.
+
+        Args:
+            driver: Driver created by this dispatcher
+        """
+        node = getattr(driver, "node", None)
+        if node is not None:
+            self.mark_down(node)
+
+    def _acquire(self, deadline: Optional[float] = None,
+                 exclude: Sequence[GridNode] = ()) -> GridNode:
+        """Reserve a slot on the least loaded healthy node.
+
+        Args:
+            deadline: time.monotonic() value to give up at (default:
+                queue_timeout from now)
+            exclude: Nodes that already failed to start this session
+
+        Returns:
+            Node with a reserved slot
+
+        Raises:
+            WebDriverException: If every node was excluded or no slot
+                became free before the deadline
+        """
+        start = time.monotonic()
+        if deadline is None:
+            deadline = start + self.queue_timeout
+        candidates = [node for node in self.nodes if node not in exclude]
+        if not candidates:
+            raise WebDriverException(
+                f"No Selenium node could start a session: "
+                f"{self.status_line()}")
+        while True:
+            self._refresh()
+            with self._condition:
+                free = [node for node in candidates
+                        if node.healthy and node.used < node.capacity]
+                if free:
+                    node = min(free, key=lambda item: item.load)
+                    node.change_active(1)
+                    self.queue_waits.append(time.monotonic() - start)
+                    return node
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WebDriverException(
+                        f"No free Selenium node in {self.queue_timeout}s: "
+                        f"{self.status_line()}")
+                self._condition.wait(min(self.health_interval, remaining))
+
+    def _refresh(self) -> None:
+        """Check status of nodes not checked within health_interval."""
+        now = time.monotonic()
+        for node in self.nodes:
+            if now - node.last_check < self.health_interval:
+                continue
+            healthy, busy = self._check(node.url)
+            with self._condition:
+                node.healthy = healthy
+                node.others = max(busy - node.active, 0)
+                node.last_check = now
+                if healthy:
+                    self._condition.notify_all()
+
+    @staticmethod
+    def _check(url: str) -> tuple[bool, int]:
+        """Query node /status.
+
+        Args:
+            url: Node URL
+
+        Returns:
+            Health flag and number of busy slots on the node
+        """
+        try:
+            with urllib.request.urlopen(f"{url}/status",
+                                        timeout=2) as response:
+                value = json.load(response).get("value", {})
+        except (OSError, ValueError):
+            return False, 0
+        nodes = value.get("nodes")
+        if not nodes:
+            # Plain chromedriver or a node without slot details
+            return bool(value.get("ready", True)), 0
+        healthy = all(item.get("availability", "UP") == "UP"
+                      for item in nodes)
+        busy = sum(1 for item in nodes for slot in item.get("slots", [])
+                   if slot.get("session"))
+        return healthy, busy
+
+    def status_line(self) -> str:
+        """Node health and load in one line."""
+        return ", ".join(
+            f"{node.url} {'up' if node.healthy else 'down'} "
+            f"{node.used}/{node.capacity}"
+            for node in self.nodes)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-node counters and queue waits, mergeable across workers."""
+        with self._condition:
+            for node in self.nodes:
+                node.change_active(0)
+            return {
+                "elapsed": time.monotonic() - self._started,
+                "requeued": self.requeued,
+                "queue_waits": list(self.queue_waits),
+                "nodes": {node.url: {"capacity": node.capacity,
+                                     **asdict(node.stats)}
+                          for node in self.nodes},
+            }
+
+
+def merge_metrics(metrics: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine metrics of several workers.
+
+    Args:
+        metrics: Results of GridDispatcher.metrics()
+
+    Returns:
+        Metrics in the same layout
+    """
+    merged: Dict[str, Any] = {"elapsed": 0.0, "requeued": 0,
+                              "queue_waits": [], "nodes": {}}
+    for item in metrics:
+        merged["elapsed"] = max(merged["elapsed"], item["elapsed"])
+        merged["requeued"] += item["requeued"]
+        merged["queue_waits"].extend(item["queue_waits"])
+        for url, node in item["nodes"].items():
+            total = merged["nodes"].setdefault(
+                url, {"capacity": node["capacity"], "sessions": 0,
+                      "failures": 0, "peak_active": 0, "busy_seconds": 0.0})
+            total["sessions"] += node["sessions"]
+            total["failures"] += node["failures"]
+            total["peak_active"] = max(total["peak_active"],
+                                       node["peak_active"])
+            total["busy_seconds"] += node["busy_seconds"]
+    return merged
+
+
+def format_metrics(metrics: Dict[str, Any]) -> List[str]:
+    """Human readable report lines.
+
+    Utilisation is busy session time over capacity times run time.
+
+    Args:
+        metrics: Merged metrics
+
+    Returns:
+        One line per node and a queue wait line
+    """
+    lines = []
+    elapsed = metrics["elapsed"] or 1.0
+    for url, node in metrics["nodes"].items():
+        utilisation = node["busy_seconds"] / (node["capacity"] * elapsed)
+        lines.append(f"Grid node {url}: sessions={node['sessions']} "
+                     f"failures={node['failures']} "
+                     f"peak={node['peak_active']}/{node['capacity']} "
+                     f"utilisation={utilisation:.0%}")
+    waits = summarize(metrics["queue_waits"])
+    lines.append(f"Grid queue: waits={waits['count']} "
+                 f"p50={waits['p50'] * 1000:.0f}ms "
+                 f"p95={waits['p95'] * 1000:.0f}ms "
+                 f"max={waits['max'] * 1000:.0f}ms "
+                 f"requeued={metrics['requeued']}")
+    return lines
+
+
+GRID: GridDispatcher = GridDispatcher.from_config()
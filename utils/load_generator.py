@@ -0,0 +1,241 @@
+"""Concurrent login load generator built on the page objects.
+
+Usage:
+    STEP_MODE=off python -m utils.load_generator --rate 2 --duration 60 \\
+        --concurrency 4 --mix standard=3,problem=1,locked=1
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from pages.login_page import LoginPage
+from utils.config import Config
+from utils.driver_factory import create_driver
+from utils.driver_pool import DriverPool
+from utils.local_server import LocalSauceDemo
+from utils.stats import summarize
+
+
+@dataclass(frozen=True)
+class LoginResult:
+    """Outcome of one simulated login."""
+    user_type: str
+    success: bool
+    error: str
+    queued: float
+    latency: float
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse user mix like 'standard=3,locked=1'.
+
+    Args:
+        value: Comma separated user_type=weight pairs
+
+    Returns:
+        Weights per user type
+
+    Raises:
+        KeyError: If user type not found
+    """
+    mix = {}
+    for part in filter(None, value.split(",")):
+        user_type, _, weight = part.partition("=")
+        Config.get_user_credentials(user_type)
+        mix[user_type] = float(weight or 1)
+    return mix
+
+
+def login_once(pool: DriverPool, user_type: str,
+               timeout: float) -> tuple[bool, str]:
+    """Log in through LoginPage on a pooled driver.
+
+    Args:
+        pool: Driver pool shared by all workers
+        user_type: Key of Config.USERS
+        timeout: Wait for inventory page or error message in seconds
+
+    Returns:
+        Success flag and error message
+    """
+    driver = pool.acquire()
+    broken = False
+    try:
+        page = LoginPage(driver)
+        creds = Config.get_user_credentials(user_type)
+        page.login(creds["username"], creds["password"])
+        WebDriverWait(driver, timeout, poll_frequency=0.05).until(
+            lambda d: (d.current_url == page.inventory_url
+                       or page.is_element_visible_now(page.ERROR_MESSAGE)))
+        if page.is_element_visible_now(page.ERROR_MESSAGE):
+            return False, page.get_error_message()
+        return True, ""
+    except WebDriverException as error:
+        broken = not isinstance(error, TimeoutException)
+        return False, type(error).__name__
+    finally:
+        pool.release(driver, broken=broken)
+
+
+async def run_load(pool: DriverPool, rate: float, duration: float,
+                   mix: Dict[str, float], seed: int,
+                   timeout: float) -> List[LoginResult]:
+    """Start logins with Poisson arrivals and wait for all of them.
+
+    Args:
+        pool: Driver pool, its size limits concurrency
+        rate: Mean arrivals per second
+        duration: Arrival window in seconds
+        mix: Weights per user type
+        seed: Random seed of arrivals and user choice
+        timeout: Per-login wait in seconds
+
+    Returns:
+        Results of every started login
+    """
+    rng = random.Random(seed)
+    users = list(mix)
+    weights = [mix[user] for user in users]
+
+    async def one(user_type: str) -> LoginResult:
+        arrived = time.perf_counter()
+        started: List[float] = []
+
+        def attempt() -> tuple[bool, str]:
+            started.append(time.perf_counter())
+            return login_once(pool, user_type, timeout)
+
+        success, error = await asyncio.to_thread(attempt)
+        finished = time.perf_counter()
+        return LoginResult(user_type, success, error,
+                           started[0] - arrived, finished - arrived)
+
+    tasks = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        user_type = rng.choices(users, weights)[0]
+        tasks.append(asyncio.create_task(one(user_type)))
+        await asyncio.sleep(rng.expovariate(rate))
+    return list(await asyncio.gather(*tasks))
+
+
+def build_report(results: Sequence[LoginResult],
+                 elapsed: float) -> Dict[str, object]:
+    """Summarize load results.
+
+    Args:
+        results: Login results
+        elapsed: Wall time of the run in seconds
+
+    Returns:
+        Throughput, error rates and latency percentiles
+    """
+    total = len(results)
+    successes = sum(result.success for result in results)
+    errors = Counter(result.error for result in results if not result.success)
+    return {
+        "logins": total,
+        "successful": successes,
+        "logins_per_sec": successes / elapsed if elapsed else 0.0,
+        "error_rates": {message: count / total
+                        for message, count in errors.most_common()},
+        "latency": summarize([result.latency for result in results]),
+        "queue_wait": summarize([result.queued for result in results]),
+        "by_user": {
+            user_type: summarize([r.latency for r in results
+                                  if r.user_type == user_type])
+            for user_type in sorted({r.user_type for r in results})
+        },
+    }
+
+
+def positive_float(value: str) -> float:
+    """Parse a command line number that must be above zero.
+
+    Args:
+        value: Argument text
+
+    Returns:
+        Parsed number
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a positive number
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not number > 0:
+        raise argparse.ArgumentTypeError(
+            f"must be a number above zero, got {value!r}")
+    return number
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the load generator from the command line.
+
+    Args:
+        argv: Command line arguments
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=positive_float, default=1.0,
+                        help="Mean login arrivals per second")
+    parser.add_argument("--duration", type=positive_float, default=30.0,
+                        help="Arrival window in seconds")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Browser sessions running logins")
+    parser.add_argument("--mix", default="standard=1",
+                        help="Weighted user mix, e.g. standard=3,locked=1")
+    parser.add_argument("--target", choices=("local", "remote"),
+                        default="local")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=Config.TIMEOUT,
+                        help="Per-login wait in seconds")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    server = None
+    if args.target == "local":
+        server = LocalSauceDemo(glitch_delay=Config.LOCAL_GLITCH_DELAY)
+        server.start()
+        Config.set_base_url(server.url)
+
+    pool = DriverPool(create_driver, size=args.concurrency,
+                      max_leases=Config.POOL_MAX_LEASES,
+                      reset_url=Config.get_url(LoginPage.LOGIN_PATH))
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(args.concurrency))
+    start = time.perf_counter()
+    try:
+        results = loop.run_until_complete(run_load(
+            pool, args.rate, args.duration, mix, args.seed, args.timeout))
+    finally:
+        loop.close()
+        pool.close()
+        if server is not None:
+            server.stop()
+            Config.set_base_url(None)
+
+    report = build_report(results, time.perf_counter() - start)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+from __future__ import annotations
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Dict, Optional
+
+
+LOGIN_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Swag Labs</title>
+<style>
+body { font-family: sans-serif; margin: 0; background: #fff; }
+.login_logo { text-align: center; font-size: 24px; padding: 16px; }
+.login_wrapper { width: 350px; margin: 40px auto; }
+.form_input { display: block; width: 100%; margin: 8px 0; padding: 8px; }
+.error-message-container h3 { color: #fff; background: #e2231a;
+    padding: 8px; font-size: 14px; }
+</style>
+</head>
+<body>
+<div class="login_logo">Swag Labs</div>
+<div class="login_wrapper">
+  <form id="login-form">
+    <input class="input_error form_input" placeholder="Username" type="text"
+           data-test="username" id="user-name" name="user-name"
+           autocorrect="off" autocapitalize="none" value="">
+    <input class="input_error form_input" placeholder="Password"
+           type="password" data-test="password" id="password"
+           name="password" autocorrect="off" autocapitalize="none" value="">
+    <div class="error-message-container"></div>
+    <input type="submit" class="submit-button btn_action"
+           data-test="login-button" id="login-button" name="login-button"
+           value="Login">
+  </form>
+</div>
+<script>
+var USERS = ["standard_user", "locked_out_user", "problem_user",
+             "performance_glitch_user", "error_user", "visual_user"];
+var PASSWORD = "secret_sauce";
+var GLITCH_DELAY_MS = $glitch_delay_ms;
+
+function showError(message) {
+    var container = document.querySelector(".error-message-container");
+    container.innerHTML = "";
+    var heading = document.createElement("h3");
+    heading.setAttribute("data-test", "error");
+    heading.textContent = "Epic sadface: " + message;
+    var close = document.createElement("button");
+    close.className = "error-button";
+    close.setAttribute("data-test", "error-button");
+    close.addEventListener("click", function (event) {
+        event.preventDefault();
+        container.innerHTML = "";
+    });
+    heading.appendChild(close);
+    container.appendChild(heading);
+}
+
+var pending = sessionStorage.getItem("login-error");
+if (pending) {
+    sessionStorage.removeItem("login-error");
+    showError(pending);
+}
+
+document.getElementById("login-form").addEventListener("submit",
+    function (event) {
+        event.preventDefault();
+        var username = document.getElementById("user-name").value;
+        var password = document.getElementById("password").value;
+        if (!username) {
+            return showError("Username is required");
+        }
+        if (!password) {
+            return showError("Password is required");
+        }
+        if (USERS.indexOf(username) === -1 || password !== PASSWORD) {
+            return showError(
+                "Username and password do not match any user in this service");
+        }
+        if (username === "locked_out_user") {
+            return showError("Sorry, this user has been locked out.");
+        }
+        document.cookie = "session-username=" + username + "; path=/";
+        var delay = username === "performance_glitch_user" ?
+            GLITCH_DELAY_MS : 0;
+        if (!delay) {
+            // Navigate within the click so WebDriver waits for the page
+            return window.location.assign("/inventory.html");
+        }
+        setTimeout(function () {
+            window.location.assign("/inventory.html");
+        }, delay);
+    });
+</script>
+</body>
+</html>
+""")
+
+INVENTORY_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Swag Labs</title>
+</head>
+<body>
+<script>
+if (document.cookie.indexOf("session-username=") === -1) {
+    sessionStorage.setItem("login-error",
+        "You can only access '/inventory.html' when you are logged in.");
+    window.location.replace("/");
+}
+</script>
+<div id="page_wrapper" class="page_wrapper">
+  <div class="primary_header">
+    <div class="app_logo">Swag Labs</div>
+  </div>
+  <div class="header_secondary_container">
+    <span class="title" data-test="title">Products</span>
+  </div>
+  <div id="inventory_container" class="inventory_container">
+    <div class="inventory_list" data-test="inventory-list">
+      $items
+    </div>
+  </div>
+</div>
+</body>
+</html>
+""")
+
+INVENTORY_ITEM = Template("""<div class="inventory_item" data-test="inventory-item">
+        <div class="inventory_item_name" data-test="inventory-item-name">$name</div>
+        <div class="inventory_item_price" data-test="inventory-item-price">$$$price</div>
+        <button class="btn btn_primary btn_small btn_inventory"
+                id="add-to-cart-$slug">Add to cart</button>
+      </div>""")
+
+PRODUCTS: Dict[str, str] = {
+    "Sauce Labs Backpack": "29.99",
+    "Sauce Labs Bike Light": "9.99",
+    "Sauce Labs Bolt T-Shirt": "15.99",
+    "Sauce Labs Fleece Jacket": "49.99",
+    "Sauce Labs Onesie": "7.99",
+    "Test.allTheThings() T-Shirt (Red)": "15.99",
+}
+
+
+def _render_inventory() -> str:
+    """Render inventory page with the product list."""
+    items = "\n      ".join(
+        INVENTORY_ITEM.substitute(
+            name=name,
+            price=price,
+            slug="-".join(name.lower().split()),
+        )
+        for name, price in PRODUCTS.items()
+    )
+    return INVENTORY_PAGE.substitute(items=items)
+
+
+class _SauceDemoHandler(BaseHTTPRequestHandler):
+    """Request handler serving the stand-in pages."""
+
+    server: "_SauceDemoServer"
+
+    def do_GET(self) -> None:
+        """Serve login and inventory pages."""
+        path = self.path.split("?", 1)[0]
+        page = self.server.pages.get(path)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Silence per-request logging."""
+
+
+class _SauceDemoServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding rendered pages."""
+
+    daemon_threads = True
+    pages: Dict[str, str]
+
+
+class LocalSauceDemo:
+    """Local stand-in for www.saucedemo.com login and inventory pages."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 glitch_delay: float = 2.5,
+                 public_host: Optional[str] = None) -> None:
+        """Initialize local server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            glitch_delay: Login delay of performance_glitch_user in seconds
+            public_host: Host name browsers use to reach the server,
+                e.g. for remote grid nodes (default: host)
+        """
+        self.host = host
+        self.public_host = public_host or host
+        self.port = port
+        self.glitch_delay = glitch_delay
+        self._server: Optional[_SauceDemoServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._server is None:
+            raise RuntimeError("Local server is not started")
+        port = self._server.server_address[1]
+        return f"http://{self.public_host}:{port}"
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        login = LOGIN_PAGE.substitute(
+            glitch_delay_ms=int(self.glitch_delay * 1000))
+        self._server = _SauceDemoServer((self.host, self.port),
+                                        _SauceDemoHandler)
+        self._server.pages = {
+            "/": login,
+            "/index.html": login,
+            "/inventory.html": _render_inventory(),
+        }
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="local-saucedemo", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = None
+        self._thread = None
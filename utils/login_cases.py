@@ -0,0 +1,201 @@
+from __future__ import annotations
+import random
+import string
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from utils.credentials import INVALID_PASSWORD, PASSWORD, CredentialRegistry
+
+
+# BMP ranges only: chromedriver cannot type characters outside the BMP,
+# and U+E000.. is where Selenium keeps its special keys
+UNICODE_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0x00C0, 0x017F),  # Latin-1 supplement and Latin Extended-A
+    (0x0391, 0x03C9),  # Greek
+    (0x0410, 0x044F),  # Cyrillic
+    (0x05D0, 0x05EA),  # Hebrew
+    (0x4E00, 0x4FFF),  # CJK ideographs
+)
+
+# Spaces the form keeps as typed (tabs and newlines would move focus)
+WHITESPACE: Tuple[str, ...] = (" ", "\u00a0", "\u2003")
+
+INJECTION_PAYLOADS: Tuple[str, ...] = (
+    "' OR '1'='1",
+    "admin'--",
+    "\"; DROP TABLE users; --",
+    "<script>alert(1)</script>",
+    "<img src=x onerror=alert(1)>",
+    "{{7*7}}",
+    "${7*7}",
+    "../../etc/passwd",
+    "%00",
+    "*)(uid=*))(|(uid=*",
+)
+
+
+@dataclass(frozen=True)
+class LoginCase:
+    """One generated login attempt with its expected outcome."""
+    index: int
+    category: str
+    username: str
+    password: str
+    expected: str
+
+    @property
+    def case_id(self) -> str:
+        """Stable identifier, e.g. '00042-unicode'."""
+        return f"{self.index:05d}-{self.category}"
+
+    @property
+    def session_group(self) -> str:
+        """Cases of one group can run back-to-back without reloading.
+
+        Failed logins leave the form in place, a successful one leaves
+        the login page and needs a fresh session state.
+        """
+        return "inventory" if self.expected == "success" else "form"
+
+
+class LoginCaseGenerator:
+    """Deterministic login cases produced lazily from a seed.
+
+    Every case is derived from the seed and its own index only, so any
+    case, shard or slice can be produced without the ones before it and
+    every worker sees the same cases for the same seed.
+    """
+
+    def __init__(self, registry: CredentialRegistry, seed: str,
+                 count: int) -> None:
+        """Initialize generator.
+
+        Args:
+            registry: Accounts valid cases are built from
+            seed: Seed of the case matrix
+            count: Number of cases
+        """
+        self.registry = registry
+        self.seed = seed
+        self.count = count
+        self._users = [credential.username for credential in registry]
+        self._builders: Dict[
+            str, Callable[[random.Random], Tuple[str, str]]] = {
+            "valid": self._valid,
+            "wrong_password": self._wrong_password,
+            "unicode": self._unicode,
+            "long": self._long,
+            "whitespace": self._whitespace,
+            "injection": self._injection,
+            "empty": self._empty,
+        }
+        self.categories: List[str] = list(self._builders)
+
+    def __len__(self) -> int:
+        """Number of cases."""
+        return self.count
+
+    def __iter__(self) -> Iterator[LoginCase]:
+        """Iterate all cases in index order."""
+        return (self.case(index) for index in range(self.count))
+
+    def case(self, index: int) -> LoginCase:
+        """Build case of an index.
+
+        Categories rotate with the index so that every category is
+        covered by any run of len(categories) cases.
+
+        Args:
+            index: Case index
+
+        Returns:
+            Login case
+        """
+        category = self.categories[index % len(self.categories)]
+        rng = random.Random(f"{self.seed}:{index}")
+        username, password = self._builders[category](rng)
+        return LoginCase(index, category, username, password,
+                         self.registry.expected_outcome(username, password))
+
+    def shard(self, shard: int, total: int) -> Iterator[LoginCase]:
+        """Cases of one shard, every total-th index.
+
+        Args:
+            shard: Shard number, 0 <= shard < total
+            total: Number of shards
+
+        Returns:
+            Lazy iterator of the shard's cases
+        """
+        if not 0 <= shard < total:
+            raise ValueError(f"Shard {shard} out of range 0..{total - 1}")
+        return (self.case(index)
+                for index in range(shard, self.count, total))
+
+    @staticmethod
+    def grouped(cases: Iterable[LoginCase]) -> List[LoginCase]:
+        """Order cases so that each session group runs back-to-back.
+
+        Args:
+            cases: Cases of one shard
+
+        Returns:
+            Cases sorted by session group, then index
+        """
+        return sorted(cases, key=lambda case: (case.session_group,
+                                               case.index))
+
+    def _valid(self, rng: random.Random) -> Tuple[str, str]:
+        """Registered user with the right password."""
+        return rng.choice(self._users), PASSWORD
+
+    def _wrong_password(self, rng: random.Random) -> Tuple[str, str]:
+        """Registered user with a near-miss password."""
+        password = rng.choice([
+            INVALID_PASSWORD,
+            PASSWORD.upper(),
+            PASSWORD[:-1],
+            PASSWORD + rng.choice(string.ascii_letters),
+        ])
+        return rng.choice(self._users), password
+
+    def _unicode(self, rng: random.Random) -> Tuple[str, str]:
+        """Non-ASCII username and password."""
+        def text() -> str:
+            start, end = rng.choice(UNICODE_RANGES)
+            return "".join(chr(rng.randint(start, end))
+                           for _ in range(rng.randint(1, 32)))
+
+        return text(), rng.choice([PASSWORD, text()])
+
+    def _long(self, rng: random.Random) -> Tuple[str, str]:
+        """Username or password of 256 to 1024 characters."""
+        text = "".join(rng.choices(string.ascii_letters + string.digits,
+                                   k=rng.randint(256, 1024)))
+        if rng.random() < 0.5:
+            return text, PASSWORD
+        return rng.choice(self._users), text
+
+    def _whitespace(self, rng: random.Random) -> Tuple[str, str]:
+        """Padded registered username, or whitespace only."""
+        def pad() -> str:
+            return "".join(rng.choices(WHITESPACE, k=rng.randint(1, 3)))
+
+        username = rng.choice(self._users)
+        return rng.choice([
+            (pad() + username, PASSWORD),
+            (username + pad(), PASSWORD),
+            (username, PASSWORD + pad()),
+            (pad(), pad()),
+        ])
+
+    def _injection(self, rng: random.Random) -> Tuple[str, str]:
+        """Injection-like payload in either field."""
+        payload = rng.choice(INJECTION_PAYLOADS)
+        if rng.random() < 0.5:
+            return payload, PASSWORD
+        return rng.choice(self._users), payload
+
+    def _empty(self, rng: random.Random) -> Tuple[str, str]:
+        """Missing username, password or both."""
+        return rng.choice([("", PASSWORD), (rng.choice(self._users), ""),
+                           ("", "")])
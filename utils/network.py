@@ -0,0 +1,194 @@
+from __future__ import annotations
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.config import Config
+
+
+RESOURCE_TYPE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "image": ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp",
+              "*.ico"),
+    "font": ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"),
+    "stylesheet": ("*.css",),
+    "script": ("*.js",),
+    "media": ("*.mp4", "*.webm", "*.mp3", "*.ogg"),
+}
+
+
+@dataclass
+class NetworkStats:
+    """Network activity observed through the Chrome performance log."""
+    requests: int = 0
+    blocked: int = 0
+    served_from_cache: int = 0
+    transferred_bytes: int = 0
+    cached_bytes: int = 0
+    network_ms: float = 0.0
+
+    @property
+    def estimated_saved_ms(self) -> float:
+        """Blocked and cached requests times average network request time."""
+        fetched = self.requests - self.blocked - self.served_from_cache
+        if fetched <= 0:
+            return 0.0
+        return (self.blocked + self.served_from_cache) * (
+            self.network_ms / fetched)
+
+    def add(self, other: NetworkStats) -> None:
+        """Accumulate counters of another test.
+
+        Args:
+            other: Stats to add
+        """
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Counters with the estimated saving."""
+        data = asdict(self)
+        data["estimated_saved_ms"] = self.estimated_saved_ms
+        return data
+
+
+class NetworkInterceptor:
+    """Blocks, caches and throttles requests through the DevTools protocol.
+
+    URL patterns are blocked with Network.setBlockedURLs; resource types
+    are translated to extension patterns. Static assets are kept in a
+    persistent Chrome disk cache. Throttling applies Chrome network
+    emulation to all requests of the session.
+    """
+
+    def __init__(self, blocked_patterns: Sequence[str] = (),
+                 blocked_types: Sequence[str] = (), cache_dir: str = "",
+                 latency_ms: float = 0, throughput_kbps: float = 0) -> None:
+        """Initialize interceptor.
+
+        Args:
+            blocked_patterns: URL patterns with '*' wildcards
+            blocked_types: Keys of RESOURCE_TYPE_PATTERNS
+            cache_dir: Persistent disk cache directory
+            latency_ms: Added round trip latency
+            throughput_kbps: Download and upload limit (0 = unlimited)
+        """
+        unknown = set(blocked_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {sorted(unknown)}. "
+                             f"Available: {list(RESOURCE_TYPE_PATTERNS)}")
+        self.blocked_urls: List[str] = list(blocked_patterns)
+        for resource_type in blocked_types:
+            self.blocked_urls.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        self.cache_dir = cache_dir
+        self.latency_ms = latency_ms
+        self.throughput_kbps = throughput_kbps
+        self.totals = NetworkStats()
+
+    @classmethod
+    def from_config(cls) -> NetworkInterceptor:
+        """Create interceptor configured from Config."""
+        return cls(Config.BLOCKED_URL_PATTERNS, Config.BLOCKED_RESOURCE_TYPES,
+                   Config.NETWORK_CACHE_DIR, Config.NETWORK_LATENCY_MS,
+                   Config.NETWORK_THROUGHPUT_KBPS)
+
+    @property
+    def enabled(self) -> bool:
+        """True if any interception feature is configured."""
+        return bool(self.blocked_urls or self.cache_dir or self.latency_ms
+                    or self.throughput_kbps)
+
+    def configure_options(self, options: Options) -> None:
+        """Enable performance log and disk cache in Chrome options.
+
+        Args:
+            options: Chrome options of a new session
+        """
+        if not self.enabled:
+            return
+        prefs = dict(options.capabilities.get("goog:loggingPrefs", {}))
+        prefs["performance"] = "ALL"
+        options.set_capability("goog:loggingPrefs", prefs)
+        if self.cache_dir:
+            # Concurrent Chrome instances must not share one cache
+            worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+            cache_dir = os.path.abspath(os.path.join(self.cache_dir, worker))
+            options.add_argument(f"--disk-cache-dir={cache_dir}")
+
+    def apply(self, driver: WebDriver) -> None:
+        """Install blocking and throttling in a new session.
+
+        Args:
+            driver: Chrome WebDriver
+        """
+        if not self.enabled:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCacheDisabled",
+                               {"cacheDisabled": False})
+        if self.blocked_urls:
+            driver.execute_cdp_cmd("Network.setBlockedURLs",
+                                   {"urls": self.blocked_urls})
+        if self.latency_ms or self.throughput_kbps:
+            throughput = (self.throughput_kbps * 1024 / 8
+                          if self.throughput_kbps else -1)
+            driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+                "offline": False,
+                "latency": self.latency_ms,
+                "downloadThroughput": throughput,
+                "uploadThroughput": throughput,
+            })
+
+    def collect(self, driver: WebDriver,
+                on_event: Optional[Callable[[float, str, Dict[str, Any]],
+                                            None]] = None) -> NetworkStats:
+        """Drain performance log and count network activity since last call.
+
+        Args:
+            driver: Chrome WebDriver
+            on_event: Called with timestamp (seconds), method and params
+                of every drained Network event
+
+        Returns:
+            Stats of the drained events
+        """
+        stats = NetworkStats()
+        if not self.enabled:
+            return stats
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException:
+            return stats
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method", "")
+            params = message.get("params", {})
+            if on_event is not None and method.startswith("Network."):
+                on_event(entry["timestamp"] / 1000, method, params)
+            if method == "Network.requestWillBeSent":
+                stats.requests += 1
+            elif method == "Network.loadingFailed":
+                if params.get("blockedReason"):
+                    stats.blocked += 1
+            elif method == "Network.requestServedFromCache":
+                stats.served_from_cache += 1
+            elif method == "Network.responseReceived":
+                response = params.get("response", {})
+                if response.get("fromDiskCache"):
+                    headers = {key.lower(): value for key, value
+                               in response.get("headers", {}).items()}
+                    stats.cached_bytes += int(
+                        headers.get("content-length", 0) or 0)
+                elif response.get("timing"):
+                    stats.network_ms += response["timing"].get(
+                        "receiveHeadersEnd", 0)
+            elif method == "Network.loadingFinished":
+                stats.transferred_bytes += int(
+                    params.get("encodedDataLength", 0))
+        self.totals.add(stats)
+        return stats
+
+
+NETWORK: NetworkInterceptor = NetworkInterceptor.from_config()
@@ -0,0 +1,162 @@
+from __future__ import annotations
+import json
+import sys
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.stats import summarize
+
+
+PAGE_MODULE_PREFIX: str = "pages."
+
+
+@dataclass(frozen=True)
+class CommandRecord:
+    """One WebDriver command observed by the profiler."""
+    test: str
+    command: str
+    locator: Optional[str]
+    duration: float
+    caller: str
+    failed: bool
+
+
+def _page_object_caller() -> str:
+    """Describe page-object methods on the current call stack.
+
+    Returns:
+        Chain like 'LoginPage.login > BasePage.enter_text', outermost first
+    """
+    chain: List[str] = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(PAGE_MODULE_PREFIX):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            defining = next((cls.__name__
+                             for cls in type(owner).__mro__
+                             if name in cls.__dict__), None)
+            if defining is not None:
+                chain.append(f"{defining}.{name}")
+        frame = frame.f_back
+    return " > ".join(reversed(chain))
+
+
+class CommandProfiler:
+    """Records WebDriver command latency per test and per command."""
+
+    def __init__(self) -> None:
+        """Initialize empty profiler."""
+        self.records: List[CommandRecord] = []
+        self._test = ""
+        self._lock = threading.Lock()
+
+    def begin(self, test: str) -> None:
+        """Attribute following commands to a test.
+
+        Args:
+            test: Pytest node ID
+        """
+        self._test = test
+
+    def end(self) -> Dict[str, Any]:
+        """Stop attributing commands and summarize the finished test.
+
+        Returns:
+            Profile of the test
+        """
+        test, self._test = self._test, ""
+        return self.test_profile(test)
+
+    def record(self, command: str, duration: float,
+               locator: Optional[str] = None, caller: str = "",
+               failed: bool = False) -> None:
+        """Store a measurement not sent through the driver, e.g. startup.
+
+        Args:
+            command: Command name
+            duration: Duration in seconds
+            locator: Locator used by the command
+            caller: Page-object call chain
+            failed: Whether the command raised
+        """
+        with self._lock:
+            self.records.append(CommandRecord(self._test, command, locator,
+                                              duration, caller, failed))
+
+    def after_command(self, driver: WebDriver, command: str,
+                      params: Optional[Dict[str, Any]], duration: float,
+                      error: Optional[BaseException]) -> None:
+        """Record command sent by an instrumented driver."""
+        locator = None
+        if params and "using" in params:
+            locator = f"{params['using']}={params.get('value')}"
+        self.record(command, duration, locator, _page_object_caller(),
+                    error is not None)
+
+    def test_profile(self, test: str) -> Dict[str, Any]:
+        """Summarize commands of one test.
+
+        Args:
+            test: Pytest node ID
+
+        Returns:
+            Per-command statistics and the slowest page-object callers
+        """
+        with self._lock:
+            records = [r for r in self.records if r.test == test]
+        return {
+            "test": test,
+            "commands": self._by(records, "command"),
+            "callers": self._by(records, "caller"),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the whole run.
+
+        Returns:
+            Statistics per command, per caller and per test
+        """
+        with self._lock:
+            records = list(self.records)
+        per_test: Dict[str, List[float]] = defaultdict(list)
+        for record in records:
+            per_test[record.test].append(record.duration)
+        return {
+            "commands": self._by(records, "command"),
+            "callers": self._by(records, "caller"),
+            "tests": {test: summarize(durations)
+                      for test, durations in per_test.items()},
+        }
+
+    def export(self, path: Path) -> None:
+        """Write run summary and raw records as JSON.
+
+        Args:
+            path: Output file
+        """
+        with self._lock:
+            records = [asdict(record) for record in self.records]
+        path.write_text(json.dumps(
+            {"summary": self.summary(), "records": records}, indent=2))
+
+    @staticmethod
+    def _by(records: List[CommandRecord], key: str) -> Dict[str, Any]:
+        """Group record durations by attribute and summarize.
+
+        Args:
+            records: Records to group
+            key: Attribute name
+
+        Returns:
+            Statistics per group, slowest total first
+        """
+        groups: Dict[str, List[float]] = defaultdict(list)
+        for record in records:
+            groups[getattr(record, key) or "-"].append(record.duration)
+        stats = {name: summarize(values) for name, values in groups.items()}
+        return dict(sorted(stats.items(),
+                           key=lambda item: item[1]["total"], reverse=True))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import os
+from typing import Dict, Iterable, List
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def _children(pid: int, parents: Dict[int, List[int]]) -> List[int]:
+    """Collect pid and all its descendants.
+
+    Args:
+        pid: Root process ID
+        parents: Mapping of parent pid to child pids
+
+    Returns:
+        Process IDs of the tree
+    """
+    tree = [pid]
+    for child in parents.get(pid, []):
+        tree.extend(_children(child, parents))
+    return tree
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident memory of a process and its descendants (Linux /proc).
+
+    Args:
+        pid: Root process ID
+
+    Returns:
+        RSS in bytes, 0 where /proc is unavailable
+    """
+    parents: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # Field after the parenthesised command name is state, ppid
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for member in _children(pid, parents):
+        try:
+            with open(f"/proc/{member}/statm") as statm:
+                total += int(statm.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+def driver_rss(driver: WebDriver) -> int:
+    """Resident memory of a local driver's chromedriver and Chrome tree.
+
+    Args:
+        driver: Local WebDriver started with a Service
+
+    Returns:
+        RSS in bytes, 0 for remote sessions
+    """
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is None:
+        return 0
+    return process_tree_rss(process.pid)
+
+
+def drivers_rss(drivers: Iterable[WebDriver]) -> int:
+    """Resident memory of local drivers, counting each process tree once.
+
+    Sessions sharing one chromedriver share its process tree.
+
+    Args:
+        drivers: Local or remote WebDriver instances
+
+    Returns:
+        RSS in bytes
+    """
+    pids = set()
+    for driver in drivers:
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None:
+            pids.add(process.pid)
+    return sum(process_tree_rss(pid) for pid in pids)
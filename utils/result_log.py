@@ -0,0 +1,326 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import pytest
+from allure_pytest.utils import allure_labels, allure_title
+
+
+# Markers that say nothing about the test's area
+IGNORED_MARKERS = frozenset({"parametrize", "skip", "skipif", "xfail",
+                             "usefixtures", "filterwarnings"})
+
+STATUSES = ("passed", "failed", "broken", "skipped")
+
+# Summary groups and the record field they are taken from
+GROUPS = {"marker": "markers", "story": "story", "feature": "feature",
+          "severity": "severity"}
+
+
+def _empty_counts() -> Dict[str, float]:
+    """Counters of one summary group."""
+    counts: Dict[str, float] = {status: 0 for status in STATUSES}
+    counts["duration"] = 0.0
+    return counts
+
+
+class RunSummary:
+    """Pass/fail/duration totals updated one result at a time."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize summary.
+
+        Args:
+            data: Summary previously returned by as_dict()
+        """
+        self.data: Dict[str, Any] = data or {
+            "total": _empty_counts(),
+            **{group: {} for group in GROUPS},
+        }
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Count one test result.
+
+        Args:
+            record: Result record of the run log
+        """
+        buckets = [self.data["total"]]
+        for group, key in GROUPS.items():
+            values = record.get(key)
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                buckets.append(self.data[group].setdefault(
+                    value, _empty_counts()))
+        for bucket in buckets:
+            bucket[record["status"]] += 1
+            bucket["duration"] += record["duration"]
+
+    def merge(self, other: RunSummary) -> None:
+        """Add counters of another summary.
+
+        Args:
+            other: Summary of another worker
+        """
+        def add_counts(target: Dict[str, float],
+                       source: Dict[str, float]) -> None:
+            for key, value in source.items():
+                target[key] = target.get(key, 0) + value
+
+        add_counts(self.data["total"], other.data["total"])
+        for group in GROUPS:
+            for value, counts in other.data[group].items():
+                add_counts(self.data[group].setdefault(
+                    value, _empty_counts()), counts)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON serializable summary."""
+        return self.data
+
+
+class ResultLog:
+    """Append-only log of one worker's results and its summary index.
+
+    Every worker writes its own files, so no locking is needed; the
+    summary file is replaced atomically and can be read mid-run.
+    """
+
+    def __init__(self, directory: Path, worker: str,
+                 flush_interval: float = 1.0) -> None:
+        """Open log files of a worker.
+
+        Args:
+            directory: Run log directory
+            worker: Worker name ('main' without xdist)
+            flush_interval: Shortest time between summary rewrites
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.summary = RunSummary()
+        self.flush_interval = flush_interval
+        self._summary_path = directory / f"summary-{worker}.json"
+        self._log = open(directory / f"results-{worker}.jsonl", "a",
+                         encoding="utf-8")
+        self._written_at = 0.0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Write one result and update the summary.
+
+        Args:
+            record: Result record
+        """
+        self._log.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._log.flush()
+        self.summary.add(record)
+        if time.monotonic() - self._written_at >= self.flush_interval:
+            self.write_summary()
+
+    def write_summary(self) -> None:
+        """Replace the summary file with current totals."""
+        tmp = self._summary_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.summary.as_dict()))
+        os.replace(tmp, self._summary_path)
+        self._written_at = time.monotonic()
+
+    def close(self) -> None:
+        """Write final summary and close the log."""
+        self.write_summary()
+        self._log.close()
+
+
+def read_records(directory: Path) -> Iterator[Dict[str, Any]]:
+    """Iterate over results of all workers.
+
+    A partially written last line of a running worker is skipped.
+
+    Args:
+        directory: Run log directory
+
+    Yields:
+        Result records
+    """
+    for path in sorted(directory.glob("results-*.jsonl")):
+        with open(path, encoding="utf-8") as log:
+            for line in log:
+                if line.endswith("\n"):
+                    yield json.loads(line)
+
+
+def read_summary(directory: Path) -> RunSummary:
+    """Merge summary indexes of all workers.
+
+    Args:
+        directory: Run log directory
+
+    Returns:
+        Summary of the run so far
+    """
+    summary = RunSummary()
+    for path in sorted(directory.glob("summary-*.json")):
+        try:
+            summary.merge(RunSummary(json.loads(path.read_text())))
+        except (OSError, ValueError):
+            continue
+    return summary
+
+
+def export_allure(directory: Path, target: Path) -> int:
+    """Write run log in the allure-results layout.
+
+    Args:
+        directory: Run log directory
+        target: allure-results directory
+
+    Returns:
+        Number of exported results
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for record in read_records(directory):
+        result_uuid = str(uuid.uuid4())
+        history_id = hashlib.md5(record["nodeid"].encode()).hexdigest()
+        labels = [{"name": name, "value": value}
+                  for name, value in record["labels"]]
+        labels += [{"name": "tag", "value": marker}
+                   for marker in record["markers"]]
+        labels += [{"name": "host", "value": record["host"]},
+                   {"name": "thread", "value": record["worker"]},
+                   {"name": "framework", "value": "pytest"},
+                   {"name": "language", "value": "python"}]
+        result = {
+            "uuid": result_uuid,
+            "historyId": history_id,
+            "testCaseId": history_id,
+            "name": record["title"],
+            "fullName": record["nodeid"],
+            "status": record["status"],
+            "statusDetails": {"message": record.get("message", ""),
+                              "trace": record.get("trace", "")},
+            "start": int(record["start"] * 1000),
+            "stop": int(record["stop"] * 1000),
+            "labels": labels,
+        }
+        (target / f"{result_uuid}-result.json").write_text(
+            json.dumps(result))
+        count += 1
+    return count
+
+
+def _status(reports: Sequence[pytest.TestReport]) -> str:
+    """Allure status of a test from its phase reports."""
+    for report in reports:
+        if report.failed:
+            return "failed" if report.when == "call" else "broken"
+    if any(report.skipped for report in reports):
+        return "skipped"
+    return "passed"
+
+
+class ResultLogPlugin:
+    """Pytest plugin streaming results of this process to a ResultLog."""
+
+    def __init__(self, log: ResultLog, worker: str) -> None:
+        """Initialize plugin.
+
+        Args:
+            log: Log receiving the results
+            worker: Worker name stored with every result
+        """
+        self.log = log
+        self.worker = worker
+        self.host = socket.gethostname()
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._reports: Dict[str, List[pytest.TestReport]] = {}
+        self._started: Dict[str, float] = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        """Remember markers and Allure labels of the test."""
+        labels = sorted(allure_labels(item))
+        found = dict(labels)
+        self._meta[item.nodeid] = {
+            "title": allure_title(item) or item.name,
+            "markers": sorted({mark.name for mark in item.iter_markers()
+                               if mark.name not in IGNORED_MARKERS
+                               and not mark.name.startswith("allure")}),
+            "labels": labels,
+            "story": found.get("story"),
+            "feature": found.get("feature"),
+            "severity": found.get("severity"),
+        }
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Collect phase reports and write the result after teardown."""
+        reports = self._reports.setdefault(report.nodeid, [])
+        if not reports:
+            self._started[report.nodeid] = time.time() - report.duration
+        reports.append(report)
+        if report.when != "teardown":
+            return
+
+        del self._reports[report.nodeid]
+        record = {
+            "nodeid": report.nodeid,
+            "status": _status(reports),
+            "duration": sum(item.duration for item in reports),
+            "start": self._started.pop(report.nodeid),
+            "stop": time.time(),
+            "worker": self.worker,
+            "host": self.host,
+            **self._meta.pop(report.nodeid, {
+                "title": report.nodeid, "markers": [], "labels": []}),
+        }
+        failed = next((item for item in reports if item.failed), None)
+        if failed is not None:
+            crash = getattr(failed.longrepr, "reprcrash", None)
+            record["message"] = (crash.message if crash is not None
+                                 else str(failed.longrepr)[:500])
+            record["trace"] = failed.longreprtext
+        self.log.append(record)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """Write final summary."""
+        self.log.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Print summary of a run log or export it for Allure.
+
+    Args:
+        argv: Command line arguments
+
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.result_log",
+        description="Read streaming run log written with --result-log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary", help="Print run summary")
+    summary.add_argument("directory", type=Path)
+    export = commands.add_parser("export", help="Write allure-results")
+    export.add_argument("directory", type=Path)
+    export.add_argument("target", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        json.dump(read_summary(args.directory).as_dict(), sys.stdout,
+                  indent=2)
+        print()
+    else:
+        count = export_allure(args.directory, args.target)
+        print(f"Exported {count} results to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Dict, List
+import pytest
+import xdist
+from xdist.scheduler import LoadScheduling
+
+
+# DurationScheduling overrides LoadScheduling.schedule() and uses its
+# private helpers, so requirements.txt pins pytest-xdist; other versions
+# get the stock scheduler with a warning
+XDIST_VERSIONS = ("3.5.",)
+
+
+class DurationStore:
+    """Per-test durations persisted between runs."""
+
+    def __init__(self, path: Path, smoothing: float = 0.5) -> None:
+        """Initialize duration store.
+
+        Args:
+            path: JSON file with recorded durations
+            smoothing: Weight of the newest measurement
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        if path.is_file():
+            try:
+                self.durations = json.loads(path.read_text())
+            except ValueError:
+                self.durations = {}
+
+    def get(self, nodeid: str, default: float) -> float:
+        """Get recorded duration of a test.
+
+        Args:
+            nodeid: Pytest node ID
+            default: Value returned for unknown tests
+
+        Returns:
+            Duration in seconds
+        """
+        return self.durations.get(nodeid, default)
+
+    def record(self, nodeid: str, duration: float) -> None:
+        """Blend new measurement into the stored duration.
+
+        Args:
+            nodeid: Pytest node ID
+            duration: Measured duration in seconds
+        """
+        previous = self.durations.get(nodeid)
+        if previous is None:
+            self.durations[nodeid] = duration
+        else:
+            self.durations[nodeid] = (self.smoothing * duration
+                                      + (1 - self.smoothing) * previous)
+
+    def save(self) -> None:
+        """Write durations to disk."""
+        self.path.write_text(json.dumps(self.durations, indent=2,
+                                        sort_keys=True))
+
+
+class DurationOrdering:
+    """Pytest plugin ordering tests longest-first by recorded duration.
+
+    Meant for xdist workers only: sorting across modules would split
+    module and class scoped fixtures in a serial run.
+    """
+
+    def __init__(self, store: DurationStore) -> None:
+        """Initialize plugin.
+
+        Args:
+            store: Recorded durations
+        """
+        self.store = store
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: List[pytest.Item]) -> None:
+        """Sort collected items so the slowest tests start first."""
+        known = list(self.store.durations.values())
+        default = sum(known) / len(known) if known else 0.0
+        items.sort(key=lambda item: self.store.get(item.nodeid, default),
+                   reverse=True)
+
+
+class DurationRecorder:
+    """Pytest plugin recording test durations on the controller."""
+
+    def __init__(self, store: DurationStore) -> None:
+        """Initialize plugin.
+
+        Args:
+            store: Store updated with measured durations
+        """
+        self.store = store
+        self._totals: Dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Sum setup, call and teardown time of every test."""
+        self._totals[report.nodeid] = (self._totals.get(report.nodeid, 0.0)
+                                       + report.duration)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """Persist durations collected during the run."""
+        if not self._totals:
+            return
+        for nodeid, duration in self._totals.items():
+            self.store.record(nodeid, duration)
+        self.store.save()
+
+
+class DurationScheduling(LoadScheduling):
+    """Load scheduling handing out longest tests round-robin first.
+
+    The default initial distribution sends consecutive chunks, which
+    would give the first worker all of the slowest tests.
+    """
+
+    @staticmethod
+    def supported() -> bool:
+        """Check that the installed xdist has the expected internals."""
+        return xdist.__version__.startswith(XDIST_VERSIONS)
+
+    def schedule(self) -> None:
+        """Initiate distribution one test per worker at a time."""
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = range(len(self.collection))
+        if not self.collection:
+            return
+
+        if self.maxschedchunk is None:
+            self.maxschedchunk = len(self.collection)
+
+        per_node = max(len(self.collection) // len(self.nodes) // 4, 2)
+        for _ in range(per_node):
+            for node in self.nodes:
+                if self.pending:
+                    self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import hashlib
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import allure
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from utils.config import Config
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, screenshots stay PNG without it
+    Image = None
+
+
+Region = Tuple[int, int, int, int]
+
+FORMATS: Dict[str, Tuple[str, str, str]] = {
+    # format: (Pillow format, mime type, file extension)
+    "png": ("PNG", "image/png", "png"),
+    "jpeg": ("JPEG", "image/jpg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+}
+
+
+@dataclass(frozen=True)
+class EncodedScreenshot:
+    """Screenshot ready to be attached."""
+    name: str
+    body: bytes
+    mime_type: str
+    extension: str
+    duplicate_of: Optional[str] = None
+
+
+class ScreenshotService:
+    """Captures screenshots and encodes them on a background thread.
+
+    The capture command runs on the calling thread because WebDriver is
+    not thread-safe; hashing, cropping and re-encoding run in a worker.
+    Allure binds attachments to the thread of the running test, so the
+    encoded images are attached by flush() on the test thread.
+    """
+
+    def __init__(self, fmt: str = "png", quality: int = 70,
+                 scale: float = 1.0, budget_bytes: int = 0) -> None:
+        """Initialize service.
+
+        Args:
+            fmt: Output format ('png', 'jpeg' or 'webp')
+            quality: Lossy encoder quality (1-95)
+            scale: Resize factor applied before encoding
+            budget_bytes: Attachment bytes allowed per test (0 = unlimited)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown screenshot format: {fmt}. "
+                             f"Available: {list(FORMATS)}")
+        self.format = fmt if Image is not None else "png"
+        self.quality = quality
+        self.scale = scale
+        self.budget_bytes = budget_bytes
+        self.skipped_duplicates = 0
+        self.skipped_over_budget = 0
+        self._seen: Dict[str, str] = {}
+        self._pending: List[Future] = []
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls) -> ScreenshotService:
+        """Create service configured from Config."""
+        return cls(Config.SCREENSHOT_FORMAT, Config.SCREENSHOT_QUALITY,
+                   Config.SCREENSHOT_SCALE, Config.SCREENSHOT_BUDGET_BYTES)
+
+    def capture(self, driver: WebDriver, name: str = "screenshot",
+                element: Optional[WebElement] = None,
+                region: Optional[Region] = None) -> None:
+        """Capture screenshot and queue it for encoding.
+
+        Args:
+            driver: WebDriver instance
+            name: Attachment name
+            element: Capture only this element
+            region: Crop box (left, top, width, height) in CSS pixels
+        """
+        png = (element.screenshot_as_png if element is not None
+               else driver.get_screenshot_as_png())
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="screenshots")
+        self._pending.append(self._executor.submit(
+            self._encode, name, png, region))
+
+    def begin_test(self) -> None:
+        """Reset per-test byte budget and duplicate detection.
+
+        Duplicates are only replaced by a note within one test, so every
+        test keeps its own copy of a screenshot.
+        """
+        self._used_bytes = 0
+        with self._lock:
+            self._seen.clear()
+
+    def flush(self) -> None:
+        """Attach every encoded screenshot to the current test."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                shot = future.result()
+            except Exception:
+                continue
+            if shot.duplicate_of is not None:
+                self.skipped_duplicates += 1
+                allure.attach(f"Identical to screenshot '{shot.duplicate_of}'",
+                              name=shot.name,
+                              attachment_type=allure.attachment_type.TEXT)
+                continue
+            if (self.budget_bytes
+                    and self._used_bytes + len(shot.body) > self.budget_bytes):
+                self.skipped_over_budget += 1
+                continue
+            self._used_bytes += len(shot.body)
+            allure.attach(shot.body, name=shot.name,
+                          attachment_type=shot.mime_type,
+                          extension=shot.extension)
+
+    def close(self) -> None:
+        """Stop background encoder."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending = []
+
+    def _encode(self, name: str, png: bytes,
+                region: Optional[Region]) -> EncodedScreenshot:
+        """Deduplicate, crop and re-encode screenshot.
+
+        Args:
+            name: Attachment name
+            png: Raw PNG from WebDriver
+            region: Crop box (left, top, width, height)
+
+        Returns:
+            Encoded screenshot
+        """
+        digest = hashlib.sha1(png).hexdigest()
+        if region is not None:
+            digest += f":{region}"
+        with self._lock:
+            if digest in self._seen:
+                return EncodedScreenshot(name, b"", "text/plain", "txt",
+                                         duplicate_of=self._seen[digest])
+            self._seen[digest] = name
+
+        pil_format, mime_type, extension = FORMATS[self.format]
+        if Image is None or (self.format == "png" and region is None
+                             and self.scale == 1.0):
+            return EncodedScreenshot(name, png, mime_type, extension)
+
+        image = Image.open(io.BytesIO(png))
+        if region is not None:
+            left, top, width, height = region
+            image = image.crop((left, top, left + width, top + height))
+        if self.scale != 1.0:
+            image = image.resize((max(1, int(image.width * self.scale)),
+                                  max(1, int(image.height * self.scale))))
+        if pil_format == "JPEG":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, quality=self.quality,
+                   optimize=True)
+        return EncodedScreenshot(name, buffer.getvalue(), mime_type, extension)
+
+
+SCREENSHOTS: ScreenshotService = ScreenshotService.from_config()
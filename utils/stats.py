@@ -0,0 +1,44 @@
+from __future__ import annotations
+import math
+from typing import Dict, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Samples
+        pct: Percentile in range 0-100
+
+    Returns:
+        Percentile value, 0.0 for empty input
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Count, total, min, median, p95, p99 and max of samples.
+
+    Args:
+        values: Samples
+
+    Returns:
+        Summary statistics
+    """
+    return {
+        "count": len(values),
+        "total": sum(values),
+        "min": min(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
@@ -0,0 +1,127 @@
+from __future__ import annotations
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence
+from typing import TypeVar
+import allure
+from allure_commons.utils import represent
+from utils.config import Config
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+STEP_MODES: tuple[str, ...] = ("off", "top", "full")
+MASK: str = "********"
+
+_depth = threading.local()
+
+
+class StepListener(Protocol):
+    """Notified around every reported page-object step."""
+
+    def step_started(self, title: str, page: Any) -> None:
+        """Handle step start.
+
+        Args:
+            title: Formatted step title
+            page: Page object (first argument of the method)
+        """
+
+    def step_finished(self, title: str, page: Any,
+                      error: Optional[BaseException]) -> None:
+        """Handle step end.
+
+        Args:
+            title: Formatted step title
+            page: Page object (first argument of the method)
+            error: Exception raised by the step, if any
+        """
+
+
+_listeners: List[StepListener] = []
+
+
+def add_step_listener(listener: StepListener) -> None:
+    """Register listener for all reported steps.
+
+    Args:
+        listener: Listener to register
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_step_listener(listener: StepListener) -> None:
+    """Unregister step listener.
+
+    Args:
+        listener: Listener to remove
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def step(title: str, secrets: Sequence[str] = ()) -> Callable[[F], F]:
+    """Report decorated page-object method as an Allure step.
+
+    Granularity is taken from Config.STEP_MODE when the method is
+    decorated: 'off' returns the function unchanged, 'top' reports only
+    the outermost step of a call chain and 'full' reports every call.
+
+    Args:
+        title: Step title formatted with the call arguments
+        secrets: Argument names masked in the title. If the function has
+            a 'mask' parameter they are masked only when it is true.
+
+    Returns:
+        Decorator
+    """
+    mode = Config.STEP_MODE
+    if mode not in STEP_MODES:
+        raise ValueError(f"Unknown step mode: {mode}. "
+                         f"Available: {list(STEP_MODES)}")
+
+    def decorator(func: F) -> F:
+        if mode == "off":
+            return func
+
+        signature = inspect.signature(func)
+        has_mask_flag = "mask" in signature.parameters
+
+        def format_title(args: tuple, kwargs: Dict[str, Any]) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            hide = bool(secrets) and (
+                not has_mask_flag or bool(bound.arguments.get("mask")))
+            params = {
+                name: MASK if hide and name in secrets else represent(value)
+                for name, value in bound.arguments.items()
+            }
+            return title.format(**params)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            depth = getattr(_depth, "value", 0)
+            if mode == "top" and depth:
+                return func(*args, **kwargs)
+            _depth.value = depth + 1
+            step_title = format_title(args, kwargs)
+            page = args[0] if args else None
+            error: Optional[BaseException] = None
+            for listener in list(_listeners):
+                listener.step_started(step_title, page)
+            try:
+                with allure.step(step_title):
+                    return func(*args, **kwargs)
+            except BaseException as exc:
+                error = exc
+                raise
+            finally:
+                _depth.value = depth
+                for listener in list(_listeners):
+                    listener.step_finished(step_title, page, error)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
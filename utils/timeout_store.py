@@ -0,0 +1,107 @@
+from __future__ import annotations
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Duration and whether the wait timed out. A timed-out sample is
+# censored: the wait lasted at least that long.
+Sample = Tuple[float, bool]
+
+
+class TimeoutStore:
+    """Recent wait durations per key, persisted between runs."""
+
+    def __init__(self, path: Path, window: int = 50) -> None:
+        """Initialize store, loading history from disk.
+
+        Args:
+            path: JSON history file
+            window: Samples kept per key
+        """
+        self.path = path
+        self.window = window
+        self._history: Dict[str, List[Sample]] = self._load()
+        self._new: Dict[str, List[Sample]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, seconds: float,
+                timed_out: bool = False) -> None:
+        """Record duration of a wait.
+
+        Args:
+            key: Wait key, e.g. 'LoginPage:id=user-name:standard'
+            seconds: Observed wait duration, or the timeout of a wait
+                that timed out
+            timed_out: The wait gave up, so its real duration is unknown
+        """
+        sample = (seconds, timed_out)
+        with self._lock:
+            self._new.setdefault(key, []).append(sample)
+            samples = self._history.setdefault(key, [])
+            samples.append(sample)
+            del samples[:-self.window]
+
+    def samples(self, key: str) -> List[float]:
+        """Recent durations of a key.
+
+        Timed-out waits count with their timeout, a lower bound of the
+        real duration.
+
+        Args:
+            key: Wait key
+
+        Returns:
+            Samples, oldest first
+        """
+        with self._lock:
+            return [seconds for seconds, _ in self._history.get(key, [])]
+
+    def recent_timeouts(self, key: str) -> List[float]:
+        """Timeouts of the waits that timed out since the last success.
+
+        Args:
+            key: Wait key
+
+        Returns:
+            Timeouts in seconds, oldest first
+        """
+        timeouts: List[float] = []
+        with self._lock:
+            for seconds, timed_out in reversed(self._history.get(key, [])):
+                if not timed_out:
+                    break
+                timeouts.append(seconds)
+        return timeouts[::-1]
+
+    def save(self) -> None:
+        """Merge new samples into the file written by other workers."""
+        with self._lock:
+            merged = self._load()
+            for key, values in self._new.items():
+                samples = merged.setdefault(key, [])
+                samples.extend(values)
+                del samples[:-self.window]
+            self._new = {}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(merged, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+
+    def _load(self) -> Dict[str, List[Sample]]:
+        """Read history file, empty when missing or corrupt.
+
+        Plain numbers of files written before timeouts were recorded
+        are read as completed waits.
+        """
+        if not self.path.is_file():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text())
+            return {key: [(float(value), False)
+                          if isinstance(value, (int, float))
+                          else (float(value[0]), bool(value[1]))
+                          for value in values]
+                    for key, values in raw.items()}
+        except (ValueError, TypeError, IndexError, AttributeError):
+            return {}
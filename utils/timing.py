@@ -0,0 +1,176 @@
+from __future__ import annotations
+import threading
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from utils.stats import summarize
+
+
+METRICS: Tuple[str, ...] = ("ttfb_ms", "dom_content_loaded_ms", "load_ms",
+                            "first_paint_ms", "first_contentful_paint_ms",
+                            "action_ms")
+
+
+@dataclass(frozen=True)
+class PageTiming:
+    """Browser-side timing captured after a page-object action."""
+    label: str
+    url: str
+    user_type: str
+    test: str
+    ttfb_ms: Optional[float]
+    dom_content_loaded_ms: Optional[float]
+    load_ms: Optional[float]
+    first_paint_ms: Optional[float]
+    first_contentful_paint_ms: Optional[float]
+    resource_count: int
+    transfer_size: int
+    action_ms: Optional[float]
+
+    @classmethod
+    def from_script(cls, raw: Dict[str, Any], label: str, user_type: str,
+                    test: str,
+                    fallback_action_ms: Optional[float] = None) -> PageTiming:
+        """Build timing from the result of TIMING_SCRIPT.
+
+        Args:
+            raw: Script result
+            label: Action label, e.g. 'login' or 'inventory'
+            user_type: User type the action ran as
+            test: Pytest node ID
+            fallback_action_ms: Wall-clock action time used when the
+                action mark did not survive a full navigation
+
+        Returns:
+            Page timing
+        """
+        nav = raw.get("navigation") or {}
+
+        def since_start(key: str) -> Optional[float]:
+            value = nav.get(key)
+            return value if value else None
+
+        ttfb = None
+        if nav.get("responseStart") and nav.get("requestStart") is not None:
+            ttfb = nav["responseStart"] - nav["requestStart"]
+        action = raw.get("actionMs")
+        return cls(
+            label=label,
+            url=raw.get("url", ""),
+            user_type=user_type,
+            test=test,
+            ttfb_ms=ttfb,
+            dom_content_loaded_ms=since_start("domContentLoadedEventEnd"),
+            load_ms=since_start("loadEventEnd"),
+            first_paint_ms=raw.get("paint", {}).get("first-paint"),
+            first_contentful_paint_ms=raw.get("paint", {}).get(
+                "first-contentful-paint"),
+            resource_count=raw.get("resourceCount", 0),
+            transfer_size=raw.get("transferSize", 0),
+            action_ms=action if action is not None else fallback_action_ms,
+        )
+
+
+class TimingRecorder:
+    """Collects page timings of the run and answers queries about them."""
+
+    def __init__(self, max_records: int = 10000) -> None:
+        """Initialize empty recorder.
+
+        Args:
+            max_records: Newest timings kept; older ones are dropped so
+                long runs such as the load generator stay bounded
+        """
+        self.records: Deque[PageTiming] = deque(maxlen=max_records)
+        self.test = ""
+        self._lock = threading.Lock()
+
+    def add(self, timing: PageTiming) -> None:
+        """Store timing.
+
+        Args:
+            timing: Captured timing
+        """
+        with self._lock:
+            self.records.append(timing)
+
+    def query(self, label: Optional[str] = None,
+              user_type: Optional[str] = None,
+              test: Optional[str] = None) -> List[PageTiming]:
+        """Find timings matching every given filter.
+
+        Args:
+            label: Action label
+            user_type: User type
+            test: Pytest node ID
+
+        Returns:
+            Matching timings in capture order
+        """
+        with self._lock:
+            records = list(self.records)
+        return [r for r in records
+                if (label is None or r.label == label)
+                and (user_type is None or r.user_type == user_type)
+                and (test is None or r.test == test)]
+
+    def assert_under(self, label: str, limit_ms: float,
+                     user_type: Optional[str] = None,
+                     metric: str = "action_ms",
+                     test: Optional[str] = None) -> None:
+        """Assert that every matching timing is below a limit.
+
+        Args:
+            label: Action label
+            limit_ms: Upper bound in milliseconds
+            user_type: User type filter
+            metric: PageTiming field to check
+            test: Pytest node ID filter (default: current test)
+
+        Raises:
+            AssertionError: If nothing was captured or a value is too slow
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}. "
+                             f"Available: {list(METRICS)}")
+        timings = self.query(label, user_type,
+                             test if test is not None else self.test)
+        values = [getattr(t, metric) for t in timings
+                  if getattr(t, metric) is not None]
+        assert values, f"No {metric} captured for {label} ({user_type})"
+        slowest = max(values)
+        assert slowest <= limit_ms, (
+            f"{label} {metric} for {user_type or 'any user'} was "
+            f"{slowest:.0f}ms, limit {limit_ms:.0f}ms")
+
+    def for_test(self, test: str) -> List[Dict[str, Any]]:
+        """Timings of one test as dictionaries.
+
+        Args:
+            test: Pytest node ID
+
+        Returns:
+            JSON-serializable timings
+        """
+        return [asdict(t) for t in self.query(test=test)]
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Aggregate metrics per user type and label.
+
+        Returns:
+            Mapping 'user_type/label' -> metric -> statistics
+        """
+        groups: Dict[str, Dict[str, List[float]]] = defaultdict(
+            lambda: defaultdict(list))
+        for timing in self.query():
+            group = groups[f"{timing.user_type}/{timing.label}"]
+            for metric in METRICS:
+                value = getattr(timing, metric)
+                if value is not None:
+                    group[metric].append(value)
+        return {name: {metric: summarize(values)
+                       for metric, values in metrics.items()}
+                for name, metrics in groups.items()}
+
+
+TIMINGS: TimingRecorder = TimingRecorder()
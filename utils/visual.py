@@ -0,0 +1,298 @@
+from __future__ import annotations
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from utils.config import Config
+from utils.screenshots import Region
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # numpy and Pillow are optional, see AVAILABLE
+    np = None
+    Image = None
+
+
+# Visual comparison needs both numpy and Pillow
+AVAILABLE: bool = np is not None and Image is not None
+
+HASH_SIZE = 8
+
+
+def perceptual_hash(image: "Image.Image") -> int:
+    """64-bit difference hash of an image.
+
+    Args:
+        image: Pillow image
+
+    Returns:
+        Hash whose Hamming distance tracks visual difference
+    """
+    small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE),
+                                      Image.BILINEAR)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(first: int, second: int) -> int:
+    """Number of differing bits of two hashes."""
+    return bin(first ^ second).count("1")
+
+
+@dataclass(frozen=True)
+class BaselineEntry:
+    """Index record of one baseline image."""
+    file: str
+    digest: str
+    phash: int
+    width: int
+    height: int
+
+
+@dataclass
+class VisualResult:
+    """Outcome of comparing a screenshot with its baseline."""
+    name: str
+    passed: bool
+    reason: str
+    mismatch_ratio: float = 0.0
+    hash_distance: int = 0
+    bbox: Optional[Region] = None
+    diff_mask: Optional["np.ndarray"] = None
+    missing: bool = False
+
+    def diff_png(self, actual_png: bytes) -> Optional[bytes]:
+        """Render changed pixels in red over a dimmed screenshot.
+
+        Args:
+            actual_png: Compared screenshot
+
+        Returns:
+            PNG bytes, None when there is no diff mask
+        """
+        if self.diff_mask is None:
+            return None
+        pixels = np.asarray(Image.open(io.BytesIO(actual_png))
+                            .convert("RGB")).copy()
+        pixels //= 3
+        pixels[self.diff_mask] = (255, 0, 0)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+def compare_pixels(actual: "np.ndarray", baseline: "np.ndarray",
+                   pixel_tolerance: int,
+                   masks: Sequence[Region] = ()) -> "np.ndarray":
+    """Vectorized per-pixel comparison.
+
+    Args:
+        actual: RGB array of the screenshot
+        baseline: RGB array of the baseline, same shape
+        pixel_tolerance: Largest channel difference still equal
+        masks: Ignored regions (left, top, width, height)
+
+    Returns:
+        Boolean mask of changed pixels
+    """
+    delta = np.abs(actual.astype(np.int16) - baseline.astype(np.int16))
+    changed = delta.max(axis=2) > pixel_tolerance
+    for left, top, width, height in masks:
+        changed[max(top, 0):top + height, max(left, 0):left + width] = False
+    return changed
+
+
+def _bbox(mask: "np.ndarray") -> Optional[Region]:
+    """Bounding box of changed pixels."""
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not rows.size:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return (int(cols[0]), int(rows[0]),
+            int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1))
+
+
+class BaselineIndex:
+    """Baselines with their digests and perceptual hashes.
+
+    The index file lets a check reject or accept most frames from the
+    hashes alone; baseline pixels are decoded only for a full diff.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize index, loading it from disk.
+
+        Args:
+            root: Directory with baseline images and index.json
+        """
+        self.root = root
+        self._entries: Dict[str, BaselineEntry] = self._load()
+        self._pixels: Dict[str, "np.ndarray"] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        """Index file path."""
+        return self.root / "index.json"
+
+    def get(self, key: str) -> Optional[BaselineEntry]:
+        """Baseline entry of a key, None if missing."""
+        return self._entries.get(key)
+
+    def nearest(self, phash: int,
+                limit: int = 3) -> List[Tuple[str, int]]:
+        """Baselines closest to a perceptual hash.
+
+        Args:
+            phash: Hash of a screenshot
+            limit: Number of results
+
+        Returns:
+            (key, distance) pairs, closest first
+        """
+        distances = [(key, hamming(phash, entry.phash))
+                     for key, entry in self._entries.items()]
+        return sorted(distances, key=lambda item: item[1])[:limit]
+
+    def pixels(self, key: str) -> "np.ndarray":
+        """Decoded RGB pixels of a baseline, cached per process."""
+        with self._lock:
+            if key not in self._pixels:
+                entry = self._entries[key]
+                with Image.open(self.root / entry.file) as image:
+                    self._pixels[key] = np.asarray(image.convert("RGB"))
+            return self._pixels[key]
+
+    def put(self, key: str, png: bytes, image: "Image.Image") -> None:
+        """Store screenshot as the baseline of a key.
+
+        Args:
+            key: Baseline key
+            png: Screenshot PNG
+            image: Decoded screenshot
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        file = f"{key}.png"
+        (self.root / file).write_bytes(png)
+        entry = BaselineEntry(file, hashlib.sha1(png).hexdigest(),
+                              perceptual_hash(image), image.width,
+                              image.height)
+        with self._lock:
+            self._entries[key] = entry
+            self._pixels.pop(key, None)
+            merged = self._load()
+            merged[key] = entry
+            tmp = self.path.with_name(f"index.json.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(
+                {name: vars(item) for name, item in sorted(merged.items())},
+                indent=1))
+            os.replace(tmp, self.path)
+
+    def _load(self) -> Dict[str, BaselineEntry]:
+        """Read index file, empty when missing."""
+        if not self.path.is_file():
+            return {}
+        data = json.loads(self.path.read_text())
+        return {key: BaselineEntry(**entry) for key, entry in data.items()}
+
+
+class VisualChecker:
+    """Compares screenshots with baselines of the same key."""
+
+    def __init__(self, index: BaselineIndex, pixel_tolerance: int,
+                 mismatch_tolerance: float, hash_distance: int,
+                 update: bool = False) -> None:
+        """Initialize checker.
+
+        Args:
+            index: Baseline index
+            pixel_tolerance: Largest channel difference still equal
+            mismatch_tolerance: Share of changed pixels still passing
+            hash_distance: Hash distance failing without a pixel diff
+                (0 disables the shortcut)
+            update: Replace baselines instead of comparing
+        """
+        self.index = index
+        self.pixel_tolerance = pixel_tolerance
+        self.mismatch_tolerance = mismatch_tolerance
+        self.hash_distance = hash_distance
+        self.update = update
+
+    @classmethod
+    def from_config(cls) -> VisualChecker:
+        """Create checker from Config settings."""
+        return cls(BaselineIndex(Path(Config.VISUAL_BASELINE_DIR)),
+                   Config.VISUAL_PIXEL_TOLERANCE,
+                   Config.VISUAL_MISMATCH_TOLERANCE,
+                   Config.VISUAL_HASH_DISTANCE, Config.VISUAL_UPDATE)
+
+    def check(self, key: str, png: bytes,
+              masks: Sequence[Region] = ()) -> VisualResult:
+        """Compare screenshot with its baseline.
+
+        Identical files pass on their digest. Frames whose perceptual
+        hash is far from the baseline fail without a pixel diff unless
+        masks are given, since masked changes also move the hash.
+        Without a baseline the result is marked missing and names the
+        closest existing baselines; it is saved only in update mode.
+
+        Args:
+            key: Baseline key
+            png: Screenshot PNG
+            masks: Ignored regions (left, top, width, height)
+
+        Returns:
+            Comparison result
+        """
+        if not AVAILABLE:
+            raise RuntimeError("Visual comparison requires numpy and Pillow")
+        entry = self.index.get(key)
+        if entry is not None and not self.update \
+                and hashlib.sha1(png).hexdigest() == entry.digest:
+            return VisualResult(key, True, "identical to baseline")
+
+        image = Image.open(io.BytesIO(png)).convert("RGB")
+        if self.update:
+            self.index.put(key, png, image)
+            return VisualResult(key, True, "baseline saved")
+        if entry is None:
+            nearest = ", ".join(
+                f"{name} (distance {distance})" for name, distance
+                in self.index.nearest(perceptual_hash(image)))
+            return VisualResult(
+                key, False, f"no baseline '{key}', save it with "
+                            f"VISUAL_UPDATE=1; closest: {nearest or 'none'}",
+                missing=True)
+
+        if (image.width, image.height) != (entry.width, entry.height):
+            return VisualResult(
+                key, False, f"size {image.width}x{image.height} differs "
+                            f"from baseline {entry.width}x{entry.height}")
+
+        distance = hamming(perceptual_hash(image), entry.phash)
+        if self.hash_distance and not masks \
+                and distance >= self.hash_distance:
+            return VisualResult(key, False,
+                                f"perceptual hash distance {distance}",
+                                hash_distance=distance)
+
+        changed = compare_pixels(np.asarray(image), self.index.pixels(key),
+                                 self.pixel_tolerance, masks)
+        ratio = float(changed.mean())
+        passed = ratio <= self.mismatch_tolerance
+        return VisualResult(
+            key, passed,
+            f"{ratio:.4%} pixels changed (tolerance "
+            f"{self.mismatch_tolerance:.4%})",
+            mismatch_ratio=ratio, hash_distance=distance,
+            bbox=_bbox(changed), diff_mask=None if passed else changed,
+        )
+
+
+VISUAL: VisualChecker = VisualChecker.from_config()
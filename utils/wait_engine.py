@@ -0,0 +1,216 @@
+from __future__ import annotations
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Sequence
+from selenium.common.exceptions import (JavascriptException,
+                                        TimeoutException, WebDriverException)
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.config import Config
+from utils.dom_scripts import OBSERVER_WAIT_SCRIPT, READ_STATES_SCRIPT
+
+
+# Chromedriver default, raised only when a wait needs longer
+DEFAULT_SCRIPT_TIMEOUT: float = 30.0
+
+
+@dataclass(frozen=True)
+class WaitRecord:
+    """Outcome and latency of one wait."""
+    kind: str
+    target: str
+    duration: float
+    mode: str
+    success: bool
+
+
+class WaitEngine:
+    """Waits resolved in the page by a MutationObserver.
+
+    Each wait is a single execute_async_script call that returns as soon
+    as the condition holds. When the page navigates away mid-wait or the
+    script fails, the remaining time is spent in WebDriverWait polling.
+    """
+
+    def __init__(self, driver: WebDriver, mode: str = Config.WAIT_ENGINE,
+                 poll_frequency: float = 0.5,
+                 max_records: int = 1000) -> None:
+        """Initialize wait engine.
+
+        Args:
+            driver: WebDriver instance
+            mode: 'observer' or 'polling'
+            poll_frequency: Poll interval of the fallback in seconds
+            max_records: Newest wait records kept
+        """
+        self.driver = driver
+        self.mode = mode
+        self.poll_frequency = poll_frequency
+        self.records: Deque[WaitRecord] = deque(maxlen=max_records)
+        self._script_timeout = DEFAULT_SCRIPT_TIMEOUT
+
+    def until_visible(self, locator: tuple, timeout: float,
+                      message: str = "") -> WebElement:
+        """Wait for element to be visible.
+
+        Args:
+            locator: Tuple (By strategy, value)
+            timeout: Wait time in seconds
+            message: Message of the raised TimeoutException
+
+        Returns:
+            Visible WebElement
+
+        Raises:
+            TimeoutException: If element not visible in time
+        """
+        return self._run(
+            {"kind": "visible", "by": locator[0], "value": locator[1]},
+            EC.visibility_of_element_located(locator),
+            timeout, message, str(locator),
+        )
+
+    def until_all_visible(self, locators: Sequence[tuple], timeout: float,
+                          message: str = "") -> bool:
+        """Wait for several elements to be visible at the same time.
+
+        The polling fallback reads all elements in one script call.
+
+        Args:
+            locators: Tuples (By strategy, value)
+            timeout: Wait time in seconds
+            message: Message of the raised TimeoutException
+
+        Returns:
+            True once every element is visible
+
+        Raises:
+            TimeoutException: If any element not visible in time
+        """
+        batch = [list(locator) for locator in locators]
+
+        def all_visible(driver: WebDriver) -> bool:
+            states = driver.execute_script(READ_STATES_SCRIPT, batch, [])
+            return all(state["displayed"] for state in states)
+
+        return self._run({"kind": "all_visible", "locators": batch},
+                         all_visible, timeout, message, str(list(locators)))
+
+    def until_url_changes(self, url: str, timeout: float,
+                          message: str = "") -> str:
+        """Wait for current URL to differ from url.
+
+        Args:
+            url: URL before the action
+            timeout: Wait time in seconds
+            message: Message of the raised TimeoutException
+
+        Returns:
+            New URL
+
+        Raises:
+            TimeoutException: If URL did not change in time
+        """
+        def changed(driver: WebDriver) -> str | bool:
+            current = driver.current_url
+            return current if current != url else False
+
+        return self._run({"kind": "url_changes", "url": url}, changed,
+                         timeout, message, url)
+
+    def until_url_is(self, url: str, timeout: float,
+                     message: str = "") -> str:
+        """Wait for current URL to equal url.
+
+        Args:
+            url: Expected URL
+            timeout: Wait time in seconds
+            message: Message of the raised TimeoutException
+
+        Returns:
+            Current URL
+
+        Raises:
+            TimeoutException: If URL did not match in time
+        """
+        def matches(driver: WebDriver) -> str | bool:
+            current = driver.current_url
+            return current if current == url else False
+
+        return self._run({"kind": "url_is", "url": url}, matches,
+                         timeout, message, url)
+
+    def _run(self, condition: Dict[str, Any],
+             fallback: Callable[[WebDriver], Any], timeout: float,
+             message: str, target: str) -> Any:
+        """Resolve condition in the page, polling when that fails.
+
+        Args:
+            condition: Condition passed to the in-page script
+            fallback: Expected condition used for polling
+            timeout: Wait time in seconds
+            message: Message of the raised TimeoutException
+            target: Description used in the wait record
+
+        Returns:
+            Value produced by the condition
+
+        Raises:
+            TimeoutException: If condition not met in time
+        """
+        start = time.perf_counter()
+        mode = "polling"
+        success = False
+        try:
+            if self.mode == "observer":
+                mode = "observer"
+                outcome = self._observe(condition, timeout)
+                if outcome is not None:
+                    if outcome["status"] == "timeout":
+                        raise TimeoutException(message)
+                    success = True
+                    return outcome["value"]
+                mode = "fallback"
+            remaining = timeout - (time.perf_counter() - start)
+            value = WebDriverWait(
+                self.driver, max(remaining, 0), self.poll_frequency
+            ).until(fallback, message=message)
+            success = True
+            return value
+        finally:
+            self.records.append(WaitRecord(
+                condition["kind"], target, time.perf_counter() - start,
+                mode, success,
+            ))
+
+    def _observe(self, condition: Dict[str, Any],
+                 timeout: float) -> Optional[Dict[str, Any]]:
+        """Run the observer script.
+
+        Args:
+            condition: Condition passed to the in-page script
+            timeout: Wait time in seconds
+
+        Returns:
+            Script outcome ('ok' or 'timeout') or None when polling
+            must take over
+        """
+        if timeout + 1 > self._script_timeout:
+            self._script_timeout = timeout + 1
+            self.driver.set_script_timeout(self._script_timeout)
+        try:
+            outcome = self.driver.execute_async_script(
+                OBSERVER_WAIT_SCRIPT, condition, int(timeout * 1000))
+        except (JavascriptException, TimeoutException):
+            # Page navigated away or script was killed
+            return None
+        except WebDriverException as error:
+            if "unloaded" in str(error):
+                return None
+            raise
+        if not outcome or outcome.get("status") == "error":
+            return None
+        return outcome